@@ -2,6 +2,9 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it (e.g. ``uvicorn config.asgi:application``) for the Server-Sent Event
+endpoints: their async streams wait on the event loop instead of holding a
+worker thread per open connection.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
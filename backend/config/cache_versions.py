@@ -0,0 +1,36 @@
+"""
+Version tokens for cached payloads.
+
+A cached payload's key embeds the current version of each thing it was built
+from. Bumping a version orphans every key built from it, so writers invalidate
+without knowing which payloads exist. Versions live in the default cache, which
+must be shared between workers (``REDIS_URL``) for a bump to reach every process.
+"""
+
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+_PREFIX = "version:"
+
+
+def get_versions(*names):
+    """Returns the current token for each name, creating missing ones."""
+    keys = [_PREFIX + name for name in names]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            # add() keeps a token a concurrent writer may have just set.
+            cache.add(key, uuid4().hex, timeout=None)
+        found.update(cache.get_many(missing))
+    return [found[key] for key in keys]
+
+
+def bump_version(name, using=None):
+    """Invalidates payloads built from ``name`` once the current transaction commits."""
+    transaction.on_commit(
+        lambda: cache.set(_PREFIX + name, uuid4().hex, timeout=None),
+        using=using,
+    )
@@ -0,0 +1,96 @@
+"""
+Builds Django ``DATABASES`` entries from Postgres connection URLs.
+
+Connection management is configured with query parameters on the URL:
+
+``pool``
+    ``true`` to use a psycopg 3 connection pool (``psycopg[pool]``, installed
+    from requirements.txt). Raises ImproperlyConfigured if it is missing.
+``pool_min_size``, ``pool_max_size``, ``pool_max_idle``, ``pool_timeout``
+    Pool sizing, seconds an idle connection is kept, and seconds a request waits
+    for a free connection.
+``conn_max_age``
+    Seconds a persistent connection is reused when not pooling (default ``0``,
+    a connection per request). Only raise it under WSGI: ASGI runs each request
+    in its own thread context, so persistent connections pile up instead of
+    being reused; use ``pool=true`` there.
+``conn_health_checks``
+    Whether a reused persistent connection is checked before use (default
+    ``true``). Django always checks pooled connections on checkout.
+``sslmode``
+    Passed through to libpq, e.g. ``sslmode=require`` for Supabase.
+"""
+
+from importlib.util import find_spec
+from urllib.parse import parse_qs, urlparse
+
+from django.core.exceptions import ImproperlyConfigured
+
+DEFAULT_CONN_MAX_AGE = 0
+DEFAULT_POOL_MIN_SIZE = 2
+DEFAULT_POOL_MAX_SIZE = 10
+DEFAULT_POOL_MAX_IDLE = 300
+DEFAULT_POOL_TIMEOUT = 10
+
+_TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+def _flag(params, name, default):
+    if name not in params:
+        return default
+    return params[name].lower() in _TRUE_VALUES
+
+
+def _number(params, name, default, cast=int):
+    if name not in params:
+        return default
+    try:
+        return cast(params[name])
+    except ValueError as exc:
+        raise ValueError(f"Database URL parameter {name} must be a number.") from exc
+
+
+def pooling_available():
+    return find_spec("psycopg") is not None and find_spec("psycopg_pool") is not None
+
+
+def database_from_url(url):
+    parsed = urlparse(url)
+    params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+    config = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": parsed.path.lstrip("/"),
+        "USER": parsed.username,
+        "PASSWORD": parsed.password,
+        "HOST": parsed.hostname,
+        "PORT": str(parsed.port or "5432"),
+    }
+    options = {}
+    if "sslmode" in params:
+        options["sslmode"] = params["sslmode"]
+
+    use_pool = _flag(params, "pool", False)
+    if use_pool and not pooling_available():
+        raise ImproperlyConfigured("Database URL sets pool=true but psycopg[pool] is not installed.")
+
+    if use_pool:
+        # Django's pool replaces persistent connections; CONN_MAX_AGE must stay 0.
+        options["pool"] = {
+            "min_size": _number(params, "pool_min_size", DEFAULT_POOL_MIN_SIZE),
+            "max_size": _number(params, "pool_max_size", DEFAULT_POOL_MAX_SIZE),
+            "max_idle": _number(params, "pool_max_idle", DEFAULT_POOL_MAX_IDLE, float),
+            "timeout": _number(params, "pool_timeout", DEFAULT_POOL_TIMEOUT, float),
+        }
+        config["CONN_MAX_AGE"] = 0
+    else:
+        config["CONN_MAX_AGE"] = _number(params, "conn_max_age", DEFAULT_CONN_MAX_AGE)
+        config["CONN_HEALTH_CHECKS"] = _flag(params, "conn_health_checks", True)
+
+    if options:
+        config["OPTIONS"] = options
+    return config
+
+
+def replica_urls(value):
+    """Splits a comma-separated ``DATABASE_REPLICA_URLS`` value."""
+    return [url.strip() for url in (value or "").split(",") if url.strip()]
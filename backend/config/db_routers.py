@@ -0,0 +1,151 @@
+"""
+Primary/replica routing with read-your-writes stickiness.
+
+Requests with a safe method (GET, HEAD, OPTIONS) read from one healthy replica
+listed in ``settings.DATABASE_REPLICAS``; everything else, and all code running
+outside a request (management commands, migrations, shells), uses ``default``.
+
+Reads go back to the primary when:
+
+* the request has already written, or is inside a transaction on the primary;
+* the client wrote recently: any unsafe request sets a short-lived cookie that
+  pins its reads to the primary for ``DATABASE_PRIMARY_STICKY_SECONDS``;
+* no replica is healthy. Replica lag is measured at most once per
+  ``DATABASE_REPLICA_HEALTH_CHECK_INTERVAL`` per process, and replicas that are
+  unreachable or more than ``DATABASE_REPLICA_MAX_LAG_SECONDS`` behind are skipped.
+"""
+
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_PIN_COOKIE = "db_primary_pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Seconds the replica is behind the primary; 0 when it has replayed everything
+# it received, NULL when recovery has not replayed any transaction yet.
+_REPLICA_LAG_SQL = """
+SELECT pg_is_in_recovery(),
+       CASE
+           WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+           ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+       END
+"""
+
+
+@dataclass
+class _RoutingState:
+    pinned: bool
+    replica: str | None = None
+    replica_chosen: bool = False
+
+
+_state = ContextVar("db_routing_state", default=None)
+_health = {}
+_health_lock = threading.Lock()
+
+
+def replica_aliases():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def measure_replica_lag(alias):
+    """Returns the replica's lag in seconds, or None if it cannot be determined."""
+    with connections[alias].cursor() as cursor:
+        cursor.execute(_REPLICA_LAG_SQL)
+        in_recovery, lag = cursor.fetchone()
+    if not in_recovery:
+        return 0.0
+    return None if lag is None else float(lag)
+
+
+def replica_is_healthy(alias):
+    now = time.monotonic()
+    interval = settings.DATABASE_REPLICA_HEALTH_CHECK_INTERVAL
+    with _health_lock:
+        cached = _health.get(alias)
+        if cached and now - cached[0] < interval:
+            return cached[1]
+
+    try:
+        lag = measure_replica_lag(alias)
+    except DatabaseError:
+        logger.warning("Replica %s is unreachable; reading from the primary.", alias, exc_info=True)
+        connections[alias].close()
+        healthy = False
+    else:
+        healthy = lag is not None and lag <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+        if not healthy:
+            logger.warning("Replica %s lag is %s seconds; reading from the primary.", alias, lag)
+
+    with _health_lock:
+        _health[alias] = (now, healthy)
+    return healthy
+
+
+def reset_replica_health():
+    with _health_lock:
+        _health.clear()
+
+
+def _choose_replica():
+    healthy = [alias for alias in replica_aliases() if replica_is_healthy(alias)]
+    return random.choice(healthy) if healthy else None
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.pinned or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if not state.replica_chosen:
+            # One replica per request keeps every read in it at the same point in time.
+            state.replica = _choose_replica()
+            state.replica_chosen = True
+        return state.replica or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        unsafe = request.method not in SAFE_METHODS
+        state = _RoutingState(pinned=unsafe or PRIMARY_PIN_COOKIE in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if unsafe:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_PRIMARY_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
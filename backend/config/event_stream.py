@@ -0,0 +1,126 @@
+"""
+Server-Sent Events over an outbox table.
+
+Writers insert event rows in the transaction that made the change and call
+``broadcast.publish()`` once it commits. A stream is an async generator that
+reads rows newer than the client's ``Last-Event-ID`` from the outbox and then
+waits for the next publish. It is served by ``StreamingHttpResponse`` from the
+ASGI application, so idle streams do not hold a worker thread.
+
+``LocalBroadcast`` only wakes streams in the publishing process. Streams in
+other processes pick events up on their next poll, at most
+``EVENT_STREAM_POLL_SECONDS`` later; that poll also sends the keep-alive
+comment. Swap in a shared pub/sub here if that latency matters.
+"""
+
+import asyncio
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from config.responses import dumps
+
+EVENT_BATCH_SIZE = 100
+RETRY_MILLISECONDS = 2000
+
+
+class LocalBroadcast:
+    """Wakes waiting streams in this process; safe to publish from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters = set()
+
+    @contextmanager
+    def listen(self):
+        """
+        Registers a waiter and yields an awaitable ``wait(timeout)`` returning
+        True when woken. Listen before reading the outbox so a publish between
+        the read and the wait is not missed.
+        """
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = (loop, event)
+        with self._lock:
+            self._waiters.add(waiter)
+
+        async def wait(timeout):
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except TimeoutError:
+                return False
+            return True
+
+        try:
+            yield wait
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    def publish(self):
+        with self._lock:
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(event.set)
+
+
+broadcast = LocalBroadcast()
+
+
+def last_event_id(request):
+    """The id to resume after: ``Last-Event-ID`` header, else ``last_event_id`` param."""
+    value = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    if value in (None, ""):
+        return None
+    value = int(value)
+    if value < 0:
+        raise ValueError
+    return value
+
+
+def format_event(event_id, name, data):
+    return f"id: {event_id}\nevent: {name}\ndata: ".encode() + dumps(data) + b"\n\n"
+
+
+async def stream_events(queryset, serialize, after_id=None, max_seconds=None):
+    """
+    Yields SSE frames for rows of ``queryset`` with ids above ``after_id``, in id
+    order, as ``serialize(row) -> (event name, data)``. Without ``after_id`` the
+    stream starts at the newest existing row. Ends after ``max_seconds``; the
+    browser reconnects with the last id it saw.
+    """
+    poll_seconds = getattr(settings, "EVENT_STREAM_POLL_SECONDS", 5)
+    if max_seconds is None:
+        max_seconds = getattr(settings, "EVENT_STREAM_MAX_SECONDS", 300)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+
+    if after_id is None:
+        after_id = await queryset.order_by("-id").values_list("id", flat=True).afirst() or 0
+    yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+
+    while True:
+        with broadcast.listen() as wait:
+            rows = [row async for row in queryset.filter(id__gt=after_id).order_by("id")[:EVENT_BATCH_SIZE]]
+            if not rows:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                if not await wait(min(poll_seconds, remaining)):
+                    yield b": keep-alive\n\n"
+                continue
+        for row in rows:
+            name, data = serialize(row)
+            yield format_event(row.id, name, data)
+            after_id = row.id
+
+
+def event_stream_response(events):
+    response = StreamingHttpResponse(events, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Ask nginx-style proxies not to buffer the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,118 @@
+"""
+Streaming file exports (iCalendar, CSV) and the date windows they are cut by.
+
+Exports are built from generators over ``QuerySet.iterator()``, which reads
+through a server-side cursor on Postgres. A response therefore holds one chunk
+of rows at a time however large the export is. Views wrap the generators in
+``StreamingHttpResponse``.
+"""
+
+import csv
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+
+EXPORT_CHUNK_SIZE = 500
+_ICS_LINE_OCTETS = 75
+
+
+def parse_date_window(params, default_start, default_days, max_days=366):
+    """
+    Returns aware ``(start, end)`` datetimes for the ``from``/``to`` ISO dates in
+    ``params``; ``to`` is inclusive, so ``end`` is midnight after it. Missing
+    bounds default to ``default_start`` and ``default_days`` after the start.
+    Raises ValueError with a client-facing message.
+    """
+    try:
+        start_day = date.fromisoformat(params["from"]) if params.get("from") else default_start
+        end_day = (
+            date.fromisoformat(params["to"])
+            if params.get("to")
+            else start_day + timedelta(days=default_days - 1)
+        )
+    except ValueError as exc:
+        raise ValueError("from and to must be ISO dates (YYYY-MM-DD)") from exc
+    if end_day < start_day:
+        raise ValueError("to must not be before from")
+    if (end_day - start_day).days >= max_days:
+        raise ValueError(f"the date window is limited to {max_days} days")
+    return (
+        timezone.make_aware(datetime.combine(start_day, time.min)),
+        timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min)),
+    )
+
+
+def _ics_escape(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _ics_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _ics_line(name, value):
+    # RFC 5545 3.1: fold content lines longer than 75 octets with CRLF + space,
+    # without splitting a UTF-8 sequence.
+    line = f"{name}:{value}".encode()
+    chunks = []
+    while len(line) > _ICS_LINE_OCTETS:
+        cut = _ICS_LINE_OCTETS if not chunks else _ICS_LINE_OCTETS - 1
+        while cut and (line[cut] & 0xC0) == 0x80:
+            cut -= 1
+        chunks.append(line[:cut])
+        line = line[cut:]
+    chunks.append(line)
+    return b"\r\n ".join(chunks) + b"\r\n"
+
+
+def stream_ics(events, calendar_name):
+    """
+    Yields an iCalendar document for ``events``: dicts with ``uid``, ``start``,
+    ``end``, ``summary`` and optionally ``location``, ``description``, ``status``
+    and ``updated``.
+    """
+    yield b"BEGIN:VCALENDAR\r\n"
+    yield _ics_line("VERSION", "2.0")
+    yield _ics_line("PRODID", "-//Healthcare Staff Management//Schedule//EN")
+    yield _ics_line("CALSCALE", "GREGORIAN")
+    yield _ics_line("X-WR-CALNAME", _ics_escape(calendar_name))
+    stamp = _ics_datetime(timezone.now())
+    for event in events:
+        lines = [
+            b"BEGIN:VEVENT\r\n",
+            _ics_line("UID", event["uid"]),
+            _ics_line("DTSTAMP", _ics_datetime(event["updated"]) if event.get("updated") else stamp),
+            _ics_line("DTSTART", _ics_datetime(event["start"])),
+            _ics_line("DTEND", _ics_datetime(event["end"])),
+            _ics_line("SUMMARY", _ics_escape(event["summary"])),
+        ]
+        for field in ("location", "description"):
+            if event.get(field):
+                lines.append(_ics_line(field.upper(), _ics_escape(event[field])))
+        if event.get("status"):
+            lines.append(_ics_line("STATUS", event["status"]))
+        lines.append(b"END:VEVENT\r\n")
+        yield b"".join(lines)
+    yield b"END:VCALENDAR\r\n"
+
+
+class _Echo:
+    """File-like object whose write() returns the line instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(header, rows):
+    """Yields ``header`` and then each row of ``rows`` as an encoded CSV line."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header).encode()
+    for row in rows:
+        yield writer.writerow(row).encode()
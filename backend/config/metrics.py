@@ -0,0 +1,105 @@
+"""
+Database connection gauges in the Prometheus text format, served at ``/metrics``.
+
+With a psycopg pool the gauges come from the pool's own statistics. With
+persistent connections only connections opened and failed requests are known,
+counted by this process since it started. Values are per process; scrape each
+worker or aggregate them.
+
+Requests must send ``Authorization: Bearer <METRICS_TOKEN>``; while
+``METRICS_TOKEN`` is empty the endpoint answers 403.
+"""
+
+import sys
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.signals import got_request_exception
+from django.db import InterfaceError, OperationalError, connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+_created = Counter()
+_errors = Counter()
+_lock = threading.Lock()
+
+
+def _count_connection(sender, connection, **kwargs):
+    with _lock:
+        _created[connection.alias] += 1
+
+
+def _count_connection_error(sender, request=None, **kwargs):
+    # The signal runs inside the exception handler; connection failures surface
+    # as OperationalError or InterfaceError from the driver.
+    exc = sys.exc_info()[1]
+    if isinstance(exc, (OperationalError, InterfaceError)):
+        with _lock:
+            _errors["all"] += 1
+
+
+connection_created.connect(_count_connection, dispatch_uid="config.metrics.connection_created")
+got_request_exception.connect(_count_connection_error, dispatch_uid="config.metrics.request_exception")
+
+
+def _pool_gauges(connection):
+    stats = connection.pool.get_stats()
+    size = stats.get("pool_size", 0)
+    available = stats.get("pool_available", 0)
+    return {
+        "db_pool_size": size,
+        "db_pool_max_size": stats.get("pool_max", 0),
+        "db_pool_connections_in_use": size - available,
+        "db_pool_connections_available": available,
+        "db_pool_requests_waiting": stats.get("requests_waiting", 0),
+        "db_pool_connections_created_total": stats.get("connections_num", 0),
+        "db_pool_connection_errors_total": stats.get("connections_errors", 0),
+        "db_pool_request_errors_total": stats.get("requests_errors", 0),
+    }
+
+
+def collect():
+    """Returns ``[(metric, labels, value)]`` for every configured database."""
+    samples = []
+    with _lock:
+        created = dict(_created)
+        errors = dict(_errors)
+    for alias in connections:
+        connection = connections[alias]
+        pooled = bool(getattr(connection, "pool", None))
+        if pooled:
+            mode = "pool"
+        elif connection.settings_dict.get("CONN_MAX_AGE"):
+            mode = "persistent"
+        else:
+            mode = "per_request"
+        labels = {"alias": alias, "mode": mode}
+        if pooled:
+            gauges = _pool_gauges(connection)
+        else:
+            gauges = {"db_pool_connections_created_total": created.get(alias, 0)}
+        samples.extend((name, labels, value) for name, value in gauges.items())
+    samples.append(("db_request_connection_errors_total", {}, errors.get("all", 0)))
+    return samples
+
+
+def render(samples):
+    lines = []
+    for name, labels, value in samples:
+        label_text = ",".join(f'{key}="{labels[key]}"' for key in sorted(labels))
+        lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+@require_GET
+def metrics(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token:
+        return HttpResponse(status=403)
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not constant_time_compare(supplied, token):
+        return HttpResponse(status=401)
+    return HttpResponse(render(collect()), content_type="text/plain; version=0.0.4")
@@ -0,0 +1,150 @@
+"""
+Keyset (cursor) pagination shared by the list endpoints.
+
+Pages are addressed by the sort key of the last row served rather than an offset,
+so the cost of a page does not grow with how much history sits in front of it.
+Cursors are opaque, signed tokens: clients echo ``next_cursor`` back as ``cursor``
+and cannot forge positions or reuse a cursor across endpoints.
+
+Sort keys must be non-null and end with a unique column (normally ``id``) so
+every row has a stable position.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core import signing
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+_CURSOR_SALT = "config.pagination.cursor"
+
+
+class InvalidPageRequest(ValueError):
+    """Raised for a malformed page_size or a cursor that fails verification."""
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    if value in (None, ""):
+        return default
+    try:
+        page_size = int(value)
+    except (TypeError, ValueError) as exc:
+        raise InvalidPageRequest("page_size must be an integer") from exc
+    if page_size <= 0 or page_size > maximum:
+        raise InvalidPageRequest(f"page_size must be between 1 and {maximum}")
+    return page_size
+
+
+def _dump_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _load_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+
+def encode_cursor(positions, scope):
+    payload = {
+        name: None if values is None else [_dump_value(value) for value in values]
+        for name, values in positions.items()
+    }
+    return signing.dumps(payload, salt=f"{_CURSOR_SALT}:{scope}", compress=True)
+
+
+def decode_cursor(token, scope):
+    try:
+        payload = signing.loads(token, salt=f"{_CURSOR_SALT}:{scope}")
+    except signing.BadSignature as exc:
+        raise InvalidPageRequest("cursor is invalid") from exc
+    if not isinstance(payload, dict):
+        raise InvalidPageRequest("cursor is invalid")
+    return {
+        name: None if values is None else [_load_value(value) for value in values]
+        for name, values in payload.items()
+    }
+
+
+def _parse_ordering(ordering):
+    return [(field.lstrip("-"), field.startswith("-")) for field in ordering]
+
+
+def _row_value(row, field):
+    if isinstance(row, dict):
+        return row[field]
+    value = row
+    for part in field.split("__"):
+        value = getattr(value, part)
+    return value
+
+
+def _after_filter(ordering, values):
+    # Lexicographic "row comes after values" for mixed asc/desc sort keys:
+    # (a > x) OR (a = x AND b > y) OR ...
+    condition = Q()
+    for index, (field, descending) in enumerate(ordering):
+        step = Q(**{f"{field}__{'lt' if descending else 'gt'}": values[index]})
+        for previous_index, (previous_field, _) in enumerate(ordering[:index]):
+            step &= Q(**{previous_field: values[previous_index]})
+        condition |= step
+    return condition
+
+
+def paginate_queryset(queryset, ordering, page_size, after=None):
+    """
+    Returns ``(rows, next_after)`` for one page of ``queryset`` sorted by ``ordering``.
+
+    ``after`` is the sort key of the last row of the previous page; ``next_after`` is
+    None once the queryset is exhausted.
+    """
+    parsed = _parse_ordering(ordering)
+    queryset = queryset.order_by(*ordering)
+    if after is not None:
+        if len(after) != len(parsed):
+            raise InvalidPageRequest("cursor is invalid")
+        queryset = queryset.filter(_after_filter(parsed, after))
+
+    rows = list(queryset[: page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, [_row_value(rows[-1], field) for field, _ in parsed]
+
+
+def paginate(streams, cursor, page_size, scope):
+    """
+    Pages one or more independently sorted querysets behind a single cursor.
+
+    ``streams`` maps a name to ``(queryset, ordering)``. Returns ``(pages, next_cursor)``
+    where ``pages`` maps each name to its rows; streams that ran out on an earlier page
+    come back empty, and ``next_cursor`` is None when every stream is exhausted.
+    """
+    positions = decode_cursor(cursor, scope) if cursor else None
+
+    pages = {}
+    next_positions = {}
+    for name, (queryset, ordering) in streams.items():
+        if positions is not None and positions.get(name) is None:
+            pages[name] = []
+            next_positions[name] = None
+            continue
+        after = positions.get(name) if positions else None
+        pages[name], next_positions[name] = paginate_queryset(queryset, ordering, page_size, after)
+
+    if all(values is None for values in next_positions.values()):
+        return pages, None
+    return pages, encode_cursor(next_positions, scope)
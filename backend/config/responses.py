@@ -0,0 +1,107 @@
+"""
+JSON rendering and compression shared by the API views.
+
+``JsonResponse`` is a drop-in replacement for Django's. It serializes with orjson
+when it is installed and falls back to the stdlib encoder with the same output.
+Both emit datetimes, dates and times as ISO 8601 strings, UUIDs as strings and
+Decimals as strings, so views can pass model values through unconverted.
+
+``CompressionMiddleware`` brotli- or gzip-encodes responses of at least
+``RESPONSE_COMPRESSION_MIN_BYTES`` when the client accepts it; brotli is used
+only if the ``brotli`` package is installed.
+"""
+
+import json
+import re
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_COMPRESSION_MIN_BYTES = 1024
+_ACCEPTS_BR = re.compile(r"\bbr\b")
+_ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data):
+    """Serializes ``data`` to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class JsonResponse(HttpResponse):
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError("In order to allow non-dict objects to be serialized set the safe parameter to False.")
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.has_header("Content-Encoding"):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        accept = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if response.streaming:
+            if not response.is_async and _ACCEPTS_GZIP.search(accept):
+                response.streaming_content = compress_sequence(response.streaming_content)
+                del response["Content-Length"]
+                self._mark_encoded(response, "gzip")
+            return response
+
+        minimum = getattr(settings, "RESPONSE_COMPRESSION_MIN_BYTES", DEFAULT_COMPRESSION_MIN_BYTES)
+        if len(response.content) < minimum:
+            return response
+
+        if brotli is not None and _ACCEPTS_BR.search(accept):
+            compressed, encoding = brotli.compress(response.content, quality=4), "br"
+        elif _ACCEPTS_GZIP.search(accept):
+            compressed, encoding = compress_string(response.content), "gzip"
+        else:
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        self._mark_encoded(response, encoding)
+        return response
+
+    @staticmethod
+    def _mark_encoded(response, encoding):
+        response.headers["Content-Encoding"] = encoding
+        # The encoded body is no longer byte-identical, so a strong ETag must weaken.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
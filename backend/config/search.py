@@ -0,0 +1,53 @@
+"""
+Relevance-ranked text search for the directory endpoints, backed by pg_trgm.
+
+Rows match when a searched column contains the query (ILIKE) or when its trigram
+word similarity to the query reaches ``DIRECTORY_SEARCH_SIMILARITY_THRESHOLD``.
+Both predicates are served by the ``gin_trgm_ops`` indexes on the searched
+columns, and matches are annotated with ``rank`` for relevance ordering.
+"""
+
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections, transaction
+from django.db.models import Q
+from django.db.models.functions import Greatest
+
+# Queries shorter than a trigram only match by substring.
+MIN_TRIGRAM_QUERY_LENGTH = 3
+RANKED_ORDERING = ("-rank", "id")
+
+
+def similarity_threshold():
+    return float(getattr(settings, "DIRECTORY_SEARCH_SIMILARITY_THRESHOLD", 0.3))
+
+
+@contextmanager
+def search_session(using):
+    """
+    Runs the enclosed queries in one transaction with the configured word
+    similarity threshold, which the ``%>`` operator reads from pg_trgm's GUC.
+    """
+    with transaction.atomic(using=using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(similarity_threshold())],
+            )
+        yield
+
+
+def ranked_search(queryset, query, fields):
+    """Filters ``queryset`` to rows matching ``query`` on ``fields`` and annotates ``rank``."""
+    similarities = [TrigramWordSimilarity(query, field) for field in fields]
+    rank = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+
+    match = Q()
+    for field in fields:
+        match |= Q(**{f"{field}__icontains": query})
+        if len(query) >= MIN_TRIGRAM_QUERY_LENGTH:
+            match |= Q(**{f"{field}__trigram_word_similar": query})
+
+    return queryset.filter(match).annotate(rank=rank)
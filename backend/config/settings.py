@@ -12,9 +12,10 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 
 import os
 from pathlib import Path
-from urllib.parse import urlparse
 from dotenv import load_dotenv
 
+from config.database import database_from_url, replica_urls
+
 load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,18 +43,21 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "hospital",
     "staff",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "config.responses.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "config.db_routers.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -84,22 +88,104 @@ database_url = os.getenv("DATABASE_URL")
 if not database_url:
     raise ValueError("DATABASE_URL is required and must point to Supabase Postgres.")
 
-parsed_db_url = urlparse(database_url)
-db_name = parsed_db_url.path.lstrip("/")
-
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": db_name,
-        "USER": parsed_db_url.username,
-        "PASSWORD": parsed_db_url.password,
-        "HOST": parsed_db_url.hostname,
-        "PORT": str(parsed_db_url.port or "5432"),
+DATABASES = {"default": database_from_url(database_url)}
+
+# Optional read replicas, as a comma-separated list of Postgres URLs. Safe-method
+# requests read from a healthy replica; see config/db_routers.py.
+DATABASE_REPLICAS = []
+for index, replica_url in enumerate(replica_urls(os.getenv("DATABASE_REPLICA_URLS")), start=1):
+    alias = f"replica_{index}"
+    DATABASES[alias] = {**database_from_url(replica_url), "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["config.db_routers.PrimaryReplicaRouter"]
+
+# A replica further behind than this is skipped until it catches up.
+DATABASE_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DATABASE_REPLICA_MAX_LAG_SECONDS", "5"))
+DATABASE_REPLICA_HEALTH_CHECK_INTERVAL = float(os.getenv("DATABASE_REPLICA_HEALTH_CHECK_INTERVAL", "5"))
+# After a write, the client reads from the primary for this long. Keep it above
+# the max lag so a client always sees its own writes.
+DATABASE_PRIMARY_STICKY_SECONDS = int(os.getenv("DATABASE_PRIMARY_STICKY_SECONDS", "10"))
+
+
+# Cache
+# Cached payloads are invalidated by bumping version keys (config/cache_versions.py),
+# so every worker must share the cache: set REDIS_URL whenever more than one
+# process serves requests. The local-memory fallback suits a single dev server.
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
     }
-}
 
-if "sslmode=require" in database_url:
-    DATABASES["default"]["OPTIONS"] = {"sslmode": "require"}
+
+# Seconds a process trusts its in-memory professions/skills/departments before
+# re-checking the reference data version row (staff/services/reference_data.py).
+REFERENCE_DATA_CHECK_INTERVAL = float(os.getenv("REFERENCE_DATA_CHECK_INTERVAL", "5"))
+
+
+# Responses at least this large are gzip/brotli encoded when the client accepts it.
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+
+
+# Bearer token required by the /metrics endpoint; empty disables the endpoint.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+# Upper bound on how long a cached staff dashboard can miss hospital/department
+# renames; the staff member's own writes invalidate it immediately.
+STAFF_DASHBOARD_CACHE_SECONDS = int(os.getenv("STAFF_DASHBOARD_CACHE_SECONDS", "300"))
+
+
+# Upcoming same-profession jobs scored per staff recommendation request.
+RECOMMENDATION_CANDIDATE_POOL = int(os.getenv("RECOMMENDATION_CANDIDATE_POOL", "200"))
+
+
+# Jobs kept in each staff member's precomputed recommendation feed.
+STAFF_JOB_FEED_SIZE = int(os.getenv("STAFF_JOB_FEED_SIZE", "50"))
+
+
+# Staff scored per shift auto-fill; the match index picks who is scored first.
+AUTOFILL_CANDIDATE_POOL = int(os.getenv("AUTOFILL_CANDIDATE_POOL", "500"))
+
+
+# Staff considered by the weekly roster optimizer (``/api/hospital/roster/optimize/``);
+# staff already linked to the hospital come first, then by rating.
+ROSTER_STAFF_POOL = int(os.getenv("ROSTER_STAFF_POOL", "2000"))
+
+
+# Most postings one ``/api/hospital/shifts/bulk/`` request may create.
+JOB_POSTING_BULK_LIMIT = int(os.getenv("JOB_POSTING_BULK_LIMIT", "1000"))
+# How far past its first shift a recurring bulk posting may run.
+JOB_POSTING_RECURRENCE_MAX_WEEKS = int(os.getenv("JOB_POSTING_RECURRENCE_MAX_WEEKS", "52"))
+
+
+# Postings whose shift ended more than this many days ago are moved to the
+# archive tables by ``manage.py archive_jobs``.
+JOB_ARCHIVE_RETENTION_DAYS = int(os.getenv("JOB_ARCHIVE_RETENTION_DAYS", "180"))
+
+
+# Server-Sent Event streams (``/api/*/events/``): how often a stream re-reads the
+# outbox when no local publish woke it, how long a connection lives before the
+# client reconnects, and how long ``manage.py prune_change_events`` keeps events.
+EVENT_STREAM_POLL_SECONDS = float(os.getenv("EVENT_STREAM_POLL_SECONDS", "5"))
+EVENT_STREAM_MAX_SECONDS = float(os.getenv("EVENT_STREAM_MAX_SECONDS", "300"))
+CHANGE_EVENT_RETENTION_HOURS = int(os.getenv("CHANGE_EVENT_RETENTION_HOURS", "24"))
+
+
+# Directory search
+# Minimum pg_trgm word similarity (0..1) for a fuzzy directory match; substring
+# matches are always returned.
+DIRECTORY_SEARCH_SIMILARITY_THRESHOLD = float(os.getenv("DIRECTORY_SEARCH_SIMILARITY_THRESHOLD", "0.3"))
 
 
 # Password validation
@@ -18,8 +18,11 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 
+from config.metrics import metrics
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/hospital/", include("hospital.urls")),
     path("api/staff/", include("staff.urls")),
+    path("metrics", metrics, name="metrics"),
 ]
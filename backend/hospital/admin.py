@@ -1,15 +1,20 @@
 from django.contrib import admin
 
 from .models import (
+    ArchivedJobPosting,
     Attendance,
+    ChangeEvent,
     Department,
     Hospital,
     HospitalReview,
+    HospitalStaffLink,
     JobApplication,
     JobPosting,
     JobRequiredSkill,
     ShiftAssignment,
     StaffHospitalAffiliation,
+    StaffHospitalHistory,
+    StaffWeekWorkdays,
 )
 
 
@@ -31,6 +36,12 @@ class StaffHospitalAffiliationAdmin(admin.ModelAdmin):
     list_filter = ("status", "hospital")
 
 
+@admin.register(HospitalStaffLink)
+class HospitalStaffLinkAdmin(admin.ModelAdmin):
+    list_display = ("hospital", "staff", "is_affiliated", "has_applied", "has_assignment", "last_seen")
+    list_filter = ("is_affiliated", "has_applied", "has_assignment")
+
+
 @admin.register(JobPosting)
 class JobPostingAdmin(admin.ModelAdmin):
     list_display = (
@@ -40,6 +51,8 @@ class JobPostingAdmin(admin.ModelAdmin):
         "profession",
         "status",
         "required_staff_count",
+        "assigned_count",
+        "active_applicant_count",
         "shift_start",
         "shift_end",
     )
@@ -64,6 +77,12 @@ class ShiftAssignmentAdmin(admin.ModelAdmin):
     list_filter = ("status",)
 
 
+@admin.register(StaffWeekWorkdays)
+class StaffWeekWorkdaysAdmin(admin.ModelAdmin):
+    list_display = ("staff", "iso_year", "iso_week", "day_mask")
+    list_filter = ("iso_year",)
+
+
 @admin.register(Attendance)
 class AttendanceAdmin(admin.ModelAdmin):
     list_display = ("assignment", "status", "check_in_time", "check_out_time")
@@ -74,3 +93,20 @@ class AttendanceAdmin(admin.ModelAdmin):
 class HospitalReviewAdmin(admin.ModelAdmin):
     list_display = ("hospital", "staff", "rating", "created_at")
     list_filter = ("rating",)
+
+
+@admin.register(ArchivedJobPosting)
+class ArchivedJobPostingAdmin(admin.ModelAdmin):
+    list_display = ("id", "hospital", "profession_name", "department_name", "shift_start", "status", "archived_at")
+    list_filter = ("status",)
+
+
+@admin.register(StaffHospitalHistory)
+class StaffHospitalHistoryAdmin(admin.ModelAdmin):
+    list_display = ("staff", "hospital", "assignment_count")
+
+
+@admin.register(ChangeEvent)
+class ChangeEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "hospital", "staff", "job_id", "created_at")
+    list_filter = ("kind",)
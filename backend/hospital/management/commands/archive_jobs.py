@@ -0,0 +1,66 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from hospital.models import ArchivedJobPosting, JobPosting
+
+
+class Command(BaseCommand):
+    help = (
+        "Move job postings whose shift ended more than --retention-days ago, with "
+        "their applications, assignments, attendance and required skills, into the "
+        "archive tables. Runs in small transactions and sleeps between batches so "
+        "it can run alongside live traffic."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=getattr(settings, "JOB_ARCHIVE_RETENTION_DAYS", 180),
+            help="Keep postings whose shift ended within this many days.",
+        )
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.5,
+            help="Seconds to pause between batches.",
+        )
+        parser.add_argument("--max-batches", type=int, help="Stop after this many batches.")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many postings would be archived.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["retention_days"])
+        candidates = JobPosting.objects.filter(shift_end__lt=cutoff)
+
+        if options["dry_run"]:
+            self.stdout.write(f"{candidates.count()} posting(s) ended before {cutoff:%Y-%m-%d %H:%M}.")
+            return
+
+        archived = batches = 0
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            with transaction.atomic():
+                # skip_locked leaves postings that a live request is touching for the next run.
+                job_ids = list(
+                    candidates.order_by("shift_end", "id")
+                    .select_for_update(skip_locked=True)
+                    .values_list("id", flat=True)[: options["batch_size"]]
+                )
+                if not job_ids:
+                    break
+                archived += ArchivedJobPosting.archive(job_ids)
+            batches += 1
+            self.stdout.write(f"Batch {batches}: {archived} posting(s) archived so far.")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} job posting(s) in {batches} batch(es)."))
@@ -0,0 +1,56 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from hospital.models import ShiftAssignment, StaffWeekWorkdays
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the staff_week_workdays ledger from ASSIGNED and COMPLETED "
+        "shift assignments. Safe to re-run; existing ledger rows are replaced."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--staff-id",
+            type=int,
+            help="Only rebuild the ledger for this staff profile.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        staff_id = options.get("staff_id")
+        batch_size = options["batch_size"]
+
+        assignments = ShiftAssignment.objects.filter(status__in=ShiftAssignment.WORKDAY_STATUSES)
+        ledger = StaffWeekWorkdays.objects.all()
+        if staff_id:
+            assignments = assignments.filter(staff_id=staff_id)
+            ledger = ledger.filter(staff_id=staff_id)
+
+        masks = defaultdict(int)
+        rows = assignments.values_list("staff_id", "shift_start_snapshot").iterator(chunk_size=batch_size)
+        for row_staff_id, shift_start in rows:
+            day = timezone.localdate(shift_start)
+            iso_year, iso_week = StaffWeekWorkdays.week_key(day)
+            masks[(row_staff_id, iso_year, iso_week)] |= StaffWeekWorkdays.day_bit(day)
+
+        with transaction.atomic():
+            ledger.delete()
+            StaffWeekWorkdays.objects.bulk_create(
+                [
+                    StaffWeekWorkdays(
+                        staff_id=row_staff_id,
+                        iso_year=iso_year,
+                        iso_week=iso_week,
+                        day_mask=day_mask,
+                    )
+                    for (row_staff_id, iso_year, iso_week), day_mask in masks.items()
+                ],
+                batch_size=batch_size,
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(masks)} staff week ledger rows."))
@@ -0,0 +1,77 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request database latency with a new connection per request "
+        "versus the configured pool or persistent connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per mode.")
+        parser.add_argument("--database", default="default", help="Database alias to benchmark.")
+
+    def _timed(self, requests, run_request):
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            run_request()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def _report(self, label, timings):
+        ordered = sorted(timings)
+        p95 = ordered[max(int(len(ordered) * 0.95) - 1, 0)]
+        self.stdout.write(
+            f"{label:<24} mean {statistics.mean(ordered):7.2f} ms   "
+            f"p50 {statistics.median(ordered):7.2f} ms   p95 {p95:7.2f} ms"
+        )
+        return statistics.mean(ordered)
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        requests = options["requests"]
+        managed = connections[alias]
+
+        # Same settings without pooling or reuse: what every request paid before.
+        unmanaged_settings = {
+            **managed.settings_dict,
+            "CONN_MAX_AGE": 0,
+            "CONN_HEALTH_CHECKS": False,
+            "OPTIONS": {
+                key: value
+                for key, value in managed.settings_dict.get("OPTIONS", {}).items()
+                if key != "pool"
+            },
+        }
+        unmanaged = managed.__class__(unmanaged_settings, alias=alias)
+
+        def fresh_connection_request():
+            with unmanaged.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            unmanaged.close()
+
+        def managed_request():
+            # The request signals run Django's own connection lifecycle, so this
+            # reuses, health-checks or returns pooled connections as configured.
+            request_started.send(sender=self.__class__)
+            with managed.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            request_finished.send(sender=self.__class__)
+
+        managed_request()
+        mode = "pool" if managed.pool else f"CONN_MAX_AGE={managed.settings_dict['CONN_MAX_AGE']}"
+        baseline = self._report("new connection", self._timed(requests, fresh_connection_request))
+        configured = self._report(mode, self._timed(requests, managed_request))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Saved {baseline - configured:.2f} ms per request "
+                f"({requests} requests per mode against '{alias}')."
+            )
+        )
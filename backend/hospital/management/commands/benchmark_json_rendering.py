@@ -0,0 +1,90 @@
+import statistics
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.http import JsonResponse as DjangoJsonResponse
+from django.utils import timezone
+from django.utils.text import compress_string
+
+from config import responses
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rendering a recommendation-sized payload with Django's JsonResponse "
+        "and with config.responses.JsonResponse."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500, help="Result rows in the payload.")
+        parser.add_argument("--iterations", type=int, default=200, help="Renders per serializer.")
+
+    def _payload(self, rows):
+        now = timezone.now()
+        return {
+            "job_id": 1,
+            "results": [
+                {
+                    "staff_id": index,
+                    "user_id": uuid.uuid4(),
+                    "name": f"Staff Member {index}",
+                    "role": "Registered Nurse",
+                    "rating": 4.5,
+                    "hourly_rate": Decimal("52.50"),
+                    "shift_start": now + timedelta(hours=index),
+                    "shift_end": now + timedelta(hours=index + 8),
+                    "match": 87,
+                    "tags": [
+                        {"key": "skill_match", "value": 90},
+                        {"key": "availability_fit", "value": 100},
+                        {"key": "past_shift_history", "value": 40},
+                        {"key": "staff_reliability", "value": 92},
+                    ],
+                }
+                for index in range(rows)
+            ],
+        }
+
+    def _time(self, iterations, render):
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        payload = self._payload(options["rows"])
+        iterations = options["iterations"]
+
+        baseline = self._time(iterations, lambda: DjangoJsonResponse(payload))
+        fast = self._time(iterations, lambda: responses.JsonResponse(payload))
+        orjson_module = responses.orjson
+        responses.orjson = None
+        try:
+            fallback = self._time(iterations, lambda: responses.JsonResponse(payload))
+        finally:
+            responses.orjson = orjson_module
+
+        body = responses.JsonResponse(payload).content
+        engine = "orjson" if orjson_module is not None else "stdlib (orjson not installed)"
+        self.stdout.write(f"django.http.JsonResponse      {baseline:8.2f} ms")
+        self.stdout.write(f"config JsonResponse [{engine}] {fast:8.2f} ms")
+        self.stdout.write(f"config JsonResponse [stdlib]   {fallback:8.2f} ms")
+        self.stdout.write(
+            f"Body {len(body)} bytes, gzip {len(compress_string(body))} bytes"
+            + (
+                f", brotli {len(responses.brotli.compress(body, quality=4))} bytes"
+                if responses.brotli is not None
+                else ""
+            )
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{baseline / fast:.1f}x faster than Django's JsonResponse "
+                f"({options['rows']} rows, median of {iterations})."
+            )
+        )
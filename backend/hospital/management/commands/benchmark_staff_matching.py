@@ -0,0 +1,118 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from hospital.models import Department, JobPosting
+from staff.models import Profession, Skill, StaffMatchProfile
+from staff.services import matching
+
+INSERT_SYNTHETIC_STAFF_SQL = """
+WITH users AS (
+    INSERT INTO app_users (id, created_at, updated_at, full_name, email, role, is_active)
+    SELECT gen_random_uuid(), now(), now(), 'Benchmark Staff ' || n, 'benchmark-staff-' || n || '@example.invalid',
+           'STAFF', true
+    FROM generate_series(1, %s) AS n
+    RETURNING id
+)
+INSERT INTO staff_profiles (
+    created_at, updated_at, user_id, profession_id, phone, status, years_experience,
+    rating_avg, total_completed_shifts, avatar_url
+)
+SELECT now(), now(), users.id, (%s::bigint[])[1 + (random() * (cardinality(%s::bigint[]) - 1))::int],
+       '', 'ACTIVE', 0, 0, 0, ''
+FROM users
+RETURNING id, profession_id
+"""
+
+# Weekly availability as (start hour, end hour) on each chosen day; hours past 24
+# run into the next morning.
+SHIFT_TEMPLATES = [(7, 19), (19, 31), (8, 16), (0, 24)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure job postings per second through the create-and-match path against "
+        "synthetic staff. All data is created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--staff", type=int, default=500_000, help="Synthetic staff members.")
+        parser.add_argument("--jobs", type=int, default=500, help="Job postings to create.")
+        parser.add_argument("--seed", type=int, default=7, help="Random seed.")
+
+    def _synthetic_keys(self, rng, profession_id, skill_ids):
+        keys = {matching.profession_key(profession_id)}
+        for skill_id in rng.sample(skill_ids, k=rng.randint(0, min(3, len(skill_ids)))):
+            level = rng.randint(1, matching.MAX_SKILL_LEVEL)
+            keys.update(matching.skill_key(skill_id, value) for value in range(1, level + 1))
+        start_hour, end_hour = rng.choice(SHIFT_TEMPLATES)
+        for day in rng.sample(range(7), k=rng.randint(2, 5)):
+            keys.update(
+                matching.availability_key((day + half // 48) % 7, half % 48)
+                for half in range(start_hour * 2, end_hour * 2)
+            )
+        return sorted(keys)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        profession_ids = list(Profession.objects.values_list("id", flat=True))
+        skill_ids = list(Skill.objects.values_list("id", flat=True))
+        departments = list(Department.objects.values_list("id", "hospital_id"))
+        if not profession_ids or not departments:
+            raise CommandError("Needs professions and departments; run seed_demo_data first.")
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute(INSERT_SYNTHETIC_STAFF_SQL, [options["staff"], profession_ids, profession_ids])
+                staff = cursor.fetchall()
+            for start in range(0, len(staff), 10_000):
+                StaffMatchProfile.objects.bulk_create(
+                    StaffMatchProfile(staff_id=staff_id, keys=self._synthetic_keys(rng, profession_id, skill_ids))
+                    for staff_id, profession_id in staff[start : start + 10_000]
+                )
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE staff_match_profiles")
+            self.stdout.write(f"Indexed {len(staff)} synthetic staff in {time.perf_counter() - started:.1f} s.")
+
+            first_day = timezone.localtime().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+            timings, notified = [], []
+            total_started = time.perf_counter()
+            for _ in range(options["jobs"]):
+                department_id, hospital_id = rng.choice(departments)
+                shift_start = first_day.replace(hour=rng.choice([7, 19])) + timedelta(days=rng.randint(0, 27))
+                job = JobPosting(
+                    hospital_id=hospital_id,
+                    department_id=department_id,
+                    profession_id=rng.choice(profession_ids),
+                    required_staff_count=1,
+                    shift_start=shift_start,
+                    shift_end=shift_start + timedelta(hours=12),
+                    hourly_rate=50,
+                )
+                job_started = time.perf_counter()
+                # The same savepoint-wrapped save and match create_job_posting runs.
+                with transaction.atomic():
+                    job.save()
+                    notified.append(matching.notify_eligible_staff(job, required_skills=[]))
+                timings.append((time.perf_counter() - job_started) * 1000)
+            elapsed = time.perf_counter() - total_started
+            transaction.set_rollback(True)
+
+        ordered = sorted(timings)
+        p95 = ordered[max(int(len(ordered) * 0.95) - 1, 0)]
+        self.stdout.write(
+            f"per posting: p50 {statistics.median(ordered):.2f} ms   p95 {p95:.2f} ms   "
+            f"eligible staff: mean {statistics.mean(notified):.0f}, max {max(notified)}"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(timings) / elapsed:.1f} job postings/s with matching against {len(staff)} staff "
+                "(rolled back)."
+            )
+        )
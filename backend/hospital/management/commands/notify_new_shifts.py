@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from staff.services import matching
+
+
+class Command(BaseCommand):
+    help = (
+        "Write NEW_SHIFT notifications for job postings queued when they were created. "
+        "Run it every minute, or keep it running with --poll."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50, help="Queued batches handled per transaction.")
+        parser.add_argument(
+            "--poll",
+            type=float,
+            help="Keep running, checking an empty queue again after this many seconds.",
+        )
+
+    def handle(self, *args, **options):
+        postings = notified = 0
+        while True:
+            batch = matching.process_queued_notifications(options["batch_size"])
+            postings += len(batch)
+            notified += sum(batch.values())
+            if batch:
+                continue
+            if options["poll"] is None:
+                break
+            time.sleep(options["poll"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Matched {notified} eligible staff across {postings} new job posting(s).")
+        )
@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from config.responses import dumps
+from hospital.models import Hospital
+from hospital.services import roster
+
+
+class Command(BaseCommand):
+    help = (
+        "Propose a roster for one hospital's open shifts in an ISO week, maximizing the "
+        "total staff match under the overlap and weekly-days rules. Nothing is written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hospital-id", type=int, required=True, help="Hospital to roster.")
+        parser.add_argument("--week", default="", help="ISO week like 2026-W43; defaults to the current week.")
+        parser.add_argument("--staff-limit", type=int, help="Staff considered; defaults to ROSTER_STAFF_POOL.")
+        parser.add_argument("--json", action="store_true", help="Print the full proposal as JSON.")
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            help="Also report filling the same shifts one at a time in shift order.",
+        )
+
+    def handle(self, *args, **options):
+        if not Hospital.objects.filter(id=options["hospital_id"]).exists():
+            raise CommandError(f"Hospital {options['hospital_id']} does not exist.")
+        if options["staff_limit"] is not None and options["staff_limit"] <= 0:
+            raise CommandError("--staff-limit must be greater than 0.")
+        try:
+            week_start = roster.parse_week(options["week"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        result = roster.optimize_week(options["hospital_id"], week_start, options["staff_limit"])
+        if options["json"]:
+            self.stdout.write(dumps(result).decode())
+            return
+
+        for job in result["jobs"]:
+            picks = ", ".join(f"{pick['staff_id']} ({pick['match']})" for pick in job["proposed"]) or "-"
+            self.stdout.write(
+                f"job {job['job_id']} {timezone.localtime(job['shift_start']):%a %H:%M} {job['profession']}: "
+                f"{len(job['proposed'])}/{job['open_slots']} {picks}"
+            )
+        objective = result["objective"]
+        if options["compare"]:
+            problem = roster.build_problem(options["hospital_id"], week_start, options["staff_limit"])
+            started = time.perf_counter()
+            baseline = roster.objective(problem, roster.solve_in_posting_order(problem))
+            self.stdout.write(
+                f"shift-order baseline: {baseline['filled']}/{baseline['open_slots']} filled, "
+                f"total match {baseline['total_match']} ({(time.perf_counter() - started) * 1000:.0f} ms to solve)"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result['week']}: {objective['filled']}/{objective['open_slots']} slots filled from "
+                f"{result['staff_considered']} staff, total match {objective['total_match']} "
+                f"(mean {objective['mean_match']}) in {result['elapsed_ms']} ms."
+            )
+        )
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from staff.services import job_feed
+
+
+class Command(BaseCommand):
+    help = (
+        "Rescore the job postings queued for a feed refresh when they were saved or deleted. "
+        "Run it every minute, or keep it running with --poll."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Postings rescored per transaction.")
+        parser.add_argument(
+            "--poll",
+            type=float,
+            help="Keep running, checking an empty queue again after this many seconds.",
+        )
+
+    def handle(self, *args, **options):
+        refreshed = 0
+        while True:
+            batch = job_feed.process_refreshes(options["batch_size"])
+            refreshed += batch
+            if batch:
+                continue
+            if options["poll"] is None:
+                break
+            time.sleep(options["poll"])
+
+        self.stdout.write(self.style.SUCCESS(f"Refreshed job feeds for {refreshed} job posting(s)."))
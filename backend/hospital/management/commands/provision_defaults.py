@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from hospital.models import Department, Hospital
+from staff.models import Profession
+
+
+class Command(BaseCommand):
+    help = "Create the default professions and each hospital's default departments if missing."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hospital-id",
+            type=int,
+            help="Only provision departments for this hospital.",
+        )
+
+    def handle(self, *args, **options):
+        professions = Profession.provision_defaults()
+
+        hospitals = Hospital.objects.order_by("id")
+        if options.get("hospital_id"):
+            hospitals = hospitals.filter(id=options["hospital_id"])
+
+        departments = 0
+        for hospital in hospitals.iterator():
+            departments += Department.provision_defaults(hospital)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {professions} profession(s) and {departments} department(s)."
+            )
+        )
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from hospital.models import ChangeEvent
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete streamed change events older than --retention-hours. Clients that "
+        "reconnect with an older Last-Event-ID should refetch their data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-hours",
+            type=int,
+            default=getattr(settings, "CHANGE_EVENT_RETENTION_HOURS", 24),
+            help="Keep events created within this many hours.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["retention_hours"])
+        deleted, _ = ChangeEvent.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} change event(s)."))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from hospital.models import HospitalStaffLink
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the hospital_staff_link table from staff affiliations, job "
+        "applications and shift assignments."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hospital-id",
+            type=int,
+            help="Only rebuild links for this hospital.",
+        )
+
+    def handle(self, *args, **options):
+        created = HospitalStaffLink.rebuild(hospital_id=options.get("hospital_id"))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {created} hospital-staff link(s)."))
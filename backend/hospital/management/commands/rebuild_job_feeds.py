@@ -0,0 +1,47 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from staff.models import StaffProfile
+from staff.services import job_feed
+
+
+def _init_worker():
+    django.setup()
+    # Forked workers must not share the parent's database sockets.
+    connections.close_all()
+
+
+def _rebuild_chunk(staff_ids):
+    return job_feed.refresh_staff_feeds(staff_ids)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the precomputed job feed of every active staff member, "
+        "spreading staff across worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Worker processes; 1 runs inline.")
+        parser.add_argument("--batch-size", type=int, default=200, help="Staff members per work item.")
+        parser.add_argument("--staff-id", type=int, help="Only rebuild this staff member's feed.")
+
+    def handle(self, *args, **options):
+        staff = StaffProfile.objects.order_by("id")
+        if options.get("staff_id"):
+            staff = staff.filter(id=options["staff_id"])
+        staff_ids = list(staff.values_list("id", flat=True))
+        batch_size = options["batch_size"]
+        chunks = [staff_ids[start : start + batch_size] for start in range(0, len(staff_ids), batch_size)]
+
+        if options["workers"] <= 1 or len(chunks) <= 1:
+            rebuilt = sum(_rebuild_chunk(chunk) for chunk in chunks)
+        else:
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options["workers"], initializer=_init_worker) as pool:
+                rebuilt = sum(pool.map(_rebuild_chunk, chunks))
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt job feeds for {rebuilt} active staff member(s)."))
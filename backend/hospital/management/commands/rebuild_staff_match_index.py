@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from staff.models import StaffMatchProfile, StaffProfile
+from staff.services import matching
+
+
+class Command(BaseCommand):
+    help = "Rebuild the staff match profiles that new job postings are matched against."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Staff members per batch.")
+
+    def handle(self, *args, **options):
+        staff_ids = list(StaffProfile.objects.order_by("id").values_list("id", flat=True))
+        batch_size = options["batch_size"]
+        indexed = 0
+        for start in range(0, len(staff_ids), batch_size):
+            indexed += matching.reindex_staff(staff_ids[start : start + batch_size])
+        StaffMatchProfile.objects.exclude(staff_id__in=StaffProfile.objects.values("id")).delete()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} active staff member(s)."))
@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from hospital.models import Hospital, HospitalReview
+
+
+class Command(BaseCommand):
+    help = (
+        "Detect and fix drift in the denormalized Hospital review_count, "
+        "rating_avg and rating_score columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted hospitals without writing corrections.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        batch_size = options["batch_size"]
+
+        reviews = HospitalReview.objects.filter(hospital=OuterRef("pk")).values("hospital")
+        review_count = Coalesce(
+            Subquery(reviews.annotate(total=Count("id")).values("total"), output_field=IntegerField()),
+            Value(0),
+        )
+        rating_total = Coalesce(
+            Subquery(
+                reviews.annotate(total=Sum("rating")).values("total"),
+                output_field=DecimalField(max_digits=10, decimal_places=1),
+            ),
+            Value(Decimal("0")),
+        )
+
+        hospitals = (
+            Hospital.objects.annotate(actual_count=review_count, actual_total=rating_total)
+            .only("id", *Hospital.RATING_FIELDS)
+            .order_by("id")
+        )
+        drifted = []
+        for hospital in hospitals.iterator(chunk_size=batch_size):
+            if hospital.review_count == hospital.actual_count and hospital.rating_total == hospital.actual_total:
+                continue
+            self.stdout.write(
+                f"hospital={hospital.id} reviews {hospital.review_count}->{hospital.actual_count} "
+                f"total {hospital.rating_total}->{hospital.actual_total}"
+            )
+            drifted.append(hospital.id)
+
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING(f"{len(drifted)} hospital(s) drifted (dry run, nothing fixed).")
+            )
+            return
+
+        # Recount inside the UPDATE itself so reviews racing this command are not clobbered.
+        for start in range(0, len(drifted), batch_size):
+            Hospital.objects.filter(pk__in=drifted[start : start + batch_size]).update(
+                review_count=review_count,
+                rating_total=rating_total,
+                **Hospital.rating_expressions(rating_total, review_count),
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Fixed {len(drifted)} drifted hospital rating(s)."))
@@ -0,0 +1,82 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from hospital.models import JobApplication, JobPosting, ShiftAssignment
+
+
+class Command(BaseCommand):
+    help = (
+        "Detect and fix drift in the denormalized JobPosting.assigned_count and "
+        "JobPosting.active_applicant_count columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted jobs without writing corrections.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        batch_size = options["batch_size"]
+
+        jobs = (
+            JobPosting.objects.annotate(
+                actual_assigned=Count(
+                    "assignments",
+                    filter=Q(assignments__status=ShiftAssignment.Status.ASSIGNED),
+                    distinct=True,
+                ),
+                actual_active_applicants=Count(
+                    "applications",
+                    filter=Q(applications__status__in=JobApplication.ACTIVE_STATUSES),
+                    distinct=True,
+                ),
+            )
+            .only("id", *JobPosting.COUNTER_FIELDS)
+            .order_by("id")
+        )
+
+        drifted = []
+        for job in jobs.iterator(chunk_size=batch_size):
+            if (
+                job.assigned_count == job.actual_assigned
+                and job.active_applicant_count == job.actual_active_applicants
+            ):
+                continue
+            self.stdout.write(
+                f"job={job.id} assigned {job.assigned_count}->{job.actual_assigned} "
+                f"active_applicants {job.active_applicant_count}->{job.actual_active_applicants}"
+            )
+            drifted.append(job)
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"{len(drifted)} job(s) drifted (dry run, nothing fixed)."))
+            return
+
+        # Recount inside the UPDATE itself so writes racing this command are not clobbered.
+        assigned = (
+            ShiftAssignment.objects.filter(job=OuterRef("pk"), status=ShiftAssignment.Status.ASSIGNED)
+            .values("job")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        active_applicants = (
+            JobApplication.objects.filter(job=OuterRef("pk"), status__in=JobApplication.ACTIVE_STATUSES)
+            .values("job")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        drifted_ids = [job.id for job in drifted]
+        for start in range(0, len(drifted_ids), batch_size):
+            JobPosting.objects.filter(pk__in=drifted_ids[start : start + batch_size]).update(
+                assigned_count=Coalesce(Subquery(assigned, output_field=IntegerField()), Value(0)),
+                active_applicant_count=Coalesce(
+                    Subquery(active_applicants, output_field=IntegerField()), Value(0)
+                ),
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Fixed {len(drifted)} drifted job counter(s)."))
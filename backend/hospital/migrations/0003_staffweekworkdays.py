@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital', '0002_jobrequiredskill'),
+        ('staff', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaffWeekWorkdays',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('iso_year', models.PositiveSmallIntegerField()),
+                ('iso_week', models.PositiveSmallIntegerField()),
+                ('day_mask', models.PositiveSmallIntegerField(default=0)),
+                ('staff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='week_workdays', to='staff.staffprofile')),
+            ],
+            options={
+                'db_table': 'staff_week_workdays',
+                'constraints': [models.UniqueConstraint(fields=('staff', 'iso_year', 'iso_week'), name='unique_staff_iso_week')],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:22
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    JobPosting = apps.get_model("hospital", "JobPosting")
+    ShiftAssignment = apps.get_model("hospital", "ShiftAssignment")
+    JobApplication = apps.get_model("hospital", "JobApplication")
+
+    assigned = (
+        ShiftAssignment.objects.filter(job=OuterRef("pk"), status="ASSIGNED")
+        .values("job")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    active_applicants = (
+        JobApplication.objects.filter(
+            Q(status="APPLIED") | Q(status="SHORTLISTED"),
+            job=OuterRef("pk"),
+        )
+        .values("job")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    JobPosting.objects.update(
+        assigned_count=Coalesce(Subquery(assigned, output_field=IntegerField()), Value(0)),
+        active_applicant_count=Coalesce(
+            Subquery(active_applicants, output_field=IntegerField()), Value(0)
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital', '0003_staffweekworkdays'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='active_applicant_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='assigned_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
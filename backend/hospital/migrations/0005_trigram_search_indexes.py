@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:25
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Trigram indexes are built concurrently so large tables stay writable.
+    atomic = False
+
+    dependencies = [
+        ('hospital', '0004_jobposting_counters'),
+        ('staff', '0002_trigram_search_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='department',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='departments_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='hospital',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='hospitals_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of the backfill so later model changes cannot alter this migration.
+REBUILD_HOSPITAL_STAFF_LINKS_SQL = """
+INSERT INTO hospital_staff_link
+    (hospital_id, staff_id, first_seen, last_seen, is_affiliated, has_applied, has_assignment)
+SELECT src.hospital_id, src.staff_id, MIN(src.created_at), MAX(src.updated_at),
+       BOOL_OR(src.affiliated), BOOL_OR(src.applied), BOOL_OR(src.assigned)
+FROM (
+    SELECT hospital_id, staff_id, created_at, updated_at,
+           status = 'APPROVED' AS affiliated, false AS applied, false AS assigned
+    FROM staff_hospital_affiliations
+    UNION ALL
+    SELECT job.hospital_id, app.staff_id, app.created_at, app.updated_at, false, true, false
+    FROM job_applications app JOIN job_postings job ON job.id = app.job_id
+    UNION ALL
+    SELECT job.hospital_id, asg.staff_id, asg.created_at, asg.updated_at, false, false, true
+    FROM shift_assignments asg JOIN job_postings job ON job.id = asg.job_id
+) src
+{where}
+GROUP BY src.hospital_id, src.staff_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital', '0005_trigram_search_indexes'),
+        ('staff', '0002_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HospitalStaffLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_seen', models.DateTimeField()),
+                ('last_seen', models.DateTimeField()),
+                ('is_affiliated', models.BooleanField(default=False)),
+                ('has_applied', models.BooleanField(default=False)),
+                ('has_assignment', models.BooleanField(default=False)),
+                ('hospital', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='staff_links', to='hospital.hospital')),
+                ('staff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hospital_links', to='staff.staffprofile')),
+            ],
+            options={
+                'db_table': 'hospital_staff_link',
+                'constraints': [models.UniqueConstraint(fields=('hospital', 'staff'), name='unique_hospital_staff_link')],
+            },
+        ),
+        migrations.RunSQL(
+            REBUILD_HOSPITAL_STAFF_LINKS_SQL.format(where=""),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
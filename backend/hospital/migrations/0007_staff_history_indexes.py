@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built concurrently: these tables hold the full application/assignment history.
+    atomic = False
+
+    dependencies = [
+        ('hospital', '0006_hospitalstafflink'),
+        ('staff', '0004_referencedataversion'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='jobapplication',
+            index=models.Index(fields=['staff', '-updated_at', '-id'], name='job_app_staff_recent_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='shiftassignment',
+            index=models.Index(fields=['staff', 'shift_start_snapshot'], name='shift_assign_staff_start_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='shiftassignment',
+            index=models.Index(fields=['staff', 'status', '-assigned_at', '-id'], name='shift_assign_staff_sched_idx'),
+        ),
+    ]
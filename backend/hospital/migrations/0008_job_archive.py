@@ -0,0 +1,108 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:42
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # job_postings is live; its new index is built concurrently.
+    atomic = False
+
+    dependencies = [
+        ('hospital', '0007_staff_history_indexes'),
+        ('staff', '0004_referencedataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJobPosting',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('department_name', models.CharField(max_length=120)),
+                ('profession_name', models.CharField(max_length=120)),
+                ('required_staff_count', models.PositiveIntegerField()),
+                ('shift_start', models.DateTimeField()),
+                ('shift_end', models.DateTimeField()),
+                ('shift_type', models.CharField(max_length=16)),
+                ('description', models.TextField(blank=True)),
+                ('status', models.CharField(max_length=16)),
+                ('hourly_rate', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('currency', models.CharField(max_length=3)),
+                ('created_at', models.DateTimeField()),
+                ('closed_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('required_skills', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('applications', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+            ],
+            options={
+                'db_table': 'archived_job_postings',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedShiftAssignment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('status', models.CharField(max_length=16)),
+                ('assigned_at', models.DateTimeField()),
+                ('shift_start_snapshot', models.DateTimeField()),
+                ('shift_end_snapshot', models.DateTimeField()),
+                ('attendance', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+            ],
+            options={
+                'db_table': 'archived_shift_assignments',
+            },
+        ),
+        migrations.CreateModel(
+            name='StaffHospitalHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('assignment_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'staff_hospital_history',
+            },
+        ),
+        AddIndexConcurrently(
+            model_name='jobposting',
+            index=models.Index(fields=['shift_end', 'id'], name='job_postings_shift_end_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedjobposting',
+            name='hospital',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_job_postings', to='hospital.hospital'),
+        ),
+        migrations.AddField(
+            model_name='archivedshiftassignment',
+            name='job',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='hospital.archivedjobposting'),
+        ),
+        migrations.AddField(
+            model_name='archivedshiftassignment',
+            name='staff',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_shift_assignments', to='staff.staffprofile'),
+        ),
+        migrations.AddField(
+            model_name='staffhospitalhistory',
+            name='hospital',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_staff_history', to='hospital.hospital'),
+        ),
+        migrations.AddField(
+            model_name='staffhospitalhistory',
+            name='staff',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_history', to='staff.staffprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedjobposting',
+            index=models.Index(fields=['hospital', '-shift_start', '-id'], name='archived_jobs_hospital_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedshiftassignment',
+            index=models.Index(fields=['staff', '-shift_start_snapshot', '-id'], name='archived_assign_staff_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='staffhospitalhistory',
+            constraint=models.UniqueConstraint(fields=('staff', 'hospital'), name='unique_staff_hospital_history'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:45
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('hospital', '0008_job_archive'),
+        ('staff', '0004_referencedataversion'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'profession', 'shift_start', 'department'], name='job_postings_candidates_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:46
+
+from decimal import Decimal
+from django.db import migrations, models
+
+# Frozen copy of the aggregates as of this migration; later changes to the
+# formula belong in recompute_hospital_ratings, not here.
+BACKFILL_RATINGS_SQL = """
+UPDATE hospitals h
+SET review_count = agg.review_count,
+    rating_total = agg.rating_total,
+    rating_avg = agg.rating_total / agg.review_count,
+    rating_score = (agg.rating_total + 3.5 * 5) / (agg.review_count + 5)
+FROM (
+    SELECT hospital_id, COUNT(*) AS review_count, SUM(rating) AS rating_total
+    FROM hospital_reviews
+    GROUP BY hospital_id
+) agg
+WHERE agg.hospital_id = h.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital', '0009_job_posting_candidates_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hospital',
+            name='rating_avg',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=3),
+        ),
+        migrations.AddField(
+            model_name='hospital',
+            name='rating_score',
+            field=models.DecimalField(decimal_places=2, default=Decimal('3.50'), editable=False, max_digits=3),
+        ),
+        migrations.AddField(
+            model_name='hospital',
+            name='rating_total',
+            field=models.DecimalField(decimal_places=1, default=0, editable=False, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='hospital',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_RATINGS_SQL, migrations.RunSQL.noop),
+    ]
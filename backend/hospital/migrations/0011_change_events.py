@@ -0,0 +1,32 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:27
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital', '0010_hospital_rating_aggregates'),
+        ('staff', '0006_staff_matching_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('APPLICATION_STATUS', 'Application status'), ('ASSIGNMENT_CREATED', 'Assignment created'), ('ASSIGNMENT_CANCELLED', 'Assignment cancelled'), ('JOB_CLOSED', 'Job closed')], max_length=32)),
+                ('job_id', models.BigIntegerField()),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('hospital', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='change_events', to='hospital.hospital')),
+                ('staff', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='change_events', to='staff.staffprofile')),
+            ],
+            options={
+                'db_table': 'change_events',
+                'indexes': [models.Index(fields=['hospital', 'id'], name='change_events_hospital_idx'), models.Index(fields=['staff', 'id'], name='change_events_staff_idx')],
+            },
+        ),
+    ]
@@ -1,10 +1,26 @@
-from datetime import timedelta
+from datetime import datetime, time, timedelta
+from decimal import Decimal
 
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models.functions import Coalesce, Greatest, NullIf
 from django.utils import timezone as dj_timezone
 
+from config.cache_versions import bump_version
+from config.event_stream import broadcast
+from staff.models import StaffProfile
+
+DEFAULT_DEPARTMENTS = [
+    "ICU",
+    "Emergency",
+    "Radiology",
+    "Pediatrics",
+    "Surgery",
+]
+
 
 class TimeStampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -27,13 +43,86 @@ class Hospital(TimeStampedModel):
     city = models.CharField(max_length=128, blank=True)
     state = models.CharField(max_length=128, blank=True)
     country = models.CharField(max_length=128, blank=True)
+    # Denormalized review aggregates, maintained by HospitalReview saves;
+    # ``manage.py recompute_hospital_ratings`` repairs drift (e.g. cascade deletes).
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_total = models.DecimalField(max_digits=10, decimal_places=1, default=0, editable=False)
+    rating_avg = models.DecimalField(max_digits=3, decimal_places=2, default=0, editable=False)
+    rating_score = models.DecimalField(
+        max_digits=3, decimal_places=2, default=Decimal("3.50"), editable=False
+    )
+
+    RATING_FIELDS = ("review_count", "rating_total", "rating_avg", "rating_score")
+    # rating_score is a Bayesian average: RATING_PRIOR_WEIGHT virtual reviews of
+    # RATING_PRIOR, so a hospital with one 5-star review does not outrank one
+    # with hundreds of 4.8s.
+    RATING_PRIOR = Decimal("3.5")
+    RATING_PRIOR_WEIGHT = 5
 
     class Meta:
         db_table = "hospitals"
+        indexes = [
+            GinIndex(fields=["name"], name="hospitals_name_trgm", opclasses=["gin_trgm_ops"]),
+        ]
 
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def options_cache_version(hospital_id):
+        """Cache version of the hospital's name and departments in meta options."""
+        return f"hospital:{hospital_id}:options"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # Rating aggregates are only written through F() updates.
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        bump_version(self.options_cache_version(self.pk))
+
+    def delete(self, *args, **kwargs):
+        hospital_id = self.pk
+        result = super().delete(*args, **kwargs)
+        bump_version(self.options_cache_version(hospital_id))
+        return result
+
+    @classmethod
+    def rating_expressions(cls, rating_total, review_count):
+        """``rating_avg``/``rating_score`` update expressions for the given total and count."""
+        decimal = models.DecimalField(max_digits=3, decimal_places=2)
+        return {
+            "rating_avg": Coalesce(
+                models.ExpressionWrapper(rating_total / NullIf(review_count, 0), output_field=decimal),
+                models.Value(Decimal("0")),
+                output_field=decimal,
+            ),
+            "rating_score": models.ExpressionWrapper(
+                (rating_total + cls.RATING_PRIOR * cls.RATING_PRIOR_WEIGHT)
+                / (review_count + cls.RATING_PRIOR_WEIGHT),
+                output_field=decimal,
+            ),
+        }
+
+    @classmethod
+    def adjust_rating(cls, hospital_id, reviews=0, rating=Decimal("0")):
+        """Adds ``reviews`` reviews totalling ``rating`` stars (both may be negative)."""
+        if not reviews and not rating:
+            return
+        rating_total = models.F("rating_total") + models.Value(
+            Decimal(rating), output_field=models.DecimalField()
+        )
+        review_count = models.F("review_count") + reviews
+        # The right-hand sides all read the row as it was before this UPDATE.
+        cls.objects.filter(pk=hospital_id).update(
+            rating_total=rating_total,
+            review_count=review_count,
+            **cls.rating_expressions(rating_total, review_count),
+        )
+
 
 class Department(TimeStampedModel):
     hospital = models.ForeignKey(
@@ -45,6 +134,9 @@ class Department(TimeStampedModel):
 
     class Meta:
         db_table = "departments"
+        indexes = [
+            GinIndex(fields=["name"], name="departments_name_trgm", opclasses=["gin_trgm_ops"]),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["hospital", "name"],
@@ -55,6 +147,35 @@ class Department(TimeStampedModel):
     def __str__(self):
         return f"{self.hospital.name} - {self.name}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        bump_version(Hospital.options_cache_version(self.hospital_id))
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_version(Hospital.options_cache_version(self.hospital_id))
+        return result
+
+    @classmethod
+    def provision_defaults(cls, hospital):
+        """Creates the hospital's missing default departments; returns how many were created."""
+        existing = {
+            name.lower() for name in cls.objects.filter(hospital=hospital).values_list("name", flat=True)
+        }
+        missing = [
+            cls(hospital=hospital, name=name)
+            for name in DEFAULT_DEPARTMENTS
+            if name.lower() not in existing
+        ]
+        if missing:
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+            bump_version(Hospital.options_cache_version(hospital.pk))
+            # bulk_create skips post_save, so refresh the reference-data cache here.
+            from staff.services.reference_data import reference_data_changed
+
+            reference_data_changed(sender=cls)
+        return len(missing)
+
 
 class StaffHospitalAffiliation(TimeStampedModel):
     class Status(models.TextChoices):
@@ -83,10 +204,141 @@ class StaffHospitalAffiliation(TimeStampedModel):
             ),
         ]
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().save(*args, **kwargs)
+            HospitalStaffLink.touch(
+                self.hospital_id,
+                self.staff_id,
+                affiliated=self.status == StaffHospitalAffiliation.Status.APPROVED,
+            )
+        return result
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            HospitalStaffLink.objects.filter(hospital_id=self.hospital_id, staff_id=self.staff_id).update(
+                is_affiliated=False
+            )
+        return result
+
     def __str__(self):
         return f"{self.staff_id} @ {self.hospital_id} ({self.status})"
 
 
+REBUILD_HOSPITAL_STAFF_LINKS_SQL = """
+INSERT INTO hospital_staff_link
+    (hospital_id, staff_id, first_seen, last_seen, is_affiliated, has_applied, has_assignment)
+SELECT src.hospital_id, src.staff_id, MIN(src.created_at), MAX(src.updated_at),
+       BOOL_OR(src.affiliated), BOOL_OR(src.applied), BOOL_OR(src.assigned)
+FROM (
+    SELECT hospital_id, staff_id, created_at, updated_at,
+           status = 'APPROVED' AS affiliated, false AS applied, false AS assigned
+    FROM staff_hospital_affiliations
+    UNION ALL
+    SELECT job.hospital_id, app.staff_id, app.created_at, app.updated_at, false, true, false
+    FROM job_applications app JOIN job_postings job ON job.id = app.job_id
+    UNION ALL
+    SELECT job.hospital_id, asg.staff_id, asg.created_at, asg.updated_at, false, false, true
+    FROM shift_assignments asg JOIN job_postings job ON job.id = asg.job_id
+    UNION ALL
+    SELECT job.hospital_id, asg.staff_id, asg.assigned_at, asg.shift_end_snapshot, false, false, true
+    FROM archived_shift_assignments asg JOIN archived_job_postings job ON job.id = asg.job_id
+    UNION ALL
+    SELECT job.hospital_id, staff.id, (app->>'applied_at')::timestamptz, job.archived_at, false, true, false
+    FROM archived_job_postings job
+    CROSS JOIN LATERAL jsonb_array_elements(job.applications) app
+    JOIN staff_profiles staff ON staff.id = (app->>'staff_id')::bigint
+) src
+{where}
+GROUP BY src.hospital_id, src.staff_id
+"""
+
+
+class HospitalStaffLink(models.Model):
+    """
+    One row per (hospital, staff) pair that has any relationship, so directory and
+    roster lookups are a single indexed join instead of an OR across affiliations,
+    applications and assignments.
+
+    Maintained by the save() of StaffHospitalAffiliation, JobApplication and
+    ShiftAssignment; ``manage.py rebuild_hospital_staff_links`` recomputes it.
+    """
+
+    hospital = models.ForeignKey(Hospital, on_delete=models.CASCADE, related_name="staff_links")
+    staff = models.ForeignKey(
+        "staff.StaffProfile",
+        on_delete=models.CASCADE,
+        related_name="hospital_links",
+    )
+    first_seen = models.DateTimeField()
+    last_seen = models.DateTimeField()
+    is_affiliated = models.BooleanField(default=False)
+    has_applied = models.BooleanField(default=False)
+    has_assignment = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = "hospital_staff_link"
+        constraints = [
+            models.UniqueConstraint(fields=["hospital", "staff"], name="unique_hospital_staff_link"),
+        ]
+
+    @classmethod
+    def touch(cls, hospital_id, staff_id, affiliated=None, applied=False, assigned=False):
+        """
+        Upserts the link and records a relationship. ``applied``/``assigned`` only ever
+        switch a flag on; ``affiliated`` overwrites the flag unless it is None.
+        """
+        now = dj_timezone.now()
+        table = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} AS link "
+                "(hospital_id, staff_id, first_seen, last_seen, is_affiliated, has_applied, has_assignment) "
+                "VALUES (%s, %s, %s, %s, COALESCE(%s, false), %s, %s) "
+                "ON CONFLICT (hospital_id, staff_id) DO UPDATE SET "
+                "last_seen = GREATEST(link.last_seen, EXCLUDED.last_seen), "
+                "is_affiliated = COALESCE(%s, link.is_affiliated), "
+                "has_applied = link.has_applied OR EXCLUDED.has_applied, "
+                "has_assignment = link.has_assignment OR EXCLUDED.has_assignment",
+                [hospital_id, staff_id, now, now, affiliated, applied, assigned, affiliated],
+            )
+
+    @classmethod
+    def bulk_touch(cls, hospital_id, staff_ids, applied=False, assigned=False):
+        """``touch()`` for many staff at one hospital in a single statement."""
+        now = dj_timezone.now()
+        table = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} AS link "
+                "(hospital_id, staff_id, first_seen, last_seen, is_affiliated, has_applied, has_assignment) "
+                "SELECT %s, staff_id, %s, %s, false, %s, %s FROM unnest(%s::bigint[]) AS staff_id "
+                "ON CONFLICT (hospital_id, staff_id) DO UPDATE SET "
+                "last_seen = GREATEST(link.last_seen, EXCLUDED.last_seen), "
+                "has_applied = link.has_applied OR EXCLUDED.has_applied, "
+                "has_assignment = link.has_assignment OR EXCLUDED.has_assignment",
+                [hospital_id, now, now, applied, assigned, list(staff_ids)],
+            )
+
+    @classmethod
+    def rebuild(cls, hospital_id=None):
+        """Recomputes links from affiliations, applications and assignments; returns the row count."""
+        hospital_filter = "WHERE src.hospital_id = %s" if hospital_id else ""
+        params = [hospital_id] if hospital_id else []
+        with transaction.atomic():
+            links = cls.objects.all()
+            if hospital_id:
+                links = links.filter(hospital_id=hospital_id)
+            links.delete()
+            with connection.cursor() as cursor:
+                cursor.execute(REBUILD_HOSPITAL_STAFF_LINKS_SQL.format(where=hospital_filter), params)
+                return cursor.rowcount
+
+    def __str__(self):
+        return f"link hospital={self.hospital_id} staff={self.staff_id}"
+
+
 class JobPosting(TimeStampedModel):
     class Status(models.TextChoices):
         OPEN = "OPEN", "Open"
@@ -123,9 +375,24 @@ class JobPosting(TimeStampedModel):
     city = models.CharField(max_length=128, blank=True)
     state = models.CharField(max_length=128, blank=True)
     country = models.CharField(max_length=128, blank=True)
+    # Denormalized fill state, maintained by ShiftAssignment/JobApplication saves.
+    assigned_count = models.PositiveIntegerField(default=0, editable=False)
+    active_applicant_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ("assigned_count", "active_applicant_count")
 
     class Meta:
         db_table = "job_postings"
+        indexes = [
+            # Archival picks the longest-ended postings first.
+            models.Index(fields=["shift_end", "id"], name="job_postings_shift_end_idx"),
+            # Candidate generation for staff recommendations: upcoming open jobs
+            # of one profession, soonest first, optionally narrowed by department.
+            models.Index(
+                fields=["status", "profession", "shift_start", "department"],
+                name="job_postings_candidates_idx",
+            ),
+        ]
         constraints = [
             models.CheckConstraint(
                 condition=models.Q(shift_start__lt=models.F("shift_end")),
@@ -143,7 +410,34 @@ class JobPosting(TimeStampedModel):
 
     def save(self, *args, **kwargs):
         self.full_clean()
-        return super().save(*args, **kwargs)
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # Counters are only written through F() updates; a full save of a stale
+            # instance must not overwrite them.
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        with transaction.atomic():
+            previous_status = None
+            if not self._state.adding and self.pk:
+                previous_status = JobPosting.objects.filter(pk=self.pk).values_list("status", flat=True).first()
+            result = super().save(*args, **kwargs)
+            if previous_status == JobPosting.Status.OPEN and self.status != JobPosting.Status.OPEN:
+                ChangeEvent.record(ChangeEvent.Kind.JOB_CLOSED, self, status=self.status)
+        return result
+
+    @classmethod
+    def adjust_counters(cls, job_id, assigned=0, active_applicants=0):
+        changes = {}
+        if assigned:
+            changes["assigned_count"] = Greatest(models.F("assigned_count") + assigned, 0)
+        if active_applicants:
+            changes["active_applicant_count"] = Greatest(
+                models.F("active_applicant_count") + active_applicants, 0
+            )
+        if changes:
+            cls.objects.filter(pk=job_id).update(**changes)
 
     def __str__(self):
         return f"{self.hospital.name} - {self.profession.name} ({self.shift_start})"
@@ -183,6 +477,9 @@ class JobApplication(TimeStampedModel):
         REJECTED = "REJECTED", "Rejected"
         WITHDRAWN = "WITHDRAWN", "Withdrawn"
 
+    # Statuses counted as live applicants on the job posting.
+    ACTIVE_STATUSES = (Status.APPLIED, Status.SHORTLISTED)
+
     job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name="applications")
     staff = models.ForeignKey(
         "staff.StaffProfile",
@@ -196,10 +493,46 @@ class JobApplication(TimeStampedModel):
 
     class Meta:
         db_table = "job_applications"
+        indexes = [
+            # Recent activity and pending pages: one staff's rows by last update.
+            models.Index(fields=["staff", "-updated_at", "-id"], name="job_app_staff_recent_idx"),
+        ]
         constraints = [
             models.UniqueConstraint(fields=["job", "staff"], name="unique_job_staff_application"),
         ]
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous_status = None
+            if not self._state.adding and self.pk:
+                previous_status = (
+                    JobApplication.objects.filter(pk=self.pk).values_list("status", flat=True).first()
+                )
+            result = super().save(*args, **kwargs)
+            delta = int(self.status in self.ACTIVE_STATUSES) - int(
+                previous_status in self.ACTIVE_STATUSES
+            )
+            JobPosting.adjust_counters(self.job_id, active_applicants=delta)
+            HospitalStaffLink.touch(self.job.hospital_id, self.staff_id, applied=True)
+            bump_version(StaffProfile.activity_cache_version(self.staff_id))
+            if self.status != previous_status:
+                ChangeEvent.record(
+                    ChangeEvent.Kind.APPLICATION_STATUS,
+                    self.job,
+                    staff_id=self.staff_id,
+                    application_id=self.pk,
+                    status=self.status,
+                )
+        return result
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            if self.status in self.ACTIVE_STATUSES:
+                JobPosting.adjust_counters(self.job_id, active_applicants=-1)
+            bump_version(StaffProfile.activity_cache_version(self.staff_id))
+        return result
+
     def __str__(self):
         return f"job={self.job_id} staff={self.staff_id} ({self.status})"
 
@@ -210,6 +543,9 @@ class ShiftAssignment(TimeStampedModel):
         CANCELLED = "CANCELLED", "Cancelled"
         COMPLETED = "COMPLETED", "Completed"
 
+    # Statuses that occupy a calendar day for the weekly working-days rule.
+    WORKDAY_STATUSES = (Status.ASSIGNED, Status.COMPLETED)
+
     job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name="assignments")
     staff = models.ForeignKey(
         "staff.StaffProfile",
@@ -230,6 +566,15 @@ class ShiftAssignment(TimeStampedModel):
 
     class Meta:
         db_table = "shift_assignments"
+        indexes = [
+            # Per-staff date windows: dashboard week, ledger releases, overlap checks.
+            models.Index(fields=["staff", "shift_start_snapshot"], name="shift_assign_staff_start_idx"),
+            # Schedule pages: one staff's ASSIGNED rows newest first.
+            models.Index(
+                fields=["staff", "status", "-assigned_at", "-id"],
+                name="shift_assign_staff_sched_idx",
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(fields=["job", "staff"], name="unique_job_staff_assignment"),
             models.CheckConstraint(
@@ -254,21 +599,34 @@ class ShiftAssignment(TimeStampedModel):
         # ISO week of the target assignment. This keeps scheduling compliant while
         # still allowing multiple non-overlapping shifts on the same day.
         target_day = dj_timezone.localdate(self.shift_start_snapshot)
-        week_start = target_day - timedelta(days=target_day.weekday())
-        week_end = week_start + timedelta(days=7)
+        day_mask = StaffWeekWorkdays.current_mask(
+            self.staff_id,
+            target_day,
+            lock=transaction.get_connection().in_atomic_block,
+        )
 
-        assignments = ShiftAssignment.objects.filter(
-            staff=self.staff,
-            status__in=[ShiftAssignment.Status.ASSIGNED, ShiftAssignment.Status.COMPLETED],
-            shift_start_snapshot__date__gte=week_start,
-            shift_start_snapshot__date__lt=week_end,
-        ).exclude(pk=self.pk)
+        if (day_mask | StaffWeekWorkdays.day_bit(target_day)).bit_count() > 3:
+            raise ValidationError("Assignment violates 3-day weekly work limit for staff.")
 
-        working_days = {item.shift_start_snapshot.date() for item in assignments}
-        working_days.add(target_day)
+    def _previous_state(self):
+        if self._state.adding or not self.pk:
+            return None
+        return (
+            ShiftAssignment.objects.filter(pk=self.pk)
+            .values("status", "shift_start_snapshot")
+            .first()
+        )
 
-        if len(working_days) > 3:
-            raise ValidationError("Assignment violates 3-day weekly work limit for staff.")
+    def _sync_week_workdays(self, previous):
+        counts_now = self.status in self.WORKDAY_STATUSES
+        target_day = dj_timezone.localdate(self.shift_start_snapshot)
+        if counts_now:
+            StaffWeekWorkdays.mark_day(self.staff_id, target_day)
+
+        if previous and previous["status"] in self.WORKDAY_STATUSES:
+            previous_day = dj_timezone.localdate(previous["shift_start_snapshot"])
+            if not counts_now or previous_day != target_day:
+                StaffWeekWorkdays.release_day(self.staff_id, previous_day)
 
     def clean(self):
         if not self.shift_start_snapshot:
@@ -281,13 +639,167 @@ class ShiftAssignment(TimeStampedModel):
             self._validate_three_day_limit()
 
     def save(self, *args, **kwargs):
-        self.full_clean()
-        return super().save(*args, **kwargs)
+        # Snapshots default from the job before field validation rejects them as null.
+        if not self.shift_start_snapshot and self.job_id:
+            self.shift_start_snapshot = self.job.shift_start
+        if not self.shift_end_snapshot and self.job_id:
+            self.shift_end_snapshot = self.job.shift_end
+
+        # The week ledger check, the row write and the ledger update share one
+        # transaction so concurrent assignments for the same staff/week serialize
+        # on the ledger row lock.
+        with transaction.atomic():
+            previous = self._previous_state()
+            self.full_clean()
+            result = super().save(*args, **kwargs)
+            self._sync_week_workdays(previous)
+            was_assigned = bool(previous) and previous["status"] == ShiftAssignment.Status.ASSIGNED
+            delta = int(self.status == ShiftAssignment.Status.ASSIGNED) - int(was_assigned)
+            JobPosting.adjust_counters(self.job_id, assigned=delta)
+            HospitalStaffLink.touch(self.job.hospital_id, self.staff_id, assigned=True)
+            bump_version(StaffProfile.activity_cache_version(self.staff_id))
+            if delta > 0:
+                self._record_event(ChangeEvent.Kind.ASSIGNMENT_CREATED)
+            elif delta < 0 and self.status == ShiftAssignment.Status.CANCELLED:
+                self._record_event(ChangeEvent.Kind.ASSIGNMENT_CANCELLED)
+        return result
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            counted = self.status in self.WORKDAY_STATUSES
+            # Django clears self.pk on delete; the event still names the row.
+            pk = self.pk
+            result = super().delete(*args, **kwargs)
+            if counted:
+                StaffWeekWorkdays.release_day(
+                    self.staff_id,
+                    dj_timezone.localdate(self.shift_start_snapshot),
+                )
+            if self.status == ShiftAssignment.Status.ASSIGNED:
+                JobPosting.adjust_counters(self.job_id, assigned=-1)
+                self._record_event(ChangeEvent.Kind.ASSIGNMENT_CANCELLED, assignment_id=pk)
+            bump_version(StaffProfile.activity_cache_version(self.staff_id))
+        return result
+
+    def _record_event(self, kind, assignment_id=None):
+        ChangeEvent.record(
+            kind,
+            self.job,
+            staff_id=self.staff_id,
+            assignment_id=assignment_id or self.pk,
+            status=self.status,
+        )
 
     def __str__(self):
         return f"assignment job={self.job_id} staff={self.staff_id} ({self.status})"
 
 
+class StaffWeekWorkdays(models.Model):
+    """
+    Per-week ledger of the calendar days a staff member works.
+
+    ``day_mask`` holds one bit per ISO weekday (bit 0 = Monday) for every day with an
+    ASSIGNED or COMPLETED assignment, so the 3-day rule is a row lock plus a popcount.
+    ShiftAssignment.save()/delete() keep it current; bulk updates that bypass the model
+    must be followed by ``manage.py backfill_staff_week_workdays``.
+    """
+
+    staff = models.ForeignKey(
+        "staff.StaffProfile",
+        on_delete=models.CASCADE,
+        related_name="week_workdays",
+    )
+    iso_year = models.PositiveSmallIntegerField()
+    iso_week = models.PositiveSmallIntegerField()
+    day_mask = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        db_table = "staff_week_workdays"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["staff", "iso_year", "iso_week"],
+                name="unique_staff_iso_week",
+            ),
+        ]
+
+    @staticmethod
+    def week_key(day):
+        iso_year, iso_week, _ = day.isocalendar()
+        return iso_year, iso_week
+
+    @staticmethod
+    def day_bit(day):
+        return 1 << day.weekday()
+
+    @classmethod
+    def current_mask(cls, staff_id, day, lock=False):
+        iso_year, iso_week = cls.week_key(day)
+        rows = cls.objects.filter(staff_id=staff_id, iso_year=iso_year, iso_week=iso_week)
+        if lock:
+            # FOR UPDATE locks nothing while the week has no row yet, so create an
+            # empty one first; concurrent checks then queue on the same row.
+            table = connection.ops.quote_name(cls._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} (staff_id, iso_year, iso_week, day_mask) "
+                    "VALUES (%s, %s, %s, 0) "
+                    "ON CONFLICT (staff_id, iso_year, iso_week) DO NOTHING",
+                    [staff_id, iso_year, iso_week],
+                )
+            rows = rows.select_for_update()
+        return rows.values_list("day_mask", flat=True).first() or 0
+
+    @classmethod
+    def mark_day(cls, staff_id, day):
+        iso_year, iso_week = cls.week_key(day)
+        table = connection.ops.quote_name(cls._meta.db_table)
+        # Upsert so the first assignment of a week cannot race another insert.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} AS ledger (staff_id, iso_year, iso_week, day_mask) "
+                "VALUES (%s, %s, %s, %s) "
+                "ON CONFLICT (staff_id, iso_year, iso_week) "
+                "DO UPDATE SET day_mask = ledger.day_mask | EXCLUDED.day_mask",
+                [staff_id, iso_year, iso_week, cls.day_bit(day)],
+            )
+
+    @classmethod
+    def bulk_mark_day(cls, staff_ids, day):
+        """``mark_day()`` for many staff in a single upsert."""
+        iso_year, iso_week = cls.week_key(day)
+        table = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} AS ledger (staff_id, iso_year, iso_week, day_mask) "
+                "SELECT staff_id, %s, %s, %s FROM unnest(%s::bigint[]) AS staff_id "
+                "ON CONFLICT (staff_id, iso_year, iso_week) "
+                "DO UPDATE SET day_mask = ledger.day_mask | EXCLUDED.day_mask",
+                [iso_year, iso_week, cls.day_bit(day), list(staff_ids)],
+            )
+
+    @classmethod
+    def release_day(cls, staff_id, day):
+        # A plain range on the column (not __date) so the (staff, start) index applies.
+        day_start = dj_timezone.make_aware(datetime.combine(day, time.min))
+        day_end = dj_timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+        still_working = ShiftAssignment.objects.filter(
+            staff_id=staff_id,
+            status__in=ShiftAssignment.WORKDAY_STATUSES,
+            shift_start_snapshot__gte=day_start,
+            shift_start_snapshot__lt=day_end,
+        ).exists()
+        if still_working:
+            return
+
+        iso_year, iso_week = cls.week_key(day)
+        cls.objects.filter(staff_id=staff_id, iso_year=iso_year, iso_week=iso_week).update(
+            day_mask=models.F("day_mask").bitand(0b1111111 ^ cls.day_bit(day))
+        )
+
+    def __str__(self):
+        return f"workdays staff={self.staff_id} {self.iso_year}-W{self.iso_week:02d} ({self.day_mask:07b})"
+
+
 class Attendance(TimeStampedModel):
     class Status(models.TextChoices):
         PRESENT = "PRESENT", "Present"
@@ -347,3 +859,311 @@ class HospitalReview(TimeStampedModel):
 
     def __str__(self):
         return f"review staff={self.staff_id} hospital={self.hospital_id}"
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding and self.pk:
+                previous = (
+                    HospitalReview.objects.filter(pk=self.pk).values_list("hospital_id", "rating").first()
+                )
+            result = super().save(*args, **kwargs)
+            if previous:
+                Hospital.adjust_rating(previous[0], reviews=-1, rating=-previous[1])
+            Hospital.adjust_rating(self.hospital_id, reviews=1, rating=Decimal(self.rating))
+        return result
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            Hospital.adjust_rating(self.hospital_id, reviews=-1, rating=-Decimal(self.rating))
+        return result
+
+
+class ChangeEvent(models.Model):
+    """
+    Outbox of shift status changes, streamed to hospital and staff clients as
+    Server-Sent Events (``config.event_stream``). Rows are written in the
+    transaction that made the change; ``job_id`` is kept without a foreign key
+    so events outlive archived postings.
+    """
+
+    class Kind(models.TextChoices):
+        APPLICATION_STATUS = "APPLICATION_STATUS", "Application status"
+        ASSIGNMENT_CREATED = "ASSIGNMENT_CREATED", "Assignment created"
+        ASSIGNMENT_CANCELLED = "ASSIGNMENT_CANCELLED", "Assignment cancelled"
+        JOB_CLOSED = "JOB_CLOSED", "Job closed"
+
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    hospital = models.ForeignKey(Hospital, on_delete=models.CASCADE, related_name="change_events")
+    staff = models.ForeignKey(
+        "staff.StaffProfile",
+        on_delete=models.CASCADE,
+        related_name="change_events",
+        null=True,
+        blank=True,
+    )
+    job_id = models.BigIntegerField()
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "change_events"
+        indexes = [
+            # Streams read one hospital's or one staff member's events after an id.
+            models.Index(fields=["hospital", "id"], name="change_events_hospital_idx"),
+            models.Index(fields=["staff", "id"], name="change_events_staff_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} job={self.job_id}"
+
+    @classmethod
+    def record(cls, kind, job, staff_id=None, **payload):
+        event = cls.objects.create(
+            kind=kind,
+            hospital_id=job.hospital_id,
+            staff_id=staff_id,
+            job_id=job.pk,
+            payload=payload,
+        )
+        transaction.on_commit(broadcast.publish)
+        return event
+
+    @classmethod
+    def bulk_record(cls, kind, job, events):
+        """Records one event per ``(staff_id, payload)`` in ``events`` with a single insert."""
+        created = cls.objects.bulk_create(
+            cls(kind=kind, hospital_id=job.hospital_id, staff_id=staff_id, job_id=job.pk, payload=payload)
+            for staff_id, payload in events
+        )
+        transaction.on_commit(broadcast.publish)
+        return created
+
+    def as_event(self):
+        """The SSE event name and compact data clients use to decide what to refetch."""
+        return self.kind.lower(), {
+            "kind": self.kind,
+            "job_id": self.job_id,
+            "staff_id": self.staff_id,
+            **self.payload,
+            "created_at": self.created_at,
+        }
+
+
+class ArchivedJobPosting(models.Model):
+    """
+    A job posting moved out of the hot tables by ``manage.py archive_jobs``.
+
+    Keeps the original id. Required skills and applications are kept as JSON
+    snapshots and assignments (with attendance) as ``ArchivedShiftAssignment`` rows.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    hospital = models.ForeignKey(
+        Hospital,
+        on_delete=models.CASCADE,
+        related_name="archived_job_postings",
+    )
+    department_name = models.CharField(max_length=120)
+    profession_name = models.CharField(max_length=120)
+    required_staff_count = models.PositiveIntegerField()
+    shift_start = models.DateTimeField()
+    shift_end = models.DateTimeField()
+    shift_type = models.CharField(max_length=16)
+    description = models.TextField(blank=True)
+    status = models.CharField(max_length=16)
+    hourly_rate = models.DecimalField(max_digits=8, decimal_places=2)
+    currency = models.CharField(max_length=3)
+    created_at = models.DateTimeField()
+    closed_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    required_skills = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    applications = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+
+    class Meta:
+        db_table = "archived_job_postings"
+        indexes = [
+            models.Index(fields=["hospital", "-shift_start", "-id"], name="archived_jobs_hospital_idx"),
+        ]
+
+    def __str__(self):
+        return f"archived job={self.id} {self.profession_name} - {self.department_name}"
+
+    @classmethod
+    def archive(cls, job_ids):
+        """
+        Moves the given postings and everything hanging off them into the archive
+        and folds their assignments into ``StaffHospitalHistory``. Must run inside
+        a transaction; returns the number of postings archived.
+        """
+        jobs = list(
+            JobPosting.objects.filter(id__in=job_ids).select_related("department", "profession")
+        )
+        if not jobs:
+            return 0
+
+        skills_by_job = {}
+        for requirement in JobRequiredSkill.objects.filter(job_id__in=job_ids).select_related("skill"):
+            skills_by_job.setdefault(requirement.job_id, []).append(
+                {
+                    "skill_id": requirement.skill_id,
+                    "skill": requirement.skill.name,
+                    "minimum_proficiency": requirement.minimum_proficiency,
+                }
+            )
+        applications_by_job = {}
+        for application in JobApplication.objects.filter(job_id__in=job_ids).order_by("id"):
+            applications_by_job.setdefault(application.job_id, []).append(
+                {
+                    "id": application.id,
+                    "staff_id": application.staff_id,
+                    "status": application.status,
+                    "applied_at": application.applied_at,
+                    "decision_at": application.decision_at,
+                    "note": application.note,
+                }
+            )
+
+        hospital_by_job = {job.id: job.hospital_id for job in jobs}
+        archived_assignments = []
+        history = {}
+        for assignment in (
+            ShiftAssignment.objects.filter(job_id__in=job_ids).select_related("attendance").order_by("id")
+        ):
+            attendance = getattr(assignment, "attendance", None)
+            archived_assignments.append(
+                ArchivedShiftAssignment(
+                    id=assignment.id,
+                    job_id=assignment.job_id,
+                    staff_id=assignment.staff_id,
+                    status=assignment.status,
+                    assigned_at=assignment.assigned_at,
+                    shift_start_snapshot=assignment.shift_start_snapshot,
+                    shift_end_snapshot=assignment.shift_end_snapshot,
+                    attendance=(
+                        {
+                            "status": attendance.status,
+                            "check_in_time": attendance.check_in_time,
+                            "check_out_time": attendance.check_out_time,
+                        }
+                        if attendance
+                        else None
+                    ),
+                )
+            )
+            key = (assignment.staff_id, hospital_by_job[assignment.job_id])
+            history[key] = history.get(key, 0) + 1
+
+        cls.objects.bulk_create(
+            [
+                cls(
+                    id=job.id,
+                    hospital_id=job.hospital_id,
+                    department_name=job.department.name,
+                    profession_name=job.profession.name,
+                    required_staff_count=job.required_staff_count,
+                    shift_start=job.shift_start,
+                    shift_end=job.shift_end,
+                    shift_type=job.shift_type,
+                    description=job.description,
+                    status=job.status,
+                    hourly_rate=job.hourly_rate,
+                    currency=job.currency,
+                    created_at=job.created_at,
+                    closed_at=job.closed_at,
+                    required_skills=skills_by_job.get(job.id, []),
+                    applications=applications_by_job.get(job.id, []),
+                )
+                for job in jobs
+            ]
+        )
+        ArchivedShiftAssignment.objects.bulk_create(archived_assignments)
+        StaffHospitalHistory.add_assignments(history)
+        affected_staff = {staff_id for staff_id, _ in history}
+        affected_staff.update(
+            application["staff_id"] for applications in applications_by_job.values() for application in applications
+        )
+        for staff_id in affected_staff:
+            bump_version(StaffProfile.activity_cache_version(staff_id))
+        # Queryset delete cascades to applications, assignments, attendance and
+        # skills without the per-row save/delete hooks, which only matter for
+        # live postings (counters, weekly ledger).
+        JobPosting.objects.filter(id__in=[job.id for job in jobs]).delete()
+        return len(jobs)
+
+
+class ArchivedShiftAssignment(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    job = models.ForeignKey(
+        ArchivedJobPosting,
+        on_delete=models.CASCADE,
+        related_name="assignments",
+    )
+    staff = models.ForeignKey(
+        "staff.StaffProfile",
+        on_delete=models.CASCADE,
+        related_name="archived_shift_assignments",
+    )
+    status = models.CharField(max_length=16)
+    assigned_at = models.DateTimeField()
+    shift_start_snapshot = models.DateTimeField()
+    shift_end_snapshot = models.DateTimeField()
+    attendance = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+
+    class Meta:
+        db_table = "archived_shift_assignments"
+        indexes = [
+            models.Index(
+                fields=["staff", "-shift_start_snapshot", "-id"],
+                name="archived_assign_staff_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"archived assignment={self.id} job={self.job_id} staff={self.staff_id}"
+
+
+class StaffHospitalHistory(models.Model):
+    """
+    Number of a staff member's archived assignments at a hospital. History
+    aggregates add this to the live ``shift_assignments`` count so archiving
+    does not change recommendation scores.
+    """
+
+    staff = models.ForeignKey(
+        "staff.StaffProfile",
+        on_delete=models.CASCADE,
+        related_name="archived_history",
+    )
+    hospital = models.ForeignKey(
+        Hospital,
+        on_delete=models.CASCADE,
+        related_name="archived_staff_history",
+    )
+    assignment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "staff_hospital_history"
+        constraints = [
+            models.UniqueConstraint(fields=["staff", "hospital"], name="unique_staff_hospital_history"),
+        ]
+
+    def __str__(self):
+        return f"history staff={self.staff_id} hospital={self.hospital_id} ({self.assignment_count})"
+
+    @classmethod
+    def add_assignments(cls, counts):
+        """Adds ``{(staff_id, hospital_id): count}`` to the summary rows."""
+        if not counts:
+            return
+        table = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {table} AS history (staff_id, hospital_id, assignment_count) "
+                "VALUES (%s, %s, %s) "
+                "ON CONFLICT (staff_id, hospital_id) "
+                "DO UPDATE SET assignment_count = history.assignment_count + EXCLUDED.assignment_count",
+                [(staff_id, hospital_id, count) for (staff_id, hospital_id), count in counts.items()],
+            )
@@ -0,0 +1 @@
+"""Shared services for hospital app."""
@@ -0,0 +1,238 @@
+"""
+Greedy auto-fill of an open job posting.
+
+Candidates are staff of the job's profession, ranked best first by
+``staff_ranking``. Only a pool of ``AUTOFILL_CANDIDATE_POOL`` staff is scored.
+The pool takes staff the match index (``staff.services.matching``) finds
+qualified and available first, and tops up with the rest of the profession by
+rating. ``ShiftAssignment.clean`` runs two queries per save for the
+overlap and 3-day weekly rules. Auto-fill instead preloads every candidate's
+busy intervals, time off and week ledger mask once, and checks picks in memory.
+The chosen staff are then written with bulk inserts in one transaction, along
+with everything the per-row saves would have maintained: job counters, the
+week ledger, hospital/staff links, change events and cache versions. The job is
+queued for a feed refresh rather than rescored inline, which would cost about as
+much as the fill itself.
+
+The job row and the candidates' ledger rows stay locked until commit. Auto-fill
+therefore serializes with concurrent assignments for the same staff and week,
+like ``ShiftAssignment.save``.
+"""
+
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from config.cache_versions import bump_version
+from hospital.models import (
+    ChangeEvent,
+    HospitalStaffLink,
+    JobApplication,
+    JobPosting,
+    ShiftAssignment,
+    StaffWeekWorkdays,
+)
+from hospital.services import staff_ranking
+from staff.models import AvailabilityException, StaffProfile
+from staff.services import job_feed, matching
+
+INVITE = "invite"
+ASSIGN = "assign"
+MODES = (INVITE, ASSIGN)
+MAX_WORKDAYS_PER_WEEK = 3
+
+
+class StaffCalendar:
+    """Busy intervals, time off and week ledger masks of some staff, checked and booked in memory."""
+
+    def __init__(self):
+        self.busy = defaultdict(list)
+        self.time_off = defaultdict(list)
+        self.masks = {}
+
+    @classmethod
+    def load(cls, staff_ids, start, end):
+        """Loads what can conflict with ``[start, end)``, locking the ledger rows of its ISO week."""
+        calendar = cls()
+        assignments = ShiftAssignment.objects.filter(
+            staff_id__in=staff_ids,
+            status=ShiftAssignment.Status.ASSIGNED,
+            shift_start_snapshot__lt=end,
+            shift_end_snapshot__gt=start,
+        ).values_list("staff_id", "shift_start_snapshot", "shift_end_snapshot")
+        for staff_id, busy_start, busy_end in assignments:
+            calendar.busy[staff_id].append((busy_start, busy_end))
+
+        exceptions = AvailabilityException.objects.filter(
+            staff_id__in=staff_ids, start_at__lt=end, end_at__gt=start
+        ).values_list("staff_id", "start_at", "end_at")
+        for staff_id, off_start, off_end in exceptions:
+            calendar.time_off[staff_id].append((off_start, off_end))
+
+        iso_year, iso_week = StaffWeekWorkdays.week_key(timezone.localdate(start))
+        ledger = (
+            StaffWeekWorkdays.objects.select_for_update()
+            .filter(staff_id__in=staff_ids, iso_year=iso_year, iso_week=iso_week)
+            .values_list("staff_id", "day_mask")
+        )
+        for staff_id, day_mask in ledger:
+            calendar.masks[(staff_id, iso_year, iso_week)] = day_mask
+        return calendar
+
+    def conflict(self, staff_id, start, end):
+        """Why ``staff_id`` cannot take ``[start, end)``, or None."""
+        if any(busy_start < end and busy_end > start for busy_start, busy_end in self.busy[staff_id]):
+            return "overlap"
+        if any(off_start < end and off_end > start for off_start, off_end in self.time_off[staff_id]):
+            return "time_off"
+        day = timezone.localdate(start)
+        mask = self.masks.get((staff_id, *StaffWeekWorkdays.week_key(day)), 0)
+        if (mask | StaffWeekWorkdays.day_bit(day)).bit_count() > MAX_WORKDAYS_PER_WEEK:
+            return "weekly_limit"
+        return None
+
+    def book(self, staff_id, start, end):
+        self.busy[staff_id].append((start, end))
+        day = timezone.localdate(start)
+        key = (staff_id, *StaffWeekWorkdays.week_key(day))
+        self.masks[key] = self.masks.get(key, 0) | StaffWeekWorkdays.day_bit(day)
+
+
+def candidate_pool(job, exclude, size):
+    """Ids of up to ``size`` staff worth ranking for ``job``, index matches first."""
+    pool = list(
+        matching.eligible_staff(job)
+        .exclude(staff_id__in=exclude)
+        .order_by("-staff__rating_avg", "staff_id")
+        .values_list("staff_id", flat=True)[:size]
+    )
+    if len(pool) < size:
+        pool.extend(
+            StaffProfile.objects.filter(profession_id=job.profession_id, status=StaffProfile.Status.ACTIVE)
+            .exclude(id__in=[*exclude, *pool])
+            .order_by("-rating_avg", "id")
+            .values_list("id", flat=True)[: size - len(pool)]
+        )
+    return pool
+
+
+def autofill_job(job_id, mode=INVITE, assigned_by_user_id=None):
+    """
+    Fills the open slots of job ``job_id`` greedily from its ranked candidates.
+
+    ``invite`` shortlists the picks (the regular invitation flow) and counts
+    pending invitations against the open slots. ``assign`` accepts and assigns
+    them directly. Raises ValueError with a client-facing message.
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of: {', '.join(MODES)}")
+
+    with transaction.atomic():
+        job = JobPosting.objects.select_for_update().get(pk=job_id)
+        if job.status != JobPosting.Status.OPEN or job.shift_start <= timezone.now():
+            raise ValueError("Only open, upcoming shifts can be auto-filled")
+
+        application_statuses = dict(job.applications.values_list("staff_id", "status"))
+        taken = set(application_statuses) | set(job.assignments.values_list("staff_id", flat=True))
+        open_slots = job.required_staff_count - job.assigned_count
+        if mode == INVITE:
+            open_slots -= sum(
+                status == JobApplication.Status.SHORTLISTED for status in application_statuses.values()
+            )
+
+        selected, skipped = [], Counter()
+        if open_slots > 0:
+            size = max(getattr(settings, "AUTOFILL_CANDIDATE_POOL", 500), open_slots * 4)
+            candidates = staff_ranking.candidate_staff().filter(id__in=candidate_pool(job, taken, size))
+            ranked = staff_ranking.score_staff_for_job(job, candidates)
+            calendar = StaffCalendar.load(
+                [candidate["staff_id"] for candidate in ranked], job.shift_start, job.shift_end
+            )
+            for candidate in ranked:
+                if len(selected) == open_slots:
+                    break
+                reason = calendar.conflict(candidate["staff_id"], job.shift_start, job.shift_end)
+                if reason:
+                    skipped[reason] += 1
+                    continue
+                calendar.book(candidate["staff_id"], job.shift_start, job.shift_end)
+                selected.append(candidate)
+
+        staff_ids = [candidate["staff_id"] for candidate in selected]
+        if staff_ids:
+            if mode == ASSIGN:
+                records = _write_assignments(job, staff_ids, assigned_by_user_id)
+            else:
+                records = _write_invitations(job, staff_ids)
+            for candidate, record in zip(selected, records):
+                candidate.update(record)
+            for staff_id in staff_ids:
+                bump_version(StaffProfile.activity_cache_version(staff_id))
+
+    return {
+        "job_id": job.id,
+        "mode": mode,
+        "open_slots": max(open_slots, 0),
+        "filled": len(selected),
+        "results": [
+            {key: candidate[key] for key in ("staff_id", "name", "match", "application_id", "assignment_id")}
+            for candidate in selected
+        ],
+        "skipped": dict(skipped),
+    }
+
+
+def _write_invitations(job, staff_ids):
+    now = timezone.now()
+    applications = JobApplication.objects.bulk_create(
+        JobApplication(job=job, staff_id=staff_id, status=JobApplication.Status.SHORTLISTED, decision_at=now)
+        for staff_id in staff_ids
+    )
+    JobPosting.adjust_counters(job.id, active_applicants=len(applications))
+    HospitalStaffLink.bulk_touch(job.hospital_id, staff_ids, applied=True)
+    ChangeEvent.bulk_record(
+        ChangeEvent.Kind.APPLICATION_STATUS,
+        job,
+        [
+            (application.staff_id, {"application_id": application.id, "status": application.status})
+            for application in applications
+        ],
+    )
+    return [{"application_id": application.id, "assignment_id": None} for application in applications]
+
+
+def _write_assignments(job, staff_ids, assigned_by_user_id):
+    now = timezone.now()
+    applications = JobApplication.objects.bulk_create(
+        JobApplication(job=job, staff_id=staff_id, status=JobApplication.Status.ACCEPTED, decision_at=now)
+        for staff_id in staff_ids
+    )
+    assignments = ShiftAssignment.objects.bulk_create(
+        ShiftAssignment(
+            job=job,
+            staff_id=staff_id,
+            assigned_by_user_id=assigned_by_user_id,
+            status=ShiftAssignment.Status.ASSIGNED,
+            shift_start_snapshot=job.shift_start,
+            shift_end_snapshot=job.shift_end,
+        )
+        for staff_id in staff_ids
+    )
+    JobPosting.adjust_counters(job.id, assigned=len(assignments))
+    job_feed.queue_refreshes([job.id])
+    StaffWeekWorkdays.bulk_mark_day(staff_ids, timezone.localdate(job.shift_start))
+    HospitalStaffLink.bulk_touch(job.hospital_id, staff_ids, applied=True, assigned=True)
+    ChangeEvent.bulk_record(
+        ChangeEvent.Kind.ASSIGNMENT_CREATED,
+        job,
+        [
+            (assignment.staff_id, {"assignment_id": assignment.id, "status": assignment.status})
+            for assignment in assignments
+        ],
+    )
+    return [
+        {"application_id": application.id, "assignment_id": assignment.id}
+        for application, assignment in zip(applications, assignments)
+    ]
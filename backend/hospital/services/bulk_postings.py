@@ -0,0 +1,311 @@
+"""
+Bulk and recurring job posting.
+
+``create_postings`` takes posting fields shared by every shift, plus either a
+list of shift windows or a recurrence rule. Each item can override any shared
+field.
+
+Validation runs in one pass over the items. Departments, professions and skills
+are loaded once and assigned to each posting, so ``full_clean`` issues no query
+per item. The foreign keys and check constraints it would query for are checked
+in memory. The valid postings are inserted with ``bulk_create`` in one
+transaction, together with their required skills. The same transaction queues
+the postings' NEW_SHIFT notifications as one batch and their feed refreshes;
+``manage.py notify_new_shifts`` then gives each eligible staff member one
+notification listing the new postings they qualify for (``job_ids``), rather
+than one per posting.
+
+Naive shift times, and recurrences, are read in the posting's ``timezone``. A
+recurrence keeps the first shift's wall-clock times across DST changes; wall
+times a DST change skips or repeats are rejected rather than guessed. A
+recurrence may run at most ``JOB_POSTING_RECURRENCE_MAX_WEEKS`` past its first
+shift.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from hospital.models import Department, JobPosting, JobRequiredSkill
+from staff.models import Profession, Skill
+from staff.services import job_feed, matching
+
+POSTING_DEFAULTS = {
+    "currency": "USD",
+    "timezone": "UTC",
+    "shift_type": JobPosting.ShiftType.DAY,
+    "description": "",
+    "city": "",
+    "state": "",
+    "country": "",
+}
+REQUIRED_FIELDS = (
+    "department_id",
+    "profession_id",
+    "required_staff_count",
+    "hourly_rate",
+    "shift_start",
+    "shift_end",
+)
+# Copied onto the posting as given and validated by full_clean.
+PLAIN_FIELDS = ("required_staff_count", "hourly_rate", *POSTING_DEFAULTS)
+FREQUENCIES = ("DAILY", "WEEKLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+
+def max_postings():
+    return getattr(settings, "JOB_POSTING_BULK_LIMIT", 1000)
+
+
+def max_recurrence_weeks():
+    return getattr(settings, "JOB_POSTING_RECURRENCE_MAX_WEEKS", 52)
+
+
+def _zone(name):
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError, TypeError) as exc:
+        raise ValueError(f"Unknown timezone: {name}") from exc
+
+
+def _parse_moment(value):
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def _aware(moment, zone):
+    """``moment`` as an aware datetime, reading a naive one as wall time in ``zone``."""
+    if moment.tzinfo is not None:
+        return moment
+    earlier = moment.replace(tzinfo=zone, fold=0)
+    later = moment.replace(tzinfo=zone, fold=1)
+    if earlier.utcoffset() != later.utcoffset():
+        # A skipped wall time does not survive the round trip through UTC.
+        skipped = earlier.astimezone(dt_timezone.utc).astimezone(zone).replace(tzinfo=None) != moment
+        problem = "does not exist" if skipped else "is ambiguous"
+        raise ValueError(f"{moment:%Y-%m-%d %H:%M} {problem} in {zone.key} because of a DST change")
+    return earlier
+
+
+def expand_recurrence(rule, zone_name):
+    """
+    Shift windows of a recurrence ``rule``. The rule holds:
+
+    - ``shift_start`` and ``shift_end``: the first shift;
+    - ``frequency``: ``DAILY`` or ``WEEKLY``;
+    - ``interval``: every nth day or week (default 1);
+    - ``weekdays``: for ``WEEKLY``, like ``["MO", "TH"]``; defaults to the first shift's weekday;
+    - ``count`` or ``until``: the number of shifts, or the last date (inclusive).
+    """
+    zone = _zone(zone_name)
+    try:
+        first_start = _parse_moment(rule["shift_start"])
+        first_end = _parse_moment(rule["shift_end"])
+    except KeyError as exc:
+        raise ValueError("recurrence needs shift_start and shift_end") from exc
+    except (TypeError, ValueError) as exc:
+        raise ValueError("shift_start and shift_end must be ISO datetime strings") from exc
+    first_start = _aware(first_start, zone).astimezone(zone)
+    first_end = _aware(first_end, zone).astimezone(zone)
+    # Wall-clock length, so a night shift stays 19:00-07:00 across a DST change.
+    length = first_end.replace(tzinfo=None) - first_start.replace(tzinfo=None)
+    if length <= timedelta(0):
+        raise ValueError("recurrence shift_end must be after shift_start")
+
+    frequency = str(rule.get("frequency", "")).upper()
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"recurrence frequency must be one of: {', '.join(FREQUENCIES)}")
+    try:
+        interval = int(rule.get("interval", 1))
+        count = int(rule["count"]) if rule.get("count") is not None else None
+        until = datetime.fromisoformat(rule["until"]).date() if rule.get("until") else None
+    except (TypeError, ValueError) as exc:
+        raise ValueError("recurrence interval and count must be integers and until a date") from exc
+    if interval <= 0 or (count is not None and count <= 0):
+        raise ValueError("recurrence interval and count must be greater than 0")
+    if (count is None) == (until is None):
+        raise ValueError("recurrence needs exactly one of count or until")
+
+    weekdays = {first_start.weekday()}
+    if frequency == "WEEKLY" and rule.get("weekdays"):
+        try:
+            weekdays = {WEEKDAYS.index(str(day).upper()) for day in rule["weekdays"]}
+        except ValueError as exc:
+            raise ValueError(f"recurrence weekdays must be among: {', '.join(WEEKDAYS)}") from exc
+
+    first_day = first_start.date()
+    first_monday = first_day - timedelta(days=first_day.weekday())
+    horizon = first_day + timedelta(weeks=max_recurrence_weeks())
+    if until is not None and until > horizon:
+        raise ValueError(f"recurrence until must be within {max_recurrence_weeks()} weeks of the first shift")
+    limit = max_postings()
+    windows = []
+    day = first_day
+    while (count is None or len(windows) < count) and (until is None or day <= until):
+        if day > horizon:
+            raise ValueError(f"recurrence runs more than {max_recurrence_weeks()} weeks past the first shift")
+        if frequency == "DAILY":
+            included = (day - first_day).days % interval == 0
+        else:
+            included = ((day - first_monday).days // 7) % interval == 0 and day.weekday() in weekdays
+        if included:
+            if len(windows) == limit:
+                raise ValueError(f"recurrence yields more than {limit} shifts")
+            start = datetime.combine(day, first_start.time())
+            windows.append({"shift_start": _aware(start, zone), "shift_end": _aware(start + length, zone)})
+        day += timedelta(days=1)
+    return windows
+
+
+def required_skill_pairs(value, skills=None):
+    """
+    ``[(skill_id, minimum_proficiency)]`` from a request's ``required_skills``.
+    ``skills`` holds the known skill ids; they are looked up when not given.
+    """
+    if value is not None and not isinstance(value, list):
+        raise ValidationError("required_skills must be a list")
+    if skills is None:
+        skill_ids = {_as_id(entry.get("skill_id")) for entry in value or [] if isinstance(entry, dict)}
+        skills = set(Skill.objects.filter(id__in=skill_ids - {None}).values_list("id", flat=True))
+    pairs = {}
+    for entry in value or []:
+        try:
+            skill_id = int(entry["skill_id"])
+            minimum = int(entry.get("minimum_proficiency", 3))
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValidationError("required_skills entries need an integer skill_id") from exc
+        if skill_id not in skills:
+            raise ValidationError(f"Unknown skill_id: {skill_id}")
+        if not 1 <= minimum <= 5:
+            raise ValidationError("minimum_proficiency must be between 1 and 5")
+        if skill_id in pairs:
+            raise ValidationError(f"Skill {skill_id} is required twice")
+        pairs[skill_id] = minimum
+    return list(pairs.items())
+
+
+def _build_posting(hospital, fields, departments, professions, skills):
+    """An unsaved, validated JobPosting and its required skills; raises ValidationError."""
+    missing = [field for field in REQUIRED_FIELDS if fields.get(field) in (None, "")]
+    if missing:
+        raise ValidationError(f"Missing fields: {', '.join(missing)}")
+    department = departments.get(_as_id(fields["department_id"]))
+    if department is None:
+        raise ValidationError("Department must belong to the same hospital as the job posting.")
+    profession = professions.get(_as_id(fields["profession_id"]))
+    if profession is None:
+        raise ValidationError(f"Unknown profession_id: {fields['profession_id']}")
+    try:
+        zone = _zone(fields["timezone"])
+    except ValueError as exc:
+        raise ValidationError(str(exc)) from exc
+    try:
+        shift_start = _parse_moment(fields["shift_start"])
+        shift_end = _parse_moment(fields["shift_end"])
+    except (TypeError, ValueError) as exc:
+        raise ValidationError("shift_start and shift_end must be ISO datetime strings") from exc
+    try:
+        shift_start, shift_end = _aware(shift_start, zone), _aware(shift_end, zone)
+    except ValueError as exc:
+        raise ValidationError(str(exc)) from exc
+
+    job = JobPosting(
+        hospital=hospital,
+        department=department,
+        profession=profession,
+        shift_start=shift_start,
+        shift_end=shift_end,
+        **{field: fields[field] for field in PLAIN_FIELDS},
+    )
+    # Related objects are already resolved; skip full_clean's per-row queries.
+    job.full_clean(
+        exclude=["hospital", "department", "profession"], validate_unique=False, validate_constraints=False
+    )
+    if job.shift_start >= job.shift_end:
+        raise ValidationError("shift_end must be after shift_start")
+    if job.required_staff_count <= 0:
+        raise ValidationError("required_staff_count must be greater than 0")
+    return job, required_skill_pairs(fields.get("required_skills"), skills)
+
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def create_postings(hospital, body):
+    """
+    Validates and creates the postings described by ``body`` for ``hospital``.
+
+    Returns ``{"created", "failed", "results"}``. ``results`` has one entry per
+    item, in order, with the new ``id`` or an ``error``.
+    With ``"atomic": true`` any invalid item means nothing is created. Raises
+    ValueError for a malformed request.
+    """
+    shared = {**POSTING_DEFAULTS, **body}
+    if ("shifts" in body) == ("recurrence" in body):
+        raise ValueError("Provide exactly one of shifts or recurrence")
+    if "recurrence" in body:
+        if not isinstance(body["recurrence"], dict):
+            raise ValueError("recurrence must be an object")
+        items = expand_recurrence(body["recurrence"], shared["timezone"])
+    else:
+        items = body["shifts"]
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise ValueError("shifts must be a list of objects")
+    if not items:
+        raise ValueError("No shifts to create")
+    if len(items) > max_postings():
+        raise ValueError(f"At most {max_postings()} shifts per request")
+
+    items = [{**shared, **item} for item in items]
+    departments = {
+        pk: department
+        for pk, department in Department.objects.in_bulk(
+            {_as_id(item.get("department_id")) for item in items} - {None}
+        ).items()
+        if department.hospital_id == hospital.id
+    }
+    professions = Profession.objects.in_bulk({_as_id(item.get("profession_id")) for item in items} - {None})
+    skill_ids = {
+        _as_id(entry.get("skill_id"))
+        for item in items
+        if isinstance(item.get("required_skills"), list)
+        for entry in item["required_skills"]
+        if isinstance(entry, dict)
+    }
+    skills = set(Skill.objects.filter(id__in=skill_ids - {None}).values_list("id", flat=True))
+
+    results, postings = [], []
+    for index, item in enumerate(items):
+        try:
+            job, required_skills = _build_posting(hospital, item, departments, professions, skills)
+        except ValidationError as exc:
+            results.append({"index": index, "error": "; ".join(exc.messages)})
+            continue
+        result = {"index": index, "shift_start": job.shift_start, "shift_end": job.shift_end}
+        results.append(result)
+        postings.append((result, job, required_skills))
+
+    failed = len(results) - len(postings)
+    if failed and body.get("atomic"):
+        return {"created": 0, "failed": failed, "results": results}
+
+    if postings:
+        with transaction.atomic():
+            jobs = JobPosting.objects.bulk_create([job for _, job, _ in postings])
+            JobRequiredSkill.objects.bulk_create(
+                JobRequiredSkill(job=job, skill_id=skill_id, minimum_proficiency=minimum)
+                for job, (_, _, required_skills) in zip(jobs, postings)
+                for skill_id, minimum in required_skills
+            )
+            matching.queue_notifications(jobs)
+            job_feed.queue_refreshes([job.id for job in jobs])
+        for job, (result, _, _) in zip(jobs, postings):
+            result["id"] = job.id
+
+    return {"created": len(postings), "failed": failed, "results": results}
@@ -0,0 +1,385 @@
+"""
+Weekly roster optimization for one hospital.
+
+Builds a staff x job match matrix with NumPy from the same factors as
+``staff_ranking`` (skills, availability, hospital history, rating). It then
+proposes the roster with the highest total match subject to:
+
+- each job's open slots;
+- no overlapping shifts per staff member, existing assignments included;
+- no shifts during time off;
+- at most three working days per staff member in the ISO week, counting the
+  days already in the week ledger.
+
+Only same-profession pairs are considered. The solver is an ILP-free heuristic
+in two passes:
+
+1. Greedy over every feasible (staff, job) pair, best match first. Jobs compete
+   for staff across the whole week instead of in posting order.
+2. Augmenting moves for slots still open. A staff member blocked only by one of
+   their picks moves onto the open slot, and the job they leave is backfilled
+   with someone free.
+
+Nothing is written; the result is a proposal.
+"""
+
+import time as clock
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from hospital.models import HospitalStaffLink, JobPosting, ShiftAssignment, StaffWeekWorkdays
+from hospital.services import staff_ranking
+from hospital.services.autofill import MAX_WORKDAYS_PER_WEEK
+from staff.models import AppUser, AvailabilityException, AvailabilitySlot, StaffProfile, StaffSkill
+from staff.services import reference_data
+
+# Candidates tried per open slot, and backfills per displaced job, in the augmenting pass.
+AUGMENT_BREADTH = 50
+
+
+def parse_week(value):
+    """Monday of ISO week ``value`` (``2026-W43``), or of the current week when empty."""
+    if not value:
+        today = timezone.localdate()
+        return today - timedelta(days=today.weekday())
+    try:
+        year, week = value.upper().split("-W")
+        return date.fromisocalendar(int(year), int(week), 1)
+    except ValueError as exc:
+        raise ValueError("week must be an ISO week like 2026-W43") from exc
+
+
+def _seconds(value):
+    return value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1e6
+
+
+@dataclass
+class RosterProblem:
+    jobs: list
+    staff_ids: np.ndarray
+    scores: np.ndarray
+    feasible: np.ndarray
+    capacity: np.ndarray
+    overlaps: list
+    job_day_bits: list
+    staff_day_masks: list
+
+
+def staff_pool(hospital_id, profession_ids, limit):
+    """Active staff of ``profession_ids``; staff already linked to the hospital first, then by rating."""
+    linked = HospitalStaffLink.objects.filter(hospital_id=hospital_id, staff_id=OuterRef("pk"))
+    return list(
+        StaffProfile.objects.filter(
+            status=StaffProfile.Status.ACTIVE, user__is_active=True, profession_id__in=profession_ids
+        )
+        .annotate(linked=Exists(linked))
+        .order_by("-linked", "-rating_avg", "id")
+        .values_list("id", "profession_id", "rating_avg")[:limit]
+    )
+
+
+def match_scores(jobs, pool, history):
+    """
+    The ``staff_ranking.score_staff_for_job`` match of every pool member for
+    every job, as a float64 staff x job matrix.
+    """
+    staff_ids = np.array([staff_id for staff_id, _, _ in pool], dtype=np.int64)
+    staff_index = {staff_id: row for row, staff_id in enumerate(staff_ids.tolist())}
+    staff_professions = np.array([profession_id for _, profession_id, _ in pool], dtype=np.int64)
+    job_professions = np.array([job.profession_id for job in jobs], dtype=np.int64)
+    profession_fit = np.where(staff_professions[:, None] == job_professions[None, :], 100.0, 25.0)
+
+    # Skill match: mean over required skills of min(proficiency / minimum, 1).
+    skill_match = profession_fit.copy()
+    requirements = {job_index: list(job.required_skills.all()) for job_index, job in enumerate(jobs)}
+    skill_ids = sorted({req.skill_id for reqs in requirements.values() for req in reqs})
+    if skill_ids:
+        skill_column = {skill_id: column for column, skill_id in enumerate(skill_ids)}
+        proficiency = np.zeros((len(pool), len(skill_ids)))
+        rows = StaffSkill.objects.filter(staff_id__in=staff_index, skill_id__in=skill_ids).values_list(
+            "staff_id", "skill_id", "proficiency"
+        )
+        for staff_id, skill_id, level in rows:
+            proficiency[staff_index[staff_id], skill_column[skill_id]] = level
+        for job_index, reqs in requirements.items():
+            if reqs:
+                matched = sum(
+                    np.minimum(proficiency[:, skill_column[req.skill_id]] / max(req.minimum_proficiency, 1), 1.0)
+                    for req in reqs
+                )
+                skill_match[:, job_index] = np.round(matched / len(reqs) * 100)
+
+    # Availability fit: a slot on the shift's weekday that covers its clock times.
+    availability_fit = np.full((len(pool), len(jobs)), 30.0)
+    slots = list(
+        AvailabilitySlot.objects.filter(staff_id__in=staff_index, is_active=True).values_list(
+            "staff_id", "day_of_week", "start_time", "end_time"
+        )
+    )
+    if slots:
+        slot_rows = np.array([staff_index[staff_id] for staff_id, _, _, _ in slots])
+        slot_days = np.array([day for _, day, _, _ in slots])
+        slot_starts = np.array([_seconds(start) for _, _, start, _ in slots])
+        slot_ends = np.array([_seconds(end) for _, _, _, end in slots])
+        covered = {}
+        for job_index, job in enumerate(jobs):
+            start, end = timezone.localtime(job.shift_start), timezone.localtime(job.shift_end)
+            key = (AvailabilitySlot.WeekDay.of(start), _seconds(start.time()), _seconds(end.time()))
+            if key not in covered:
+                day, start, end = key
+                covered[key] = slot_rows[(slot_days == day) & (slot_starts <= start) & (slot_ends >= end)]
+            availability_fit[covered[key], job_index] = 100.0
+
+    history_max = max(history.values(), default=1)
+    history_counts = np.array([history.get(staff_id, 0) for staff_id in staff_ids.tolist()], dtype=float)
+    history_fit = np.round(history_counts / history_max * 100)
+    ratings = np.array([float(rating) for _, _, rating in pool])
+    reliability_fit = np.round(np.minimum(ratings / 5.0 * 100, 100))
+
+    scores = np.round(
+        (skill_match * 0.40)
+        + (availability_fit * 0.25)
+        + (history_fit[:, None] * 0.20)
+        + (reliability_fit[:, None] * 0.15)
+    )
+    return staff_ids, staff_professions[:, None] == job_professions[None, :], scores
+
+
+def build_problem(hospital_id, week_start, staff_limit=None):
+    week_begin = timezone.make_aware(datetime.combine(week_start, time.min))
+    week_end = timezone.make_aware(datetime.combine(week_start + timedelta(days=7), time.min))
+    jobs = list(
+        JobPosting.objects.filter(
+            hospital_id=hospital_id,
+            status=JobPosting.Status.OPEN,
+            shift_start__gte=week_begin,
+            shift_start__lt=week_end,
+            shift_start__gt=timezone.now(),
+            assigned_count__lt=F("required_staff_count"),
+        )
+        .prefetch_related("required_skills")
+        .order_by("shift_start", "id")
+    )
+    limit = staff_limit if staff_limit is not None else getattr(settings, "ROSTER_STAFF_POOL", 2000)
+    pool = staff_pool(hospital_id, {job.profession_id for job in jobs}, limit) if jobs else []
+    staff_ids, feasible, scores = match_scores(jobs, pool, staff_ranking.history_by_staff(hospital_id))
+    staff_index = {staff_id: row for row, staff_id in enumerate(staff_ids.tolist())}
+
+    starts = np.array([job.shift_start.timestamp() for job in jobs])
+    ends = np.array([job.shift_end.timestamp() for job in jobs])
+    job_overlaps = (starts[:, None] < ends[None, :]) & (ends[:, None] > starts[None, :])
+    np.fill_diagonal(job_overlaps, False)
+
+    if jobs:
+        window_start, window_end = min(job.shift_start for job in jobs), max(job.shift_end for job in jobs)
+        busy = ShiftAssignment.objects.filter(
+            staff_id__in=staff_index,
+            status=ShiftAssignment.Status.ASSIGNED,
+            shift_start_snapshot__lt=window_end,
+            shift_end_snapshot__gt=window_start,
+        ).values_list("staff_id", "shift_start_snapshot", "shift_end_snapshot")
+        time_off = AvailabilityException.objects.filter(
+            staff_id__in=staff_index, start_at__lt=window_end, end_at__gt=window_start
+        ).values_list("staff_id", "start_at", "end_at")
+        for staff_id, busy_start, busy_end in [*busy, *time_off]:
+            conflicting = (starts < busy_end.timestamp()) & (ends > busy_start.timestamp())
+            feasible[staff_index[staff_id], conflicting] = False
+
+        job_index = {job.id: column for column, job in enumerate(jobs)}
+        on_job = ShiftAssignment.objects.filter(job_id__in=job_index, staff_id__in=staff_index).values_list(
+            "staff_id", "job_id"
+        )
+        for staff_id, job_id in on_job:
+            feasible[staff_index[staff_id], job_index[job_id]] = False
+
+    iso_year, iso_week, _ = week_start.isocalendar()
+    masks = dict(
+        StaffWeekWorkdays.objects.filter(
+            staff_id__in=staff_index, iso_year=iso_year, iso_week=iso_week
+        ).values_list("staff_id", "day_mask")
+    )
+    return RosterProblem(
+        jobs=jobs,
+        staff_ids=staff_ids,
+        scores=scores,
+        feasible=feasible,
+        capacity=np.array([job.required_staff_count - job.assigned_count for job in jobs], dtype=np.int64),
+        overlaps=[set(np.flatnonzero(row).tolist()) for row in job_overlaps],
+        job_day_bits=[StaffWeekWorkdays.day_bit(timezone.localdate(job.shift_start)) for job in jobs],
+        staff_day_masks=[masks.get(staff_id, 0) for staff_id in staff_ids.tolist()],
+    )
+
+
+class _Roster:
+    """Proposed (staff row, job column) pairs with the constraint checks of the solver."""
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.capacity = problem.capacity.tolist()
+        self.staff_jobs = [set() for _ in range(len(problem.staff_ids))]
+
+    def fits(self, row, column, without=None):
+        jobs = self.staff_jobs[row] - {without}
+        if self.problem.overlaps[column] & jobs:
+            return False
+        mask = self.problem.staff_day_masks[row] | self.problem.job_day_bits[column]
+        for job in jobs:
+            mask |= self.problem.job_day_bits[job]
+        return mask.bit_count() <= MAX_WORKDAYS_PER_WEEK
+
+    def add(self, row, column):
+        self.staff_jobs[row].add(column)
+        self.capacity[column] -= 1
+
+    def remove(self, row, column):
+        self.staff_jobs[row].discard(column)
+        self.capacity[column] += 1
+
+    def assignments(self):
+        """``{job column: [staff rows]}``."""
+        assignments = {}
+        for row, jobs in enumerate(self.staff_jobs):
+            for column in jobs:
+                assignments.setdefault(column, []).append(row)
+        return assignments
+
+
+def solve(problem, augment=True):
+    """Returns ``{job column: [staff rows]}`` for ``problem``."""
+    roster = _Roster(problem)
+    scores, feasible = problem.scores, problem.feasible
+    if not problem.jobs or not len(problem.staff_ids):
+        return {}
+
+    remaining = int(problem.capacity.sum())
+    columns = scores.shape[1]
+    order = np.argsort(-np.where(feasible, scores, -1.0), axis=None, kind="stable")[: int(feasible.sum())]
+    for flat in order.tolist():
+        row, column = divmod(flat, columns)
+        if roster.capacity[column] and roster.fits(row, column):
+            roster.add(row, column)
+            remaining -= 1
+            if not remaining:
+                break
+
+    if augment and remaining:
+        ranked_columns = {}
+
+        def ranked(column):
+            if column not in ranked_columns:
+                rows = np.flatnonzero(feasible[:, column])
+                ranked_columns[column] = rows[np.argsort(-scores[rows, column], kind="stable")][
+                    :AUGMENT_BREADTH
+                ].tolist()
+            return ranked_columns[column]
+
+        for column in [column for column, open_slots in enumerate(roster.capacity) if open_slots]:
+            for row in ranked(column):
+                if not roster.capacity[column]:
+                    break
+                if column in roster.staff_jobs[row]:
+                    continue
+                if roster.fits(row, column):
+                    roster.add(row, column)
+                    continue
+                for blocking in list(roster.staff_jobs[row]):
+                    if not roster.fits(row, column, without=blocking):
+                        continue
+                    backfill = next(
+                        (
+                            other
+                            for other in ranked(blocking)
+                            if other != row
+                            and blocking not in roster.staff_jobs[other]
+                            and roster.fits(other, blocking)
+                        ),
+                        None,
+                    )
+                    if backfill is None:
+                        continue
+                    roster.remove(row, blocking)
+                    roster.add(row, column)
+                    roster.add(backfill, blocking)
+                    break
+
+    return roster.assignments()
+
+
+def solve_in_posting_order(problem):
+    """
+    Baseline for comparison: fills jobs one at a time in shift order, each with
+    its best remaining staff, as repeated auto-fills would.
+    """
+    roster = _Roster(problem)
+    for column in range(len(problem.jobs)):
+        rows = np.flatnonzero(problem.feasible[:, column])
+        for row in rows[np.argsort(-problem.scores[rows, column], kind="stable")].tolist():
+            if not roster.capacity[column]:
+                break
+            if roster.fits(row, column):
+                roster.add(row, column)
+    return roster.assignments()
+
+
+def objective(problem, assignments):
+    total = sum(float(problem.scores[row, column]) for column, rows in assignments.items() for row in rows)
+    filled = sum(len(rows) for rows in assignments.values())
+    open_slots = int(problem.capacity.sum())
+    return {
+        "total_match": round(total),
+        "filled": filled,
+        "open_slots": open_slots,
+        "unfilled": open_slots - filled,
+        "mean_match": round(total / filled, 1) if filled else 0,
+    }
+
+
+def optimize_week(hospital_id, week_start, staff_limit=None):
+    """The proposed roster for ``hospital_id``'s open shifts in the ISO week starting ``week_start``."""
+    started = clock.perf_counter()
+    problem = build_problem(hospital_id, week_start, staff_limit)
+    assignments = solve(problem)
+
+    rows = {row for picked in assignments.values() for row in picked}
+    staff_ids = problem.staff_ids.tolist()
+    names = dict(
+        AppUser.objects.filter(staff_profile__id__in=[staff_ids[row] for row in rows]).values_list(
+            "staff_profile__id", "full_name"
+        )
+    )
+    jobs = []
+    for column, job in enumerate(problem.jobs):
+        picked = sorted(assignments.get(column, []), key=lambda row: -problem.scores[row, column])
+        jobs.append(
+            {
+                "job_id": job.id,
+                "department": reference_data.department_name(job.department_id),
+                "profession": reference_data.profession_name(job.profession_id),
+                "shift_start": job.shift_start,
+                "shift_end": job.shift_end,
+                "open_slots": int(problem.capacity[column]),
+                "proposed": [
+                    {
+                        "staff_id": staff_ids[row],
+                        "name": names.get(staff_ids[row], ""),
+                        "match": int(problem.scores[row, column]),
+                    }
+                    for row in picked
+                ],
+            }
+        )
+
+    iso_year, iso_week, _ = week_start.isocalendar()
+    return {
+        "hospital_id": hospital_id,
+        "week": f"{iso_year}-W{iso_week:02d}",
+        "staff_considered": len(staff_ids),
+        "objective": objective(problem, assignments),
+        "elapsed_ms": round((clock.perf_counter() - started) * 1000),
+        "jobs": jobs,
+    }
@@ -0,0 +1,108 @@
+"""
+Deterministic ranking of staff for one job posting, shared by the hospital
+recommendations endpoint and shift auto-fill.
+"""
+
+from django.db.models import Count
+from django.utils import timezone
+
+from hospital.models import ShiftAssignment, StaffHospitalHistory
+from staff.models import AvailabilitySlot, StaffProfile
+from staff.services import reference_data
+
+
+def candidate_staff():
+    """Active staff with what scoring reads already loaded."""
+    return (
+        StaffProfile.objects.select_related("user")
+        .prefetch_related("staff_skills", "availability_slots")
+        .filter(status=StaffProfile.Status.ACTIVE, user__is_active=True)
+    )
+
+
+def history_by_staff(hospital_id):
+    """``{staff_id: assignments}`` at one hospital, archived ones included."""
+    counts = {
+        row["staff_id"]: row["count"]
+        for row in (
+            ShiftAssignment.objects.filter(job__hospital_id=hospital_id)
+            .values("staff_id")
+            .annotate(count=Count("id"))
+        )
+    }
+    # Assignments on archived postings only survive as summary counts.
+    for staff_id, archived_count in StaffHospitalHistory.objects.filter(
+        hospital_id=hospital_id
+    ).values_list("staff_id", "assignment_count"):
+        counts[staff_id] = counts.get(staff_id, 0) + archived_count
+    return counts
+
+
+def score_staff_for_job(job, candidates):
+    """Scores ``candidates`` (see ``candidate_staff``) for ``job``; returns result dicts, best first."""
+    # Scoring only needs skill ids; names resolve from the reference-data cache.
+    required_skills = list(job.required_skills.all())
+    local_start = timezone.localtime(job.shift_start)
+    shift_day = AvailabilitySlot.WeekDay.of(local_start)
+    shift_start = local_start.time()
+    shift_end = timezone.localtime(job.shift_end).time()
+
+    history = history_by_staff(job.hospital_id)
+    total_history_max = max(history.values(), default=1)
+
+    scored = []
+    for staff in candidates:
+        profession_fit = 100 if staff.profession_id == job.profession_id else 25
+
+        skill_map = {entry.skill_id: entry.proficiency for entry in staff.staff_skills.all()}
+        if required_skills:
+            matched = 0
+            for req in required_skills:
+                proficiency = skill_map.get(req.skill_id, 0)
+                matched += min(proficiency / max(req.minimum_proficiency, 1), 1.0)
+            skill_match = round((matched / len(required_skills)) * 100)
+        else:
+            # Fallback for MVP jobs that only specify profession.
+            skill_match = profession_fit
+
+        available_windows = [
+            (slot.start_time, slot.end_time)
+            for slot in staff.availability_slots.all()
+            if slot.is_active and slot.day_of_week == shift_day
+        ]
+        availability_fit = 30
+        for start_time, end_time in available_windows:
+            if start_time <= shift_start and end_time >= shift_end:
+                availability_fit = 100
+                break
+
+        history_fit = round((history.get(staff.id, 0) / total_history_max) * 100)
+        reliability_fit = round(min((float(staff.rating_avg) / 5.0) * 100, 100))
+
+        match_score = round(
+            (skill_match * 0.40)
+            + (availability_fit * 0.25)
+            + (history_fit * 0.20)
+            + (reliability_fit * 0.15)
+        )
+
+        scored.append(
+            {
+                "staff_id": staff.id,
+                "name": staff.user.full_name,
+                "role": reference_data.profession_name(staff.profession_id),
+                "avatar": staff.avatar_url,
+                "rating": float(staff.rating_avg),
+                "completed_shifts": staff.total_completed_shifts,
+                "match": match_score,
+                "tags": [
+                    {"key": "skill_match", "value": skill_match},
+                    {"key": "availability_fit", "value": availability_fit},
+                    {"key": "past_shift_history", "value": history_fit},
+                    {"key": "staff_reliability", "value": reliability_fit},
+                ],
+            }
+        )
+
+    scored.sort(key=lambda item: item["match"], reverse=True)
+    return scored
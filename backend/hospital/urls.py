@@ -10,11 +10,18 @@ urlpatterns = [
     path("shifts/summary/", views.shift_summary_list, name="shift-summary-list"),
     path("recommendations/", views.staff_recommendations_for_job, name="hospital-staff-recommendations"),
     path("shifts/<int:job_id>/manage/", views.shift_management_detail, name="shift-management-detail"),
+    path("roster.csv", views.roster_csv, name="hospital-roster-csv"),
+    path("roster/optimize/", views.optimize_roster, name="hospital-roster-optimize"),
+    path("events/", views.hospital_events, name="hospital-events"),
+    path("archive/shifts/", views.archived_shift_list, name="archived-shift-list"),
+    path("archive/shifts/<int:job_id>/", views.archived_shift_detail, name="archived-shift-detail"),
     path("shifts/", views.create_job_posting, name="create-job-posting"),
+    path("shifts/bulk/", views.bulk_create_job_postings, name="bulk-create-job-postings"),
     path(
         "applications/<int:application_id>/decision/",
         views.update_application_status,
         name="update-application-status",
     ),
     path("shifts/<int:job_id>/assign/", views.create_shift_assignment, name="create-shift-assignment"),
+    path("shifts/<int:job_id>/autofill/", views.autofill_shift, name="autofill-shift"),
 ]
@@ -1,40 +1,50 @@
 import json
 import os
-from datetime import datetime
+from contextlib import nullcontext
+from datetime import datetime, timedelta
 from urllib import error as urlerror
 from urllib import request as urlrequest
 
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.db import IntegrityError, transaction
-from django.db.models import Count, Q
-from django.http import JsonResponse
-from django.shortcuts import get_object_or_404
+from django.db.models import CharField, Prefetch, Q, Value
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_POST
 
-from hospital.models import Department, Hospital, JobApplication, JobPosting, ShiftAssignment
+from config.cache_versions import get_versions
+from config.conditional import conditional_get, fingerprint, minute_bucket
+from config.event_stream import event_stream_response, last_event_id, stream_events
+from config.exports import EXPORT_CHUNK_SIZE, parse_date_window, stream_csv
+from config.pagination import InvalidPageRequest, paginate, parse_page_size
+from config.responses import JsonResponse
+from config.search import RANKED_ORDERING, ranked_search, search_session
+from hospital.models import (
+    ArchivedJobPosting,
+    Attendance,
+    ChangeEvent,
+    Department,
+    Hospital,
+    JobApplication,
+    JobPosting,
+    JobRequiredSkill,
+    ShiftAssignment,
+)
+from hospital.services import autofill, bulk_postings, roster, staff_ranking
 from staff.models import AppUser, Profession, StaffProfile
+from staff.services import reference_data
+from staff.services.matching import queue_notifications
 from staff.services.recommendation_ai import (
     enhance_recommendations_with_ai,
     ensure_unique_reason_messages,
     synthesize_short_reason_from_tags,
 )
 
-DEFAULT_PROFESSIONS = [
-    "Physician",
-    "Registered Nurse",
-    "Physician Assistant",
-    "Nurse Practitioner",
-    "Surgeon",
-]
-DEFAULT_DEPARTMENTS = [
-    "ICU",
-    "Emergency",
-    "Radiology",
-    "Pediatrics",
-    "Surgery",
-]
-
 
 def _env_enabled(value):
     return str(value).strip().lower() in {"1", "true", "yes", "on"}
@@ -158,16 +168,36 @@ def _format_datetime_window(start_dt, end_dt):
     return f"{start_dt.strftime('%I:%M %p')} - {end_dt.strftime('%I:%M %p')}"
 
 
-def _ensure_default_professions():
-    for name in DEFAULT_PROFESSIONS:
-        if not Profession.objects.filter(name__iexact=name).exists():
-            Profession.objects.create(name=name)
+META_OPTIONS_CACHE_TIMEOUT = 60 * 60 * 24
 
 
-def _ensure_default_departments(hospital):
-    for name in DEFAULT_DEPARTMENTS:
-        if not Department.objects.filter(hospital=hospital, name__iexact=name).exists():
-            Department.objects.create(hospital=hospital, name=name)
+def _load_meta_options(hospital_id):
+    """Loads the hospital name, its departments and all professions in one query."""
+    rows = (
+        Hospital.objects.filter(id=hospital_id)
+        .annotate(kind=Value("hospital", output_field=CharField()))
+        .values_list("kind", "id", "name")
+        .union(
+            Department.objects.filter(hospital_id=hospital_id)
+            .annotate(kind=Value("department", output_field=CharField()))
+            .values_list("kind", "id", "name"),
+            Profession.objects.annotate(kind=Value("profession", output_field=CharField()))
+            .values_list("kind", "id", "name"),
+            all=True,
+        )
+        .order_by("kind", "name")
+    )
+
+    grouped = {"hospital": [], "department": [], "profession": []}
+    for row_kind, row_id, name in rows:
+        grouped[row_kind].append({"id": row_id, "name": name})
+    if not grouped["hospital"]:
+        return None
+    return {
+        "hospital": grouped["hospital"][0],
+        "departments": grouped["department"],
+        "professions": grouped["profession"],
+    }
 
 
 @require_GET
@@ -175,52 +205,90 @@ def meta_options(request):
     hospital_id = request.GET.get("hospital_id")
     if not hospital_id:
         return _json_error("hospital_id query param is required")
+    try:
+        hospital_id = int(hospital_id)
+    except ValueError:
+        return _json_error("hospital_id must be an integer")
 
-    hospital = get_object_or_404(Hospital, id=hospital_id)
-    _ensure_default_professions()
-    _ensure_default_departments(hospital)
-    departments = (
-        Department.objects.filter(hospital=hospital).order_by("name").values("id", "name")
+    hospital_version, professions_version = get_versions(
+        Hospital.options_cache_version(hospital_id),
+        Profession.CACHE_VERSION,
     )
-    professions = Profession.objects.order_by("name").values("id", "name")
-
-    return JsonResponse(
-        {
-            "hospital": {"id": hospital.id, "name": hospital.name},
-            "departments": list(departments),
-            "professions": list(professions),
-        }
+    etag = quote_etag(f"{hospital_id}-{hospital_version}-{professions_version}")
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    cache_key = f"meta_options:{hospital_id}:{hospital_version}:{professions_version}"
+    payload = cache.get(cache_key)
+    if payload is None:
+        payload = _load_meta_options(hospital_id)
+        if payload is None:
+            raise Http404("Hospital not found")
+        cache.set(cache_key, payload, META_OPTIONS_CACHE_TIMEOUT)
+
+    response = JsonResponse(payload)
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _shift_summary_validators(request):
+    hospital_id = request.GET.get("hospital_id")
+    if not hospital_id:
+        return None
+    validators = fingerprint(
+        JobPosting.objects.filter(hospital_id=hospital_id),
+        JobApplication.objects.filter(job__hospital_id=hospital_id),
+        ShiftAssignment.objects.filter(job__hospital_id=hospital_id),
     )
+    # Rows show "posted 5m ago", which ages without any writes.
+    validators.parts += (minute_bucket(),)
+    return validators
 
 
 @require_GET
+@conditional_get(_shift_summary_validators)
 def shift_summary_list(request):
     hospital_id = request.GET.get("hospital_id")
     if not hospital_id:
         return _json_error("hospital_id query param is required")
 
+    # Assigned staff and live applicants are prefetched with filtered querysets so
+    # a page costs three queries regardless of how many jobs it holds.
     jobs = (
         JobPosting.objects.filter(hospital_id=hospital_id)
         .select_related("profession", "department")
-        .annotate(applicant_count=Count("applications", distinct=True))
-        .order_by("-created_at")[:20]
+        .prefetch_related(
+            Prefetch(
+                "assignments",
+                queryset=ShiftAssignment.objects.filter(status=ShiftAssignment.Status.ASSIGNED)
+                .select_related("staff__user", "staff__profession")
+                .order_by("-assigned_at"),
+                to_attr="active_assignments",
+            ),
+            Prefetch(
+                "applications",
+                queryset=JobApplication.objects.filter(status__in=JobApplication.ACTIVE_STATUSES)
+                .select_related("staff__user")
+                .order_by("-applied_at"),
+                to_attr="active_applications",
+            ),
+        )
     )
 
-    items = []
-    for job in jobs:
-        assigned_qs = (
-            job.assignments.filter(status=ShiftAssignment.Status.ASSIGNED)
-            .select_related("staff__user", "staff__profession")
-            .order_by("-assigned_at")
-        )
-        applicants_qs = (
-            job.applications.filter(
-                status__in=[JobApplication.Status.APPLIED, JobApplication.Status.SHORTLISTED]
-            )
-            .select_related("staff__user")
-            .order_by("-applied_at")
+    try:
+        pages, next_cursor = paginate(
+            {"jobs": (jobs, ("-created_at", "-id"))},
+            cursor=request.GET.get("cursor"),
+            page_size=parse_page_size(request.GET.get("page_size")),
+            scope=f"hospital.shift_summary:{hospital_id}",
         )
+    except InvalidPageRequest as exc:
+        return _json_error(str(exc))
 
+    items = []
+    for job in pages["jobs"]:
         items.append(
             {
                 "id": job.id,
@@ -228,8 +296,8 @@ def shift_summary_list(request):
                 "time": _format_relative_time(job.created_at),
                 "capacity": job.required_staff_count,
                 "status": job.status,
-                "assigned_count": assigned_qs.count(),
-                "applicant_count": applicants_qs.count(),
+                "assigned_count": job.assigned_count,
+                "applicant_count": job.active_applicant_count,
                 "assigned": [
                     {
                         "id": assignment.staff_id,
@@ -239,7 +307,7 @@ def shift_summary_list(request):
                         "status": assignment.status,
                         "time": assignment.assigned_at.strftime("%I:%M %p"),
                     }
-                    for assignment in assigned_qs
+                    for assignment in job.active_assignments
                 ],
                 "applicants": [
                     {
@@ -251,15 +319,204 @@ def shift_summary_list(request):
                         "avatar": app.staff.avatar_url,
                         "status": app.status,
                     }
-                    for app in applicants_qs
+                    for app in job.active_applications
                 ],
             }
         )
 
-    return JsonResponse({"results": items})
+    return JsonResponse(
+        {
+            "results": items,
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+ROSTER_PAST_DAYS = 7
+ROSTER_WINDOW_DAYS = 35
+ROSTER_COLUMNS = [
+    ("assignment_id", "id"),
+    ("shift_start", "shift_start_snapshot"),
+    ("shift_end", "shift_end_snapshot"),
+    ("department", "job__department__name"),
+    ("profession", "job__profession__name"),
+    ("staff_id", "staff_id"),
+    ("staff_name", "staff__user__full_name"),
+    ("staff_email", "staff__user__email"),
+    ("status", "status"),
+    ("hourly_rate", "job__hourly_rate"),
+    ("currency", "job__currency"),
+    ("check_in", "attendance__check_in_time"),
+    ("check_out", "attendance__check_out_time"),
+    ("attendance", "attendance__status"),
+]
+
+
+def _roster_window(request):
+    return parse_date_window(
+        request.GET, timezone.localdate() - timedelta(days=ROSTER_PAST_DAYS), ROSTER_WINDOW_DAYS
+    )
+
+
+def _roster_assignments(hospital_id, window_start, window_end):
+    return ShiftAssignment.objects.filter(
+        job__hospital_id=hospital_id,
+        shift_start_snapshot__gte=window_start,
+        shift_start_snapshot__lt=window_end,
+    )
+
+
+def _roster_validators(request):
+    hospital_id = request.GET.get("hospital_id")
+    if not hospital_id:
+        return None
+    window_start, window_end = _roster_window(request)
+    validators = fingerprint(
+        _roster_assignments(hospital_id, window_start, window_end),
+        Attendance.objects.filter(
+            assignment__job__hospital_id=hospital_id,
+            assignment__shift_start_snapshot__gte=window_start,
+            assignment__shift_start_snapshot__lt=window_end,
+        ),
+    )
+    # The default window moves with the date even when no shift changes.
+    validators.parts += (window_start, window_end)
+    return validators
+
+
+@require_GET
+@conditional_get(_roster_validators)
+def roster_csv(request):
+    hospital_id = request.GET.get("hospital_id")
+    if not hospital_id:
+        return _json_error("hospital_id query param is required")
+    try:
+        window_start, window_end = _roster_window(request)
+    except ValueError as exc:
+        return _json_error(str(exc))
+    get_object_or_404(Hospital, id=hospital_id)
+
+    rows = (
+        _roster_assignments(hospital_id, window_start, window_end)
+        .order_by("shift_start_snapshot", "id")
+        .values_list(*(field for _, field in ROSTER_COLUMNS))
+    )
+    response = StreamingHttpResponse(
+        stream_csv(
+            [column for column, _ in ROSTER_COLUMNS],
+            rows.iterator(chunk_size=EXPORT_CHUNK_SIZE),
+        ),
+        content_type="text/csv; charset=utf-8",
+    )
+    response["Content-Disposition"] = f'attachment; filename="roster-{hospital_id}.csv"'
+    return response
+
+
+@require_GET
+async def hospital_events(request):
+    hospital_id = request.GET.get("hospital_id")
+    if not hospital_id:
+        return _json_error("hospital_id query param is required")
+    try:
+        hospital_id = int(hospital_id)
+        after_id = last_event_id(request)
+    except ValueError:
+        return _json_error("hospital_id and Last-Event-ID must be integers")
+
+    hospital = await aget_object_or_404(Hospital, id=hospital_id)
+    events = ChangeEvent.objects.filter(hospital_id=hospital.id)
+    return event_stream_response(stream_events(events, ChangeEvent.as_event, after_id))
+
+
+def _archived_job_payload(job):
+    return {
+        "id": job.id,
+        "title": f"{job.profession_name} - {job.department_name}",
+        "status": job.status,
+        "required_staff_count": job.required_staff_count,
+        "shift_window": _format_datetime_window(job.shift_start, job.shift_end),
+        "shift_start": job.shift_start,
+        "shift_end": job.shift_end,
+        "hourly_rate": job.hourly_rate,
+        "currency": job.currency,
+        "archived_at": job.archived_at,
+    }
+
+
+def _archived_shift_validators(request):
+    hospital_id = request.GET.get("hospital_id")
+    if not hospital_id:
+        return None
+    # Archived rows never change; only new archive runs add to the set.
+    return fingerprint(ArchivedJobPosting.objects.filter(hospital_id=hospital_id), field="archived_at")
+
+
+@require_GET
+@conditional_get(_archived_shift_validators)
+def archived_shift_list(request):
+    hospital_id = request.GET.get("hospital_id")
+    if not hospital_id:
+        return _json_error("hospital_id query param is required")
+
+    jobs = ArchivedJobPosting.objects.filter(hospital_id=hospital_id).defer(
+        "description", "required_skills", "applications"
+    )
+    try:
+        pages, next_cursor = paginate(
+            {"jobs": (jobs, ("-shift_start", "-id"))},
+            cursor=request.GET.get("cursor"),
+            page_size=parse_page_size(request.GET.get("page_size")),
+            scope=f"hospital.archived_shifts:{hospital_id}",
+        )
+    except InvalidPageRequest as exc:
+        return _json_error(str(exc))
+
+    return JsonResponse(
+        {
+            "results": [_archived_job_payload(job) for job in pages["jobs"]],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@require_GET
+def archived_shift_detail(request, job_id):
+    job = get_object_or_404(ArchivedJobPosting, id=job_id)
+    assignments = job.assignments.select_related("staff__user").order_by("shift_start_snapshot", "id")
+
+    payload = _archived_job_payload(job)
+    payload.update(
+        {
+            "hospital_id": job.hospital_id,
+            "description": job.description,
+            "required_skills": job.required_skills,
+            "applications": job.applications,
+            "assignments": [
+                {
+                    "id": assignment.id,
+                    "staff_id": assignment.staff_id,
+                    "name": assignment.staff.user.full_name,
+                    "status": assignment.status,
+                    "assigned_at": assignment.assigned_at,
+                    "attendance": assignment.attendance,
+                }
+                for assignment in assignments
+            ],
+        }
+    )
+    return JsonResponse({"job": payload})
+
+
+def _shift_detail_validators(request, job_id):
+    return fingerprint(
+        JobPosting.objects.filter(id=job_id),
+        JobApplication.objects.filter(job_id=job_id),
+        ShiftAssignment.objects.filter(job_id=job_id),
+    )
 
 
 @require_GET
+@conditional_get(_shift_detail_validators)
 def shift_management_detail(request, job_id):
     job = get_object_or_404(
         JobPosting.objects.select_related("hospital", "department", "profession"), id=job_id
@@ -284,13 +541,15 @@ def shift_management_detail(request, job_id):
             "title": f"{job.profession.name} - {job.department.name}",
             "description": job.description,
             "required_staff_count": job.required_staff_count,
+            "assigned_count": job.assigned_count,
+            "applicant_count": job.active_applicant_count,
             "status": job.status,
             "shift_window": _format_datetime_window(job.shift_start, job.shift_end),
-            "shift_start": job.shift_start.isoformat(),
-            "shift_end": job.shift_end.isoformat(),
+            "shift_start": job.shift_start,
+            "shift_end": job.shift_end,
             "department": job.department.name,
             "profession": job.profession.name,
-            "hourly_rate": str(job.hourly_rate),
+            "hourly_rate": job.hourly_rate,
             "currency": job.currency,
         },
         "assigned": [
@@ -301,7 +560,7 @@ def shift_management_detail(request, job_id):
                 "role": assignment.staff.profession.name,
                 "avatar": assignment.staff.avatar_url,
                 "status": assignment.status,
-                "assigned_at": assignment.assigned_at.isoformat(),
+                "assigned_at": assignment.assigned_at,
             }
             for assignment in assigned
         ],
@@ -314,7 +573,7 @@ def shift_management_detail(request, job_id):
                 "shifts": app.staff.total_completed_shifts,
                 "avatar": app.staff.avatar_url,
                 "status": app.status,
-                "applied_at": app.applied_at.isoformat(),
+                "applied_at": app.applied_at,
             }
             for app in applicants
         ],
@@ -367,13 +626,43 @@ def create_job_posting(request):
     )
 
     try:
-        job.save()
+        required_skills = bulk_postings.required_skill_pairs(body.get("required_skills"))
+    except ValidationError as exc:
+        return _json_error("; ".join(exc.messages))
+
+    try:
+        with transaction.atomic():
+            job.save()
+            JobRequiredSkill.objects.bulk_create(
+                JobRequiredSkill(job=job, skill_id=skill_id, minimum_proficiency=minimum)
+                for skill_id, minimum in required_skills
+            )
+            # notify_new_shifts writes the NEW_SHIFT rows outside the request.
+            queue_notifications([job])
     except Exception as exc:
         return _json_error(str(exc))
 
     return JsonResponse({"id": job.id, "message": "Job posting created"}, status=201)
 
 
+@csrf_exempt
+@require_POST
+def bulk_create_job_postings(request):
+    body = _parse_json_body(request)
+    if not isinstance(body, dict):
+        return _json_error("Invalid JSON body")
+    if not body.get("hospital_id"):
+        return _json_error("hospital_id is required")
+
+    hospital = get_object_or_404(Hospital, id=body["hospital_id"])
+    try:
+        result = bulk_postings.create_postings(hospital, body)
+    except ValueError as exc:
+        return _json_error(str(exc))
+
+    return JsonResponse(result, status=201 if result["created"] else 400)
+
+
 @csrf_exempt
 @require_POST
 def update_application_status(request, application_id):
@@ -460,6 +749,52 @@ def create_shift_assignment(request, job_id):
     return JsonResponse({"id": assignment.id, "message": "Staff assigned"}, status=201)
 
 
+@csrf_exempt
+@require_POST
+def autofill_shift(request, job_id):
+    body = _parse_json_body(request)
+    if body is None:
+        return _json_error("Invalid JSON body")
+
+    job = get_object_or_404(JobPosting, id=job_id)
+    try:
+        result = autofill.autofill_job(
+            job.id,
+            mode=body.get("mode", autofill.INVITE),
+            assigned_by_user_id=body.get("assigned_by_user_id"),
+        )
+    except ValidationError as exc:
+        return _json_error("; ".join(exc.messages))
+    except ValueError as exc:
+        return _json_error(str(exc))
+    except IntegrityError:
+        return _json_error("Shift changed while auto-filling; retry", status=409)
+
+    return JsonResponse(result, status=201 if result["filled"] else 200)
+
+
+@require_GET
+def optimize_roster(request):
+    hospital_id = request.GET.get("hospital_id")
+    if not hospital_id:
+        return _json_error("hospital_id query param is required")
+    try:
+        week_start = roster.parse_week(request.GET.get("week"))
+    except ValueError as exc:
+        return _json_error(str(exc))
+    staff_limit = request.GET.get("staff_limit")
+    if staff_limit is not None:
+        try:
+            staff_limit = int(staff_limit)
+        except ValueError:
+            return _json_error("staff_limit must be an integer")
+        if staff_limit <= 0:
+            return _json_error("staff_limit must be greater than 0")
+    hospital = get_object_or_404(Hospital, id=hospital_id)
+
+    return JsonResponse(roster.optimize_week(hospital.id, week_start, staff_limit))
+
+
 @csrf_exempt
 @require_POST
 def register_hospital(request):
@@ -508,6 +843,7 @@ def register_hospital(request):
                 address=location,
                 phone=phone,
             )
+            Department.provision_defaults(hospital)
     except IntegrityError as exc:
         return _json_error(f"Could not create hospital profile: {exc}", status=409)
 
@@ -515,7 +851,7 @@ def register_hospital(request):
         {
             "message": "Hospital registration successful",
             "hospital_id": hospital.id,
-            "user_id": str(owner.id),
+            "user_id": owner.id,
             "email": owner.email,
             "hospital_name": hospital.name,
         },
@@ -555,7 +891,7 @@ def login_hospital(request):
         {
             "message": "Login successful",
             "hospital_id": hospital.id,
-            "user_id": str(owner.id),
+            "user_id": owner.id,
             "email": owner.email,
             "hospital_name": hospital.name,
             "access_token": session.get("access_token"),
@@ -578,90 +914,15 @@ def staff_recommendations_for_job(request):
     if limit <= 0:
         return _json_error("limit must be greater than 0")
 
-    candidate_qs = (
-        StaffProfile.objects.select_related("user", "profession")
-        .prefetch_related("staff_skills__skill", "availability_slots")
-        .filter(status=StaffProfile.Status.ACTIVE, user__is_active=True)
-    )
-
     def score_for_job(job):
-        required_skills = list(job.required_skills.select_related("skill"))
-        shift_day = job.shift_start.weekday()
-        shift_start = job.shift_start.time()
-        shift_end = job.shift_end.time()
-
-        history_by_staff = {
-            row["staff_id"]: row["count"]
-            for row in (
-                ShiftAssignment.objects.filter(job__hospital=job.hospital)
-                .values("staff_id")
-                .annotate(count=Count("id"))
-            )
-        }
-        total_history_max = max(history_by_staff.values(), default=1)
-
-        scored = []
-        for staff in candidate_qs:
-            profession_fit = 100 if staff.profession_id == job.profession_id else 25
-
-            skill_map = {entry.skill_id: entry.proficiency for entry in staff.staff_skills.all()}
-            if required_skills:
-                matched = 0
-                for req in required_skills:
-                    proficiency = skill_map.get(req.skill_id, 0)
-                    matched += min(proficiency / max(req.minimum_proficiency, 1), 1.0)
-                skill_match = round((matched / len(required_skills)) * 100)
-            else:
-                # Fallback for MVP jobs that only specify profession.
-                skill_match = profession_fit
-
-            available_windows = [
-                (slot.start_time, slot.end_time)
-                for slot in staff.availability_slots.all()
-                if slot.is_active and slot.day_of_week == shift_day
-            ]
-            availability_fit = 30
-            for start_time, end_time in available_windows:
-                if start_time <= shift_start and end_time >= shift_end:
-                    availability_fit = 100
-                    break
-
-            history_fit = round((history_by_staff.get(staff.id, 0) / total_history_max) * 100)
-            reliability_fit = round(min((float(staff.rating_avg) / 5.0) * 100, 100))
-
-            match_score = round(
-                (skill_match * 0.40)
-                + (availability_fit * 0.25)
-                + (history_fit * 0.20)
-                + (reliability_fit * 0.15)
-            )
-
-            scored.append(
-                {
-                    "staff_id": staff.id,
-                    "name": staff.user.full_name,
-                    "role": staff.profession.name,
-                    "avatar": staff.avatar_url,
-                    "rating": float(staff.rating_avg),
-                    "completed_shifts": staff.total_completed_shifts,
-                    "match": match_score,
-                    "tags": [
-                        {"key": "skill_match", "value": skill_match},
-                        {"key": "availability_fit", "value": availability_fit},
-                        {"key": "past_shift_history", "value": history_fit},
-                        {"key": "staff_reliability", "value": reliability_fit},
-                    ],
-                }
-            )
-
-        scored.sort(key=lambda item: item["match"], reverse=True)
+        scored = staff_ranking.score_staff_for_job(job, staff_ranking.candidate_staff())
         top_results = scored[:limit]
 
         ai_context = {
             "hospital_id": job.hospital_id,
             "job_id": job.id,
-            "department": job.department.name,
-            "profession": job.profession.name,
+            "department": reference_data.department_name(job.department_id),
+            "profession": reference_data.profession_name(job.profession_id),
             "shift_start": job.shift_start.isoformat(),
             "shift_end": job.shift_end.isoformat(),
             "limit": limit,
@@ -718,10 +979,7 @@ def staff_recommendations_for_job(request):
         return final_results, ai_meta
 
     if job_id:
-        job = get_object_or_404(
-            JobPosting.objects.select_related("hospital", "profession", "department"),
-            id=job_id,
-        )
+        job = get_object_or_404(JobPosting, id=job_id)
         results, ai_meta = score_for_job(job)
         return JsonResponse(
             {
@@ -736,19 +994,18 @@ def staff_recommendations_for_job(request):
         return _json_error("job_id or hospital_id query param is required")
 
     hospital = get_object_or_404(Hospital, id=hospital_id)
-    departments_qs = Department.objects.filter(hospital=hospital).order_by("name")
+    departments = reference_data.hospital_departments(hospital.id)
     if department_filter and department_filter != "All":
-        departments_qs = departments_qs.filter(name__iexact=department_filter)
-    departments = list(departments_qs)
+        departments = [
+            department
+            for department in departments
+            if department["name"].lower() == department_filter.lower()
+        ]
 
-    jobs_qs = (
-        JobPosting.objects.filter(
-            hospital=hospital,
-            status=JobPosting.Status.OPEN,
-        )
-        .select_related("hospital", "profession", "department")
-        .order_by("department_id", "-created_at")
-    )
+    jobs_qs = JobPosting.objects.filter(
+        hospital=hospital,
+        status=JobPosting.Status.OPEN,
+    ).order_by("department_id", "-created_at")
 
     latest_job_by_department = {}
     for job in jobs_qs:
@@ -759,11 +1016,11 @@ def staff_recommendations_for_job(request):
     ai_applied_any = False
     ai_fallback_reasons = []
     for department in departments:
-        job = latest_job_by_department.get(department.id)
+        job = latest_job_by_department.get(department["id"])
         if not job:
             grouped_results.append(
                 {
-                    "department": department.name,
+                    "department": department["name"],
                     "job_id": None,
                     "results": [],
                     "ai_meta": {
@@ -783,7 +1040,7 @@ def staff_recommendations_for_job(request):
             ai_fallback_reasons.append(ai_meta.get("fallback_reason"))
         grouped_results.append(
             {
-                "department": department.name,
+                "department": department["name"],
                 "job_id": job.id,
                 "results": results,
                 "ai_meta": ai_meta,
@@ -816,28 +1073,55 @@ def search_directory(request):
     hospital = get_object_or_404(Hospital, id=hospital_id)
 
     departments_qs = Department.objects.filter(hospital=hospital)
-    if query:
-        departments_qs = departments_qs.filter(name__icontains=query)
-    departments = list(
-        departments_qs.order_by("name").values("id", "name")
-    )
-
     staff_qs = (
         StaffProfile.objects.select_related("user", "profession")
         .filter(status=StaffProfile.Status.ACTIVE, user__is_active=True)
         .filter(
-            Q(
-                hospital_affiliations__hospital=hospital,
-                hospital_affiliations__status="APPROVED",
+            Q(hospital_links__hospital=hospital)
+            & (
+                Q(hospital_links__is_affiliated=True)
+                | Q(hospital_links__has_applied=True)
+                | Q(hospital_links__has_assignment=True)
             )
-            | Q(job_applications__job__hospital=hospital)
-            | Q(shift_assignments__job__hospital=hospital)
         )
-        .distinct()
     )
+    department_fields = ["id", "name"]
+    staff_fields = [
+        "id",
+        "user__full_name",
+        "profession__name",
+        "rating_avg",
+        "total_completed_shifts",
+    ]
+    department_ordering = ("name", "id")
+    staff_ordering = ("user__full_name", "id")
+    session = nullcontext()
+
     if query:
-        staff_qs = staff_qs.filter(user__full_name__icontains=query)
+        departments_qs = ranked_search(departments_qs, query, ["name"])
+        staff_qs = ranked_search(staff_qs, query, ["user__full_name"])
+        department_fields.append("rank")
+        staff_fields.append("rank")
+        department_ordering = staff_ordering = RANKED_ORDERING
+        session = search_session(staff_qs.db)
+
+    try:
+        with session:
+            pages, next_cursor = paginate(
+                {
+                    "departments": (departments_qs.values(*department_fields), department_ordering),
+                    "staff_profiles": (staff_qs.values(*staff_fields), staff_ordering),
+                },
+                cursor=request.GET.get("cursor"),
+                page_size=parse_page_size(request.GET.get("page_size")),
+                scope=f"hospital.search_directory:{hospital.id}:{query}",
+            )
+            # Totals across every page, as before pagination.
+            counts = {"departments": departments_qs.count(), "staff_profiles": staff_qs.count()}
+    except InvalidPageRequest as exc:
+        return _json_error(str(exc))
 
+    departments = [{"id": row["id"], "name": row["name"]} for row in pages["departments"]]
     staff_profiles = [
         {
             "id": row["id"],
@@ -846,24 +1130,16 @@ def search_directory(request):
             "rating_avg": float(row["rating_avg"]),
             "total_completed_shifts": row["total_completed_shifts"],
         }
-        for row in staff_qs.order_by("user__full_name").values(
-            "id",
-            "user__full_name",
-            "profession__name",
-            "rating_avg",
-            "total_completed_shifts",
-        )
+        for row in pages["staff_profiles"]
     ]
 
     return JsonResponse(
         {
             "hospital": {"id": hospital.id, "name": hospital.name},
             "query": query,
-            "counts": {
-                "departments": len(departments),
-                "staff_profiles": len(staff_profiles),
-            },
+            "counts": counts,
             "departments": departments,
             "staff_profiles": staff_profiles,
+            "next_cursor": next_cursor,
         }
     )
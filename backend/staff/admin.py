@@ -4,6 +4,7 @@ from .models import (
     AppUser,
     AvailabilityException,
     AvailabilitySlot,
+    NotificationOutbox,
     Profession,
     Skill,
     StaffProfile,
@@ -58,3 +59,9 @@ class AvailabilitySlotAdmin(admin.ModelAdmin):
 class AvailabilityExceptionAdmin(admin.ModelAdmin):
     list_display = ("staff", "start_at", "end_at", "reason")
     search_fields = ("reason",)
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ("staff", "kind", "created_at", "delivered_at", "attempts")
+    list_filter = ("kind",)
@@ -3,3 +3,24 @@ from django.apps import AppConfig
 
 class StaffConfig(AppConfig):
     name = "staff"
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from staff.services.job_feed import job_changed, staff_changed
+        from staff.services.matching import staff_match_changed
+        from staff.services.reference_data import reference_data_changed
+
+        for sender in ("staff.Profession", "staff.Skill", "hospital.Department"):
+            post_save.connect(reference_data_changed, sender=sender, dispatch_uid=f"{sender}:reference_data")
+            post_delete.connect(reference_data_changed, sender=sender, dispatch_uid=f"{sender}:reference_data")
+
+        post_save.connect(job_changed, sender="hospital.JobPosting", dispatch_uid="hospital.JobPosting:job_feed")
+        post_delete.connect(job_changed, sender="hospital.JobPosting", dispatch_uid="hospital.JobPosting:job_feed")
+        # Feed scores ignore skills, so StaffSkill changes leave feeds alone.
+        for sender in ("staff.StaffProfile", "staff.AvailabilitySlot", "hospital.ShiftAssignment"):
+            post_save.connect(staff_changed, sender=sender, dispatch_uid=f"{sender}:job_feed")
+            post_delete.connect(staff_changed, sender=sender, dispatch_uid=f"{sender}:job_feed")
+        for sender in ("staff.StaffProfile", "staff.StaffSkill", "staff.AvailabilitySlot"):
+            post_save.connect(staff_match_changed, sender=sender, dispatch_uid=f"{sender}:matching")
+            post_delete.connect(staff_match_changed, sender=sender, dispatch_uid=f"{sender}:matching")
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:25
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Trigram indexes are built concurrently so large tables stay writable.
+    atomic = False
+
+    dependencies = [
+        ('staff', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='appuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['full_name'], name='app_users_full_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
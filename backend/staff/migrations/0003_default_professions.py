@@ -0,0 +1,31 @@
+# Generated by Django 6.0.2
+
+from django.db import migrations
+
+DEFAULT_PROFESSIONS = [
+    "Physician",
+    "Registered Nurse",
+    "Physician Assistant",
+    "Nurse Practitioner",
+    "Surgeon",
+]
+
+
+def create_default_professions(apps, schema_editor):
+    Profession = apps.get_model("staff", "Profession")
+    existing = {name.lower() for name in Profession.objects.values_list("name", flat=True)}
+    Profession.objects.bulk_create(
+        [Profession(name=name) for name in DEFAULT_PROFESSIONS if name.lower() not in existing],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("staff", "0002_trigram_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_default_professions, migrations.RunPython.noop),
+    ]
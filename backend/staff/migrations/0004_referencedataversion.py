@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:36
+
+from django.db import migrations, models
+
+
+def create_version_row(apps, schema_editor):
+    ReferenceDataVersion = apps.get_model("staff", "ReferenceDataVersion")
+    ReferenceDataVersion.objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('staff', '0003_default_professions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReferenceDataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'reference_data_version',
+            },
+        ),
+        migrations.RunPython(create_version_row, migrations.RunPython.noop),
+    ]
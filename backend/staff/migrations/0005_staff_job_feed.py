@@ -0,0 +1,32 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital', '0010_hospital_rating_aggregates'),
+        ('staff', '0004_referencedataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaffJobFeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('same_profession', models.BooleanField()),
+                ('match', models.PositiveSmallIntegerField()),
+                ('tags', models.JSONField(default=list)),
+                ('scored_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='hospital.jobposting')),
+                ('staff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_feed', to='staff.staffprofile')),
+            ],
+            options={
+                'db_table': 'staff_job_feed',
+                'indexes': [models.Index(fields=['staff', '-same_profession', '-match', 'job'], name='staff_job_feed_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('staff', 'job'), name='unique_staff_job_feed_entry')],
+            },
+        ),
+    ]
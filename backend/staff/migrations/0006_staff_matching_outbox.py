@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:55
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('staff', '0005_staff_job_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaffMatchProfile',
+            fields=[
+                ('staff', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='match_profile', serialize=False, to='staff.staffprofile')),
+                ('keys', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=32), default=list, size=None)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'staff_match_profiles',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['keys'], name='staff_match_keys_gin')],
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('NEW_SHIFT', 'New shift')], max_length=32)),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('delivered_at', models.DateTimeField(blank=True, null=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('staff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='staff.staffprofile')),
+            ],
+            options={
+                'db_table': 'notification_outbox',
+                'indexes': [models.Index(condition=models.Q(('delivered_at__isnull', True)), fields=['id'], name='notif_outbox_pending_idx'), models.Index(fields=['staff', '-created_at'], name='notif_outbox_staff_idx')],
+            },
+        ),
+    ]
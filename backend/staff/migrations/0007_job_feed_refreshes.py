@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('staff', '0006_staff_matching_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobFeedRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.BigIntegerField()),
+                ('requested_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'staff_job_feed_refreshes',
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital', '0011_change_events'),
+        ('staff', '0007_job_feed_refreshes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingShiftNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queued_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='hospital.jobposting')),
+            ],
+            options={
+                'db_table': 'pending_shift_notifications',
+            },
+        ),
+    ]
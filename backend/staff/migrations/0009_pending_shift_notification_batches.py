@@ -0,0 +1,32 @@
+# Generated by Django 6.0.2 on 2026-10-19 17:05
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+def copy_job_ids(apps, schema_editor):
+    PendingShiftNotification = apps.get_model("staff", "PendingShiftNotification")
+    for pending in PendingShiftNotification.objects.all():
+        pending.job_ids = [pending.job_id]
+        pending.save(update_fields=["job_ids"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('staff', '0008_pending_shift_notifications'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pendingshiftnotification',
+            name='job_ids',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), default=list, size=None),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_job_ids, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='pendingshiftnotification',
+            name='job',
+        ),
+    ]
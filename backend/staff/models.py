@@ -1,7 +1,21 @@
 import uuid
 
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
+
+from config.cache_versions import bump_version
+
+DEFAULT_PROFESSIONS = [
+    "Physician",
+    "Registered Nurse",
+    "Physician Assistant",
+    "Nurse Practitioner",
+    "Surgeon",
+]
 
 
 class TimeStampedModel(models.Model):
@@ -31,12 +45,23 @@ class AppUser(TimeStampedModel):
 
     class Meta:
         db_table = "app_users"
+        indexes = [
+            GinIndex(fields=["full_name"], name="app_users_full_name_trgm", opclasses=["gin_trgm_ops"]),
+        ]
 
     def __str__(self):
         return f"{self.full_name} ({self.role})"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # The staff dashboard caches the greeting name.
+        for staff_id in StaffProfile.objects.filter(user_id=self.pk).values_list("id", flat=True):
+            bump_version(StaffProfile.activity_cache_version(staff_id))
+
 
 class Profession(TimeStampedModel):
+    CACHE_VERSION = "professions"
+
     name = models.CharField(max_length=120, unique=True)
 
     class Meta:
@@ -45,6 +70,29 @@ class Profession(TimeStampedModel):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        bump_version(self.CACHE_VERSION)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_version(self.CACHE_VERSION)
+        return result
+
+    @classmethod
+    def provision_defaults(cls):
+        """Creates any missing default professions; returns how many were created."""
+        existing = {name.lower() for name in cls.objects.values_list("name", flat=True)}
+        missing = [cls(name=name) for name in DEFAULT_PROFESSIONS if name.lower() not in existing]
+        if missing:
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+            bump_version(cls.CACHE_VERSION)
+            # bulk_create skips post_save, so refresh the reference-data cache here.
+            from staff.services.reference_data import reference_data_changed
+
+            reference_data_changed(sender=cls)
+        return len(missing)
+
 
 class Skill(TimeStampedModel):
     name = models.CharField(max_length=120, unique=True)
@@ -86,6 +134,11 @@ class StaffProfile(TimeStampedModel):
     def __str__(self):
         return f"{self.user.full_name} - {self.profession.name}"
 
+    @staticmethod
+    def activity_cache_version(staff_id):
+        """Cache version of the staff member's applications and assignments (dashboard)."""
+        return f"staff:{staff_id}:activity"
+
 
 class StaffSkill(TimeStampedModel):
     staff = models.ForeignKey(
@@ -120,6 +173,11 @@ class AvailabilitySlot(TimeStampedModel):
         FRIDAY = 5, "Friday"
         SATURDAY = 6, "Saturday"
 
+        @classmethod
+        def of(cls, moment):
+            """The weekday of ``moment`` in the current time zone."""
+            return cls(timezone.localtime(moment).isoweekday() % 7)
+
     staff = models.ForeignKey(
         StaffProfile,
         on_delete=models.CASCADE,
@@ -164,3 +222,149 @@ class AvailabilityException(TimeStampedModel):
 
     def __str__(self):
         return f"{self.staff_id} exception {self.start_at} -> {self.end_at}"
+
+
+class ReferenceDataVersion(models.Model):
+    """
+    Single-row counter bumped whenever a profession, skill or department changes,
+    so every process can tell when its reference-data cache is stale.
+    """
+
+    SINGLETON_ID = 1
+
+    version = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "reference_data_version"
+
+    def __str__(self):
+        return f"Reference data v{self.version}"
+
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(pk=cls.SINGLETON_ID).values_list("version", flat=True).first() or 0
+
+    @classmethod
+    def bump(cls):
+        if not cls.objects.filter(pk=cls.SINGLETON_ID).update(version=models.F("version") + 1):
+            cls.objects.get_or_create(pk=cls.SINGLETON_ID, defaults={"version": 1})
+
+
+class StaffJobFeedEntry(models.Model):
+    """
+    One scored open job in a staff member's precomputed recommendation feed.
+
+    Kept to the top ``STAFF_JOB_FEED_SIZE`` jobs per staff member by
+    ``staff.services.job_feed``; ``manage.py rebuild_job_feeds`` recomputes it.
+    """
+
+    staff = models.ForeignKey(StaffProfile, on_delete=models.CASCADE, related_name="job_feed")
+    job = models.ForeignKey("hospital.JobPosting", on_delete=models.CASCADE, related_name="feed_entries")
+    same_profession = models.BooleanField()
+    match = models.PositiveSmallIntegerField()
+    tags = models.JSONField(default=list)
+    scored_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "staff_job_feed"
+        indexes = [
+            models.Index(
+                fields=["staff", "-same_profession", "-match", "job"],
+                name="staff_job_feed_rank_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["staff", "job"], name="unique_staff_job_feed_entry"),
+        ]
+
+    def __str__(self):
+        return f"feed staff={self.staff_id} job={self.job_id} ({self.match})"
+
+
+class JobFeedRefresh(models.Model):
+    """
+    A job posting whose feed entries need rescoring, queued in the transaction
+    that changed it and drained by ``manage.py process_job_feed_refreshes``.
+    Not a foreign key, so deleted postings are queued too.
+    """
+
+    job_id = models.BigIntegerField()
+    requested_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "staff_job_feed_refreshes"
+
+    def __str__(self):
+        return f"feed refresh job={self.job_id}"
+
+
+class StaffMatchProfile(models.Model):
+    """
+    A staff member's matching keys (profession, skill levels, weekly availability
+    hours), GIN-indexed so Postgres can intersect the posting lists of a new
+    shift's keys. Maintained by ``staff.services.matching``.
+    """
+
+    staff = models.OneToOneField(
+        StaffProfile,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="match_profile",
+    )
+    keys = ArrayField(models.CharField(max_length=32), default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "staff_match_profiles"
+        indexes = [
+            GinIndex(fields=["keys"], name="staff_match_keys_gin"),
+        ]
+
+    def __str__(self):
+        return f"match profile staff={self.staff_id} ({len(self.keys)} keys)"
+
+
+class NotificationOutbox(models.Model):
+    """Notifications written in the transaction that caused them, awaiting delivery."""
+
+    class Kind(models.TextChoices):
+        NEW_SHIFT = "NEW_SHIFT", "New shift"
+
+    staff = models.ForeignKey(StaffProfile, on_delete=models.CASCADE, related_name="notifications")
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        db_table = "notification_outbox"
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(delivered_at__isnull=True),
+                name="notif_outbox_pending_idx",
+            ),
+            models.Index(fields=["staff", "-created_at"], name="notif_outbox_staff_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} staff={self.staff_id}"
+
+
+class PendingShiftNotification(models.Model):
+    """
+    New job postings whose NEW_SHIFT notifications are still to be written,
+    queued in the transaction that created them and drained by
+    ``manage.py notify_new_shifts``. Postings queued together are notified
+    together: one notification per staff member listing them all.
+    """
+
+    job_ids = ArrayField(models.BigIntegerField())
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "pending_shift_notifications"
+
+    def __str__(self):
+        return f"pending notifications jobs={self.job_ids}"
@@ -0,0 +1,315 @@
+"""
+Deterministic job scoring for staff and the precomputed per-staff job feed.
+
+``staff_recommendations`` reads each staff member's top ``STAFF_JOB_FEED_SIZE``
+jobs from ``staff_job_feed`` instead of ranking the marketplace per page view.
+The feed is kept current incrementally:
+
+- a job posting saved, deleted, bulk-created or auto-filled is queued in
+  ``staff_job_feed_refreshes`` in the same transaction; ``manage.py
+  process_job_feed_refreshes`` rescores each queued job for the staff of its
+  profession and the feeds already holding it;
+- a staff member's profile, availability or assignment history changing
+  rebuilds only that staff member's feed after the transaction commits.
+
+Reads hide started or closed jobs and top a short feed up with live-ranked
+candidates, so gaps left by them, by hospital rating changes or by
+other-profession jobs are filled until ``manage.py rebuild_job_feeds`` runs.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from hospital.models import Department, JobPosting, ShiftAssignment, StaffHospitalHistory
+from staff.models import AvailabilitySlot, JobFeedRefresh, StaffJobFeedEntry, StaffProfile
+from staff.services import reference_data
+
+TRIM_FEEDS_SQL = """
+DELETE FROM staff_job_feed WHERE id IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY staff_id ORDER BY same_profession DESC, match DESC, job_id
+        ) AS position
+        FROM staff_job_feed
+        WHERE staff_id = ANY(%s)
+    ) ranked
+    WHERE position > %s
+)
+"""
+
+
+def feed_size():
+    return getattr(settings, "STAFF_JOB_FEED_SIZE", 50)
+
+
+def candidate_jobs(staff, department_filter, limit):
+    """
+    Upcoming open jobs worth scoring for ``staff``: the soonest
+    ``RECOMMENDATION_CANDIDATE_POOL`` jobs of their profession, topped up with
+    other professions only when those cannot fill ``limit``. Both reads walk
+    job_postings_candidates_idx, so the work tracks relevant jobs rather than
+    every open posting.
+    """
+    pool = max(getattr(settings, "RECOMMENDATION_CANDIDATE_POOL", 200), limit)
+    upcoming = (
+        JobPosting.objects.filter(status=JobPosting.Status.OPEN, shift_start__gt=timezone.now())
+        .select_related("hospital")
+        .order_by("shift_start", "id")
+    )
+    if department_filter != "All":
+        upcoming = upcoming.filter(
+            department_id__in=Department.objects.filter(name__iexact=department_filter).values("id")
+        )
+
+    candidates = list(upcoming.filter(profession_id=staff.profession_id)[:pool])
+    if len(candidates) < limit:
+        candidates.extend(upcoming.exclude(profession_id=staff.profession_id)[:pool])
+    return candidates
+
+
+def availability_by_staff(staff_ids):
+    """``{staff_id: {weekday: [(start, end), ...]}}`` of active availability slots."""
+    windows = defaultdict(lambda: defaultdict(list))
+    slots = AvailabilitySlot.objects.filter(staff_id__in=staff_ids, is_active=True).values_list(
+        "staff_id", "day_of_week", "start_time", "end_time"
+    )
+    for staff_id, day, start_time, end_time in slots:
+        windows[staff_id][day].append((start_time, end_time))
+    return windows
+
+
+def history_by_hospital(staff_id):
+    """``{hospital_id: assignments}`` for one staff member, archived ones included."""
+    counts = {
+        row["job__hospital_id"]: row["count"]
+        for row in ShiftAssignment.objects.filter(staff_id=staff_id)
+        .values("job__hospital_id")
+        .annotate(count=Count("id"))
+    }
+    archived = StaffHospitalHistory.objects.filter(staff_id=staff_id).values_list(
+        "hospital_id", "assignment_count"
+    )
+    for hospital_id, archived_count in archived:
+        counts[hospital_id] = counts.get(hospital_id, 0) + archived_count
+    return counts
+
+
+def history_at_hospital(hospital_id, staff_ids):
+    """``{staff_id: assignments}`` at one hospital, archived ones included."""
+    counts = {
+        row["staff_id"]: row["count"]
+        for row in ShiftAssignment.objects.filter(job__hospital_id=hospital_id, staff_id__in=staff_ids)
+        .values("staff_id")
+        .annotate(count=Count("id"))
+    }
+    archived = StaffHospitalHistory.objects.filter(
+        hospital_id=hospital_id, staff_id__in=staff_ids
+    ).values_list("staff_id", "assignment_count")
+    for staff_id, archived_count in archived:
+        counts[staff_id] = counts.get(staff_id, 0) + archived_count
+    return counts
+
+
+def score_job(profession_id, job, availability, history_count):
+    """
+    Returns ``(match, tags)`` for ``job``.
+
+    Recommendation scoring is intentionally explainable for hospital/staff trust:
+    - profession_fit (40%): strong signal for qualification match
+    - availability_fit (25%): ensures recommendation is realistically schedulable
+    - hospital_history (20%): rewards continuity where staff has proven history
+    - hospital_rating (15%): uses peer feedback quality signal
+    This weighted decomposition allows both UI and audit logs to show why a shift ranks high.
+    """
+    profession_fit = 100 if job.profession_id == profession_id else 35
+
+    availability_fit = 30
+    start = timezone.localtime(job.shift_start)
+    end = timezone.localtime(job.shift_end)
+    for start_time, end_time in availability.get(AvailabilitySlot.WeekDay.of(start), []):
+        if start_time <= start.time() and end_time >= end.time():
+            availability_fit = 100
+            break
+
+    history = min(history_count * 15, 100)
+    # Bayesian-smoothed, so hospitals without reviews sit at the 3.5 prior.
+    rating = min((float(job.hospital.rating_score) / 5.0) * 100, 100)
+
+    match = round(
+        (profession_fit * 0.40) + (availability_fit * 0.25) + (history * 0.20) + (rating * 0.15)
+    )
+    tags = [
+        {"key": "profession_fit", "value": profession_fit},
+        {"key": "availability_fit", "value": availability_fit},
+        {"key": "hospital_history", "value": history},
+        {"key": "hospital_rating", "value": round(rating, 1)},
+    ]
+    return match, tags
+
+
+def rank_jobs(staff, jobs):
+    """
+    Scores ``jobs`` for ``staff`` and returns ``[(job, match, tags)]`` best first.
+    Same-profession jobs rank ahead; other professions only fill the remaining slots.
+    """
+    availability = availability_by_staff([staff.id])[staff.id]
+    history = history_by_hospital(staff.id)
+    ranked = [
+        (job, *score_job(staff.profession_id, job, availability, history.get(job.hospital_id, 0)))
+        for job in jobs
+    ]
+    ranked.sort(key=lambda row: (row[0].profession_id == staff.profession_id, row[1]), reverse=True)
+    return ranked
+
+
+def recommendation_item(job, match, tags):
+    """The API shape of one recommended job; names come from the reference-data cache."""
+    department_name = reference_data.department_name(job.department_id)
+    return {
+        "job_id": job.id,
+        "name": job.hospital.name,
+        "role": f"{reference_data.profession_name(job.profession_id)} - {department_name}",
+        "department": department_name,
+        "match": match,
+        "hourly_rate": job.hourly_rate,
+        "currency": job.currency,
+        "capacity": job.required_staff_count,
+        "assigned_count": job.assigned_count,
+        "tags": tags,
+    }
+
+
+def read_feed(staff, limit):
+    """
+    The staff member's best ``limit`` feed entries that are still open and
+    upcoming, topped up with live-ranked ``candidate_jobs`` when fewer remain.
+    """
+    entries = (
+        StaffJobFeedEntry.objects.filter(
+            staff=staff,
+            job__status=JobPosting.Status.OPEN,
+            job__shift_start__gt=timezone.now(),
+        )
+        .select_related("job__hospital")
+        .order_by("-same_profession", "-match", "job_id")
+    )
+    ranked = [(entry.job, entry.match, entry.tags) for entry in entries[:limit]]
+    if len(ranked) < limit:
+        held = {job.id for job, _, _ in ranked}
+        live = [row for row in rank_jobs(staff, candidate_jobs(staff, "All", limit)) if row[0].id not in held]
+        ranked.extend(live)
+        ranked.sort(key=lambda row: (row[0].profession_id == staff.profession_id, row[1]), reverse=True)
+    return ranked[:limit]
+
+
+def refresh_staff_feeds(staff_ids):
+    """Rebuilds the feeds of ``staff_ids``; inactive staff end up with an empty feed."""
+    size = feed_size()
+    refreshed = 0
+    staff_members = StaffProfile.objects.filter(id__in=staff_ids, status=StaffProfile.Status.ACTIVE)
+    for staff in staff_members:
+        ranked = rank_jobs(staff, candidate_jobs(staff, "All", size))[:size]
+        with transaction.atomic():
+            StaffJobFeedEntry.objects.filter(staff=staff).delete()
+            StaffJobFeedEntry.objects.bulk_create(
+                [
+                    StaffJobFeedEntry(
+                        staff=staff,
+                        job=job,
+                        same_profession=job.profession_id == staff.profession_id,
+                        match=match,
+                        tags=tags,
+                    )
+                    for job, match, tags in ranked
+                ]
+            )
+        refreshed += 1
+    StaffJobFeedEntry.objects.filter(staff_id__in=staff_ids).exclude(
+        staff__status=StaffProfile.Status.ACTIVE
+    ).delete()
+    return refreshed
+
+
+def refresh_job(job_id):
+    """Rescores one job posting for the staff of its profession and the feeds holding it."""
+    job = JobPosting.objects.select_related("hospital").filter(id=job_id).first()
+    holders = set(StaffJobFeedEntry.objects.filter(job_id=job_id).values_list("staff_id", flat=True))
+    if job is None or job.status != JobPosting.Status.OPEN or job.shift_start <= timezone.now():
+        StaffJobFeedEntry.objects.filter(job_id=job_id).delete()
+        # The freed slot goes to the next best job.
+        refresh_staff_feeds(holders)
+        return
+
+    # Both reads use foreign-key indexes; feeds short of same-profession jobs
+    # pick this one up on the next rebuild_job_feeds.
+    affected = holders | set(
+        StaffProfile.objects.filter(
+            status=StaffProfile.Status.ACTIVE, profession_id=job.profession_id
+        ).values_list("id", flat=True)
+    )
+    if not affected:
+        return
+
+    professions = dict(StaffProfile.objects.filter(id__in=affected).values_list("id", "profession_id"))
+    availability = availability_by_staff(affected)
+    history = history_at_hospital(job.hospital_id, affected)
+    entries = []
+    for staff_id, profession_id in professions.items():
+        match, tags = score_job(profession_id, job, availability[staff_id], history.get(staff_id, 0))
+        entries.append(
+            StaffJobFeedEntry(
+                staff_id=staff_id,
+                job=job,
+                same_profession=job.profession_id == profession_id,
+                match=match,
+                tags=tags,
+            )
+        )
+
+    with transaction.atomic():
+        StaffJobFeedEntry.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=["staff", "job"],
+            update_fields=["same_profession", "match", "tags", "scored_at"],
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(TRIM_FEEDS_SQL, [list(professions), feed_size()])
+
+
+def process_refreshes(batch_size):
+    """
+    Rescores up to ``batch_size`` queued job postings and removes their queue
+    rows. Returns how many postings were rescored.
+    """
+    with transaction.atomic():
+        # skip_locked lets several workers drain the queue side by side.
+        queued = list(
+            JobFeedRefresh.objects.order_by("id")
+            .select_for_update(skip_locked=True)
+            .values_list("id", "job_id")[:batch_size]
+        )
+        job_ids = list(dict.fromkeys(job_id for _, job_id in queued))
+        for job_id in job_ids:
+            refresh_job(job_id)
+        JobFeedRefresh.objects.filter(id__in=[pk for pk, _ in queued]).delete()
+    return len(job_ids)
+
+
+def queue_refreshes(job_ids):
+    """Queues ``job_ids`` for rescoring; call it in the transaction that changed them."""
+    JobFeedRefresh.objects.bulk_create([JobFeedRefresh(job_id=job_id) for job_id in job_ids])
+
+
+def job_changed(sender, instance, **kwargs):
+    # Written in the saving transaction, so a rolled-back change queues nothing.
+    queue_refreshes([instance.pk])
+
+
+def staff_changed(sender, instance, **kwargs):
+    staff_id = instance.pk if isinstance(instance, StaffProfile) else instance.staff_id
+    transaction.on_commit(lambda: refresh_staff_feeds([staff_id]), robust=True)
@@ -0,0 +1,275 @@
+"""
+Inverted-index matching of new shifts to eligible staff.
+
+Each active staff member has a ``StaffMatchProfile`` listing keys:
+
+- ``p:<profession_id>``;
+- ``s:<skill_id>:<level>`` for every level up to their proficiency;
+- ``a:<day>:<half>`` for every local half hour (``half`` 0-47, 0 = 00:00-00:30)
+  a weekly availability slot fully covers (``day`` follows
+  ``AvailabilitySlot.WeekDay``, 0 = Sunday).
+
+A shift needs its profession, each required skill at its minimum level, and
+every half hour it touches, so slots and shifts on the hour or half hour match
+exactly. Eligible staff are those whose keys contain all of them, which the GIN
+index answers by intersecting posting lists instead of scanning staff. Inactive
+staff have no profile at all, so they never match; availability exceptions are
+filtered out of the (already small) result.
+
+Profiles are reindexed after the transaction that changed a staff member's
+profile, skills or availability commits; ``manage.py rebuild_staff_match_index``
+rebuilds them all.
+
+Postings created through the API, one at a time or in bulk, are only queued
+in ``pending_shift_notifications``; ``manage.py notify_new_shifts`` writes
+their outbox rows outside the request.
+"""
+
+from collections import defaultdict
+from datetime import time, timedelta
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from config.responses import dumps
+from hospital.models import JobPosting, JobRequiredSkill
+from staff.models import (
+    AvailabilityException,
+    AvailabilitySlot,
+    NotificationOutbox,
+    PendingShiftNotification,
+    StaffMatchProfile,
+    StaffProfile,
+    StaffSkill,
+)
+
+MAX_SKILL_LEVEL = 5
+
+# One index lookup per distinct key set (a recurring series repeats a few), one
+# outbox row per eligible staff member, and per-posting counts of eligible staff.
+NOTIFY_MANY_SQL = """
+WITH key_matches AS MATERIALIZED (
+    SELECT key_set.id AS key_set, profile.staff_id
+    FROM (VALUES {key_sets}) AS key_set (id, keys)
+    CROSS JOIN LATERAL (
+        SELECT staff_id FROM {profiles} WHERE keys @> key_set.keys
+    ) profile
+),
+matches AS (
+    SELECT job.job_id, job.shift_start, key_matches.staff_id
+    FROM (VALUES {jobs}) AS job (job_id, key_set, shift_start, shift_end)
+    JOIN key_matches ON key_matches.key_set = job.key_set
+    WHERE NOT EXISTS (
+        SELECT 1 FROM {exceptions} exception
+        WHERE exception.staff_id = key_matches.staff_id
+        AND exception.start_at < job.shift_end
+        AND exception.end_at > job.shift_start
+    )
+),
+inserted AS (
+    INSERT INTO {outbox} (staff_id, kind, payload, created_at, attempts)
+    SELECT staff_id, %s,
+           jsonb_build_object(
+               'hospital_id', %s::bigint, 'job_ids', jsonb_agg(job_id ORDER BY shift_start, job_id)
+           ),
+           %s, 0
+    FROM matches
+    GROUP BY staff_id
+)
+SELECT job_id, COUNT(*) FROM matches GROUP BY job_id
+"""
+
+
+def profession_key(profession_id):
+    return f"p:{profession_id}"
+
+
+def skill_key(skill_id, level):
+    return f"s:{skill_id}:{level}"
+
+
+def availability_key(day, half):
+    return f"a:{day}:{half}"
+
+
+def _half_hour(moment):
+    """Index of the half hour starting at or before ``moment`` (a time or datetime)."""
+    return moment.hour * 2 + moment.minute // 30
+
+
+def _covered_half_hours(start_time, end_time):
+    """Half hours ``[h:00, h:30)`` / ``[h:30, h+1:00)`` inside ``[start_time, end_time]``."""
+    # A slot ending at 23:59 is meant to run to midnight.
+    end_half = 48 if end_time >= time(23, 59) else _half_hour(end_time)
+    start_half = _half_hour(start_time)
+    if (start_time.minute % 30, start_time.second, start_time.microsecond) != (0, 0, 0):
+        start_half += 1
+    return range(start_half, end_half)
+
+
+def staff_keys(staff_ids):
+    """``{staff_id: sorted keys}``; inactive staff get no keys."""
+    keys = {
+        staff_id: {profession_key(profession_id)}
+        for staff_id, profession_id in StaffProfile.objects.filter(
+            id__in=staff_ids, status=StaffProfile.Status.ACTIVE
+        ).values_list("id", "profession_id")
+    }
+    skills = StaffSkill.objects.filter(staff_id__in=keys).values_list("staff_id", "skill_id", "proficiency")
+    for staff_id, skill_id, proficiency in skills:
+        keys[staff_id].update(skill_key(skill_id, level) for level in range(1, proficiency + 1))
+    slots = AvailabilitySlot.objects.filter(staff_id__in=keys, is_active=True).values_list(
+        "staff_id", "day_of_week", "start_time", "end_time"
+    )
+    for staff_id, day, start_time, end_time in slots:
+        keys[staff_id].update(
+            availability_key(day, half) for half in _covered_half_hours(start_time, end_time)
+        )
+    return {staff_id: sorted(staff_keys) for staff_id, staff_keys in keys.items()}
+
+
+def reindex_staff(staff_ids):
+    """Rewrites the match profiles of ``staff_ids``; returns how many were written."""
+    keys = staff_keys(staff_ids)
+    StaffMatchProfile.objects.filter(staff_id__in=staff_ids).exclude(staff_id__in=keys).delete()
+    StaffMatchProfile.objects.bulk_create(
+        [StaffMatchProfile(staff_id=staff_id, keys=staff_keys) for staff_id, staff_keys in keys.items()],
+        update_conflicts=True,
+        unique_fields=["staff"],
+        update_fields=["keys", "updated_at"],
+    )
+    return len(keys)
+
+
+def job_keys(job, required_skills=None):
+    """Keys a staff member needs to be eligible for ``job``."""
+    if required_skills is None:
+        required_skills = JobRequiredSkill.objects.filter(job_id=job.id).values_list(
+            "skill_id", "minimum_proficiency"
+        )
+    keys = {profession_key(job.profession_id)}
+    keys.update(skill_key(skill_id, min(level, MAX_SKILL_LEVEL)) for skill_id, level in required_skills)
+
+    start = timezone.localtime(job.shift_start)
+    end = timezone.localtime(job.shift_end)
+    half = start.replace(minute=start.minute - start.minute % 30, second=0, microsecond=0)
+    while half < end:
+        keys.add(availability_key(AvailabilitySlot.WeekDay.of(half), _half_hour(half)))
+        half += timedelta(minutes=30)
+    return sorted(keys)
+
+
+def eligible_staff(job, required_skills=None):
+    """Queryset of the match profiles of staff eligible for ``job``."""
+    time_off = AvailabilityException.objects.filter(
+        staff_id=OuterRef("staff_id"),
+        start_at__lt=job.shift_end,
+        end_at__gt=job.shift_start,
+    )
+    return StaffMatchProfile.objects.filter(keys__contains=job_keys(job, required_skills)).filter(
+        ~Exists(time_off)
+    )
+
+
+def notify_eligible_staff(job, required_skills=None):
+    """
+    Writes a NEW_SHIFT outbox row for every staff member eligible for ``job``
+    with a single INSERT ... SELECT; returns how many were written. Call it in
+    the transaction that creates the job so the two commit together.
+    """
+    payload = {
+        "job_id": job.id,
+        "hospital_id": job.hospital_id,
+        "profession_id": job.profession_id,
+        "shift_start": job.shift_start,
+        "shift_end": job.shift_end,
+        "hourly_rate": job.hourly_rate,
+        "currency": job.currency,
+    }
+    sql, params = eligible_staff(job, required_skills).values("staff_id").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {connection.ops.quote_name(NotificationOutbox._meta.db_table)} "
+            "(staff_id, kind, payload, created_at, attempts) "
+            f"SELECT eligible.staff_id, %s, %s, %s, 0 FROM ({sql}) eligible",
+            [NotificationOutbox.Kind.NEW_SHIFT, dumps(payload).decode(), timezone.now(), *params],
+        )
+        return cursor.rowcount
+
+
+def queue_notifications(jobs):
+    """
+    Queues NEW_SHIFT notifications for ``jobs``, to be sent as one batch; call
+    it in the transaction creating them.
+    """
+    PendingShiftNotification.objects.create(job_ids=[job.id for job in jobs])
+
+
+def _notify_batch(job_ids):
+    # Postings deleted since they were queued are skipped.
+    jobs = list(JobPosting.objects.filter(id__in=job_ids).order_by("id"))
+    if len(job_ids) == 1:
+        return {job.id: notify_eligible_staff(job) for job in jobs}
+    required_skills = defaultdict(list)
+    for job_id, skill_id, minimum in JobRequiredSkill.objects.filter(job_id__in=job_ids).values_list(
+        "job_id", "skill_id", "minimum_proficiency"
+    ):
+        required_skills[job_id].append((skill_id, minimum))
+    hospital_id = jobs[0].hospital_id if jobs else None
+    return notify_eligible_staff_many(hospital_id, jobs, required_skills)
+
+
+def process_queued_notifications(batch_size):
+    """
+    Notifies eligible staff of up to ``batch_size`` queued batches of postings
+    and removes them from the queue. Returns ``{job_id: eligible staff}`` for
+    the postings handled.
+    """
+    notified = {}
+    with transaction.atomic():
+        # skip_locked lets several workers drain the queue side by side.
+        pending = list(
+            PendingShiftNotification.objects.order_by("id").select_for_update(skip_locked=True)[:batch_size]
+        )
+        for entry in pending:
+            notified.update(dict.fromkeys(entry.job_ids, 0))
+            notified.update(_notify_batch(entry.job_ids))
+        PendingShiftNotification.objects.filter(id__in=[entry.id for entry in pending]).delete()
+    return notified
+
+
+def notify_eligible_staff_many(hospital_id, jobs, required_skills):
+    """
+    Notifies staff of many new jobs of one hospital in one statement: a single
+    NEW_SHIFT row per eligible staff member, listing the jobs they are eligible
+    for as ``job_ids``. ``required_skills`` maps job id to
+    ``(skill_id, minimum_proficiency)`` pairs. Returns ``{job_id: eligible staff}``
+    for jobs with any.
+    """
+    if not jobs:
+        return {}
+    key_sets, job_params = {}, []
+    for job in jobs:
+        keys = tuple(job_keys(job, required_skills.get(job.id, [])))
+        job_params += [job.id, key_sets.setdefault(keys, len(key_sets)), job.shift_start, job.shift_end]
+    quote = connection.ops.quote_name
+    sql = NOTIFY_MANY_SQL.format(
+        outbox=quote(NotificationOutbox._meta.db_table),
+        profiles=quote(StaffMatchProfile._meta.db_table),
+        exceptions=quote(AvailabilityException._meta.db_table),
+        key_sets=", ".join(["(%s::int, %s::varchar(32)[])"] * len(key_sets)),
+        jobs=", ".join(["(%s::bigint, %s::int, %s::timestamptz, %s::timestamptz)"] * len(jobs)),
+    )
+    key_set_params = [param for keys, index in key_sets.items() for param in (index, list(keys))]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql,
+            [*key_set_params, *job_params, NotificationOutbox.Kind.NEW_SHIFT, hospital_id, timezone.now()],
+        )
+        return dict(cursor.fetchall())
+
+
+def staff_match_changed(sender, instance, **kwargs):
+    staff_id = instance.pk if isinstance(instance, StaffProfile) else instance.staff_id
+    transaction.on_commit(lambda: reindex_staff([staff_id]), robust=True)
@@ -0,0 +1,129 @@
+"""
+Per-process cache of professions, skills and departments.
+
+These tables change rarely but are read on nearly every request, so each process
+keeps them in memory. The snapshot is tagged with ``ReferenceDataVersion`` and is
+reloaded when that counter moves. Writes in this process invalidate it
+immediately through ``post_save``/``post_delete``. Writes elsewhere are picked up
+within ``REFERENCE_DATA_CHECK_INTERVAL`` seconds, the most a lookup waits
+before checking the counter again. A lookup that misses checks the counter
+right away, so rows created in another process resolve on first use.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import transaction
+
+from staff.models import Profession, ReferenceDataVersion, Skill
+
+
+@dataclass
+class _Snapshot:
+    version: int
+    checked_at: float
+    professions: dict = field(default_factory=dict)
+    profession_ids: dict = field(default_factory=dict)
+    skills: dict = field(default_factory=dict)
+    skill_ids: dict = field(default_factory=dict)
+    departments: dict = field(default_factory=dict)
+    hospital_departments: dict = field(default_factory=dict)
+
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def _check_interval():
+    return float(getattr(settings, "REFERENCE_DATA_CHECK_INTERVAL", 5))
+
+
+def _load(version):
+    from hospital.models import Department
+
+    snapshot = _Snapshot(version=version, checked_at=time.monotonic())
+    for profession_id, name in Profession.objects.values_list("id", "name"):
+        snapshot.professions[profession_id] = name
+        snapshot.profession_ids[name.lower()] = profession_id
+    for skill_id, name in Skill.objects.values_list("id", "name"):
+        snapshot.skills[skill_id] = name
+        snapshot.skill_ids[name.lower()] = skill_id
+    for department_id, hospital_id, name in Department.objects.order_by("name", "id").values_list(
+        "id", "hospital_id", "name"
+    ):
+        snapshot.departments[department_id] = name
+        snapshot.hospital_departments.setdefault(hospital_id, []).append(
+            {"id": department_id, "name": name}
+        )
+    return snapshot
+
+
+def _current(recheck=False):
+    global _snapshot
+    snapshot = _snapshot
+    now = time.monotonic()
+    if not recheck and snapshot is not None and now - snapshot.checked_at < _check_interval():
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshot
+        if not recheck and snapshot is not None and now - snapshot.checked_at < _check_interval():
+            return snapshot
+        version = ReferenceDataVersion.current()
+        if snapshot is not None and snapshot.version == version:
+            snapshot.checked_at = now
+        else:
+            snapshot = _load(version)
+        _snapshot = snapshot
+        return snapshot
+
+
+def invalidate():
+    global _snapshot
+    _snapshot = None
+
+
+def _lookup(table, key):
+    """``table`` of the snapshot at ``key``, rechecking the version once on a miss."""
+    value = getattr(_current(), table).get(key)
+    if value is None:
+        value = getattr(_current(recheck=True), table).get(key)
+    return value
+
+
+def profession_name(profession_id):
+    return _lookup("professions", profession_id)
+
+
+def profession_id(name):
+    """Case-insensitive lookup; None if no profession has this name."""
+    return _lookup("profession_ids", str(name).strip().lower())
+
+
+def skill_name(skill_id):
+    return _lookup("skills", skill_id)
+
+
+def skill_id(name):
+    """Case-insensitive lookup; None if no skill has this name."""
+    return _lookup("skill_ids", str(name).strip().lower())
+
+
+def department_name(department_id):
+    return _lookup("departments", department_id)
+
+
+def hospital_departments(hospital_id):
+    """The hospital's departments as ``{"id", "name"}`` dicts, sorted by name."""
+    return [dict(row) for row in _lookup("hospital_departments", int(hospital_id)) or []]
+
+
+def reference_data_changed(sender, **kwargs):
+    """``post_save``/``post_delete`` receiver for the cached models."""
+    ReferenceDataVersion.bump()
+    invalidate()
+    # Another thread may reload before this transaction commits and cache the
+    # old rows under the new version; drop that snapshot as well.
+    transaction.on_commit(invalidate)
@@ -1,15 +1,29 @@
 import json
-from datetime import time, timedelta
+from datetime import datetime, time, timedelta
 from uuid import uuid4
 from unittest.mock import patch
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.test import Client, TestCase
 from django.urls import reverse
+from io import StringIO
 from django.utils import timezone
 
 from hospital.models import Department, Hospital, JobApplication, JobPosting, ShiftAssignment
-from staff.models import AppUser, AvailabilitySlot, Profession, StaffProfile
+from staff.models import (
+    AppUser,
+    AvailabilitySlot,
+    JobFeedRefresh,
+    Profession,
+    ReferenceDataVersion,
+    Skill,
+    StaffJobFeedEntry,
+    StaffProfile,
+    StaffSkill,
+)
+from staff.services import reference_data
 
 
 class AvailabilitySlotTests(TestCase):
@@ -35,6 +49,67 @@ class AvailabilitySlotTests(TestCase):
             invalid_slot.full_clean()
 
 
+class ReferenceDataCacheTests(TestCase):
+    def setUp(self):
+        reference_data.invalidate()
+        owner = AppUser.objects.create(
+            id=uuid4(),
+            full_name="Reference Owner",
+            email="reference-owner@example.com",
+            role=AppUser.Role.HOSPITAL,
+        )
+        self.hospital = Hospital.objects.create(owner_user=owner, name="Reference Hospital")
+        self.department = Department.objects.create(hospital=self.hospital, name="Oncology")
+        self.skill = Skill.objects.create(name="Phlebotomy")
+
+    def tearDown(self):
+        # The snapshot is process-wide and would outlive this test's rollback.
+        reference_data.invalidate()
+
+    def test_lookups_are_served_from_memory_once_loaded(self):
+        nurse_id = reference_data.profession_id("registered nurse")
+        with self.assertNumQueries(0):
+            self.assertEqual(reference_data.profession_name(nurse_id), "Registered Nurse")
+            self.assertEqual(reference_data.skill_id("PHLEBOTOMY"), self.skill.id)
+            self.assertEqual(reference_data.skill_name(self.skill.id), "Phlebotomy")
+            self.assertEqual(reference_data.department_name(self.department.id), "Oncology")
+            self.assertEqual(
+                reference_data.hospital_departments(self.hospital.id),
+                [{"id": self.department.id, "name": "Oncology"}],
+            )
+
+    def test_writes_bump_version_and_invalidate(self):
+        reference_data.profession_id("surgeon")
+        version = ReferenceDataVersion.current()
+
+        Department.objects.create(hospital=self.hospital, name="Cardiology")
+
+        self.assertEqual(ReferenceDataVersion.current(), version + 1)
+        names = [row["name"] for row in reference_data.hospital_departments(self.hospital.id)]
+        self.assertEqual(names, ["Cardiology", "Oncology"])
+
+    def test_reloads_when_another_process_bumps_version(self):
+        reference_data.skill_id("phlebotomy")
+        Skill.objects.filter(pk=self.skill.pk).update(name="Venipuncture")
+        ReferenceDataVersion.objects.update(version=ReferenceDataVersion.current() + 10)
+
+        with self.settings(REFERENCE_DATA_CHECK_INTERVAL=0):
+            self.assertEqual(reference_data.skill_name(self.skill.id), "Venipuncture")
+
+    def test_miss_rechecks_version_before_the_interval(self):
+        reference_data.hospital_departments(self.hospital.id)
+        # Rows written by another process: no signals here, only its version bump.
+        [surgeon] = Profession.objects.bulk_create([Profession(name="Orthopedic Surgeon")])
+        [ward] = Department.objects.bulk_create([Department(hospital=self.hospital, name="Ward")])
+        ReferenceDataVersion.objects.update(version=ReferenceDataVersion.current() + 1)
+
+        with self.settings(REFERENCE_DATA_CHECK_INTERVAL=3600):
+            self.assertEqual(reference_data.profession_name(surgeon.id), "Orthopedic Surgeon")
+            self.assertEqual(reference_data.department_name(ward.id), "Ward")
+            with self.assertNumQueries(0):
+                self.assertEqual(reference_data.profession_id("orthopedic surgeon"), surgeon.id)
+
+
 class StaffRecommendationApiTests(TestCase):
     def setUp(self):
         self.client = Client()
@@ -61,8 +136,9 @@ class StaffRecommendationApiTests(TestCase):
 
         hospital = Hospital.objects.create(owner_user=self.owner, name="City General")
         department = Department.objects.create(hospital=hospital, name="ICU")
+        self.hospital, self.department = hospital, department
 
-        JobPosting.objects.create(
+        self.nurse_job = JobPosting.objects.create(
             hospital=hospital,
             department=department,
             profession=self.nurse,
@@ -84,11 +160,148 @@ class StaffRecommendationApiTests(TestCase):
         self.assertIn("results", payload)
         self.assertGreaterEqual(len(payload["results"]), 1)
 
+    def _job(self, profession, starts_in):
+        start = timezone.now() + starts_in
+        return JobPosting.objects.create(
+            hospital=self.hospital,
+            department=self.department,
+            profession=profession,
+            required_staff_count=1,
+            shift_start=start,
+            shift_end=start + timedelta(hours=8),
+            hourly_rate=60,
+            currency="USD",
+        )
+
+    def test_candidates_prefer_profession_and_skip_started_shifts(self):
+        porter = Profession.objects.create(name="Porter")
+        other_job = self._job(porter, timedelta(hours=2))
+        self._job(self.nurse, -timedelta(hours=1))
+        url = reverse("staff-recommendations")
+
+        only_nurse = self.client.get(url, {"staff_id": self.staff_profile.id, "limit": 1})
+        self.assertEqual([row["job_id"] for row in only_nurse.json()["results"]], [self.nurse_job.id])
+
+        filled = self.client.get(url, {"staff_id": self.staff_profile.id, "limit": 6})
+        self.assertEqual(
+            [row["job_id"] for row in filled.json()["results"]], [self.nurse_job.id, other_job.id]
+        )
+
+    def test_dashboard_is_cached_until_staff_writes(self):
+        cache.clear()
+        week_start = timezone.localdate() - timedelta(days=timezone.localdate().weekday())
+        tuesday = timezone.make_aware(datetime.combine(week_start + timedelta(days=1), time(9, 0)))
+        job = JobPosting.objects.create(
+            hospital=self.hospital,
+            department=self.department,
+            profession=self.nurse,
+            required_staff_count=1,
+            shift_start=tuesday,
+            shift_end=tuesday + timedelta(hours=7, minutes=30),
+            hourly_rate=60,
+            currency="USD",
+        )
+        ShiftAssignment.objects.create(job=job, staff=self.staff_profile)
+        url = reverse("staff-dashboard-summary")
+        params = {"staff_id": self.staff_profile.id}
+
+        with self.assertNumQueries(2):
+            cold = self.client.get(url, params)
+        self.assertEqual(cold.json()["weekly_performance_hours"]["Tue"], 7.5)
+        self.assertEqual(cold.json()["pending_applications"], 0)
+
+        with self.assertNumQueries(0):
+            warm = self.client.get(url, params)
+            not_modified = self.client.get(url, params, HTTP_IF_NONE_MATCH=cold["ETag"])
+        self.assertEqual(warm.json(), cold.json())
+        self.assertEqual(not_modified.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            JobApplication.objects.create(job=self.nurse_job, staff=self.staff_profile)
+        updated = self.client.get(url, params)
+        self.assertEqual(updated.json()["pending_applications"], 1)
+        self.assertEqual(updated.json()["recent_activity"][0]["time"], "Just now")
+
+    def test_schedule_ics_streams_events_and_revalidates(self):
+        ShiftAssignment.objects.create(job=self.nurse_job, staff=self.staff_profile)
+        url = reverse("staff-schedule-ics")
+        params = {"staff_id": self.staff_profile.id}
+
+        response = self.client.get(url, params)
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        body = b"".join(response.streaming_content).decode()
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertIn("SUMMARY:Nurse - ICU\r\n", body)
+        self.assertIn("LOCATION:City General\r\n", body)
+        self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+    def test_job_feed_is_maintained_incrementally(self):
+        call_command("rebuild_job_feeds", "--workers", "1", stdout=StringIO())
+        feed = StaffJobFeedEntry.objects.filter(staff=self.staff_profile)
+        self.assertEqual(list(feed.values_list("job_id", flat=True)), [self.nurse_job.id])
+
+        # Job writes only queue a refresh; the command rescores them.
+        new_job = self._job(self.nurse, timedelta(days=2))
+        self.assertFalse(feed.filter(job=new_job).exists())
+        call_command("process_job_feed_refreshes", stdout=StringIO())
+        self.assertTrue(feed.filter(job=new_job).exists())
+        self.assertFalse(JobFeedRefresh.objects.exists())
+
+        start = new_job.shift_start
+        with self.captureOnCommitCallbacks(execute=True):
+            AvailabilitySlot.objects.create(
+                staff=self.staff_profile,
+                day_of_week=AvailabilitySlot.WeekDay.of(start),
+                start_time=time(0, 0),
+                end_time=time(23, 59),
+            )
+        self.assertEqual(feed.get(job=new_job).tags[1], {"key": "availability_fit", "value": 100})
+
+        # Scores ignore skills, so skill edits do not rebuild the feed.
+        with patch("staff.services.job_feed.refresh_staff_feeds") as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                StaffSkill.objects.create(staff=self.staff_profile, skill=Skill.objects.create(name="Triage"))
+        refresh.assert_not_called()
+
+        new_job.status = JobPosting.Status.CLOSED
+        new_job.save()
+        call_command("process_job_feed_refreshes", stdout=StringIO())
+        self.assertFalse(feed.filter(job=new_job).exists())
+
+        url = reverse("staff-recommendations")
+        params = {"staff_id": self.staff_profile.id, "limit": 1}
+        self.client.get(url, params)
+        # Staff profile and the stored feed; reference data is served from memory.
+        with self.assertNumQueries(2):
+            response = self.client.get(url, params)
+        self.assertEqual([row["job_id"] for row in response.json()["results"]], [self.nurse_job.id])
+
+        # Jobs that skipped the refresh queue still top up a short feed.
+        start = timezone.now() + timedelta(days=3)
+        [unqueued] = JobPosting.objects.bulk_create(
+            [
+                JobPosting(
+                    hospital=self.hospital,
+                    department=self.department,
+                    profession=self.nurse,
+                    required_staff_count=1,
+                    shift_start=start,
+                    shift_end=start + timedelta(hours=8),
+                    hourly_rate=60,
+                )
+            ]
+        )
+        response = self.client.get(url, {"staff_id": self.staff_profile.id})
+        self.assertEqual(
+            [row["job_id"] for row in response.json()["results"]], [self.nurse_job.id, unqueued.id]
+        )
+
 
 class StaffAuthApiTests(TestCase):
     def setUp(self):
         self.client = Client()
-        self.profession = Profession.objects.create(name="Registered Nurse")
+        # Provisioned by the default professions data migration.
+        self.profession = Profession.objects.get(name="Registered Nurse")
         self.user = AppUser.objects.create(
             id=uuid4(),
             full_name="Login User",
@@ -194,3 +407,146 @@ class StaffApplicationApprovalApiTests(TestCase):
         application.refresh_from_db()
         self.assertEqual(application.status, JobApplication.Status.ACCEPTED)
         self.assertTrue(ShiftAssignment.objects.filter(job=self.job, staff=self.staff).exists())
+
+
+class StaffListPaginationApiTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        owner = AppUser.objects.create(
+            id=uuid4(),
+            full_name="Hospital Owner",
+            email="owner-pages@example.com",
+            role=AppUser.Role.HOSPITAL,
+        )
+        staff_user = AppUser.objects.create(
+            id=uuid4(),
+            full_name="Paged Staff",
+            email="paged-staff@example.com",
+            role=AppUser.Role.STAFF,
+        )
+        self.profession = Profession.objects.create(name="Nurse")
+        self.staff = StaffProfile.objects.create(user=staff_user, profession=self.profession)
+        self.hospitals = []
+        for index in range(3):
+            hospital = Hospital.objects.create(owner_user=owner, name=f"Paged Hospital {index}")
+            department = Department.objects.create(hospital=hospital, name="ICU")
+            job = JobPosting.objects.create(
+                hospital=hospital,
+                department=department,
+                profession=self.profession,
+                required_staff_count=1,
+                shift_start=timezone.now() + timedelta(days=1 + index),
+                shift_end=timezone.now() + timedelta(days=1 + index, hours=8),
+                hourly_rate=70,
+            )
+            JobApplication.objects.create(job=job, staff=self.staff)
+            self.hospitals.append(hospital)
+
+    def test_schedule_pages_through_pending_applications(self):
+        url = reverse("staff-schedule")
+        first = self.client.get(url, {"staff_id": self.staff.id, "page_size": 2}).json()
+        second = self.client.get(
+            url,
+            {"staff_id": self.staff.id, "page_size": 2, "cursor": first["next_cursor"]},
+        ).json()
+
+        def application_ids(payload):
+            return [
+                item["application_id"]
+                for group in payload["results"]
+                for item in group["pending_applications"]
+            ]
+
+        self.assertEqual(len(application_ids(first)), 2)
+        self.assertEqual(len(application_ids(second)), 1)
+        self.assertIsNone(second["next_cursor"])
+        self.assertFalse(set(application_ids(first)) & set(application_ids(second)))
+
+    def _bulk_assign(self, count):
+        department = Department.objects.get(hospital=self.hospitals[0])
+        start = timezone.now() + timedelta(hours=1)
+        jobs = JobPosting.objects.bulk_create(
+            [
+                JobPosting(
+                    hospital=self.hospitals[0],
+                    department=department,
+                    profession=self.profession,
+                    required_staff_count=1,
+                    shift_start=start + timedelta(minutes=index),
+                    shift_end=start + timedelta(minutes=index, hours=1),
+                    hourly_rate=70,
+                )
+                for index in range(count)
+            ]
+        )
+        ShiftAssignment.objects.bulk_create(
+            [
+                ShiftAssignment(
+                    job=job,
+                    staff=self.staff,
+                    shift_start_snapshot=job.shift_start,
+                    shift_end_snapshot=job.shift_end,
+                )
+                for job in jobs
+            ]
+        )
+
+    def _assert_schedule_query_budget(self, shifts, expected_rows):
+        self._bulk_assign(shifts)
+        url = reverse("staff-schedule")
+        # Validator fingerprint, staff profile, confirmed page, pending page.
+        with self.assertNumQueries(4):
+            payload = self.client.get(url, {"staff_id": self.staff.id, "page_size": 100}).json()
+        confirmed = [shift for group in payload["results"] for shift in group["confirmed_shifts"]]
+        self.assertEqual(len(confirmed), expected_rows)
+        self.assertEqual(confirmed[0]["role"], "Nurse")
+
+    def test_schedule_query_budget_with_one_shift(self):
+        self._assert_schedule_query_budget(1, 1)
+
+    def test_schedule_query_budget_with_a_thousand_shifts(self):
+        self._assert_schedule_query_budget(1000, 100)
+
+    def test_schedule_window_filters_by_shift_date(self):
+        url = reverse("staff-schedule")
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        payload = self.client.get(
+            url, {"staff_id": self.staff.id, "from": tomorrow.isoformat(), "to": tomorrow.isoformat()}
+        ).json()
+        pending = [item for group in payload["results"] for item in group["pending_applications"]]
+        self.assertEqual([item["name"] for item in pending], ["Paged Hospital 0"])
+
+        invalid = self.client.get(url, {"staff_id": self.staff.id, "from": "2026-02-10", "to": "2026-02-01"})
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_schedule_etag_is_per_page_and_tracks_withdrawals(self):
+        url = reverse("staff-schedule")
+        params = {"staff_id": self.staff.id, "page_size": 2}
+        first = self.client.get(url, params)
+        other_page = self.client.get(url, {**params, "page_size": 1})
+        self.assertNotEqual(first["ETag"], other_page["ETag"])
+        self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        JobApplication.objects.filter(staff=self.staff).first().delete()
+        self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 200)
+
+    def test_directory_search_pages_hospitals_and_rejects_forged_cursor(self):
+        url = reverse("staff-search-directory")
+        first = self.client.get(url, {"staff_id": self.staff.id, "page_size": 2}).json()
+        self.assertEqual(
+            [row["name"] for row in first["hospitals"]],
+            ["Paged Hospital 0", "Paged Hospital 1"],
+        )
+
+        second = self.client.get(
+            url,
+            {"staff_id": self.staff.id, "page_size": 2, "cursor": first["next_cursor"]},
+        ).json()
+        self.assertEqual([row["name"] for row in second["hospitals"]], ["Paged Hospital 2"])
+        self.assertEqual(first["counts"], second["counts"])
+        self.assertEqual(first["counts"]["hospitals"], 3)
+        self.assertEqual(len(second["departments"]), 1)
+        self.assertIsNone(second["next_cursor"])
+
+        forged = self.client.get(url, {"staff_id": self.staff.id, "cursor": "not-a-cursor"})
+        self.assertEqual(forged.status_code, 400)
@@ -8,6 +8,9 @@ urlpatterns = [
     path("dashboard/", views.dashboard_summary, name="staff-dashboard-summary"),
     path("search/directory/", views.search_directory, name="staff-search-directory"),
     path("schedule/", views.staff_schedule, name="staff-schedule"),
+    path("schedule.ics", views.schedule_ics, name="staff-schedule-ics"),
+    path("events/", views.staff_events, name="staff-events"),
+    path("archive/shifts/", views.archived_shifts, name="staff-archived-shifts"),
     path("recommendations/", views.staff_recommendations, name="staff-recommendations"),
     path("jobs/<int:job_id>/apply/", views.apply_for_job, name="apply-for-job"),
     path(
@@ -1,20 +1,31 @@
 import json
 import os
 from collections import defaultdict
-from datetime import time, timedelta
+from contextlib import nullcontext
+from datetime import datetime, time, timedelta
 from urllib import error as urlerror
 from urllib import request as urlrequest
 
-from django.db import IntegrityError, transaction
-from django.db.models import Avg, Count, Q
-from django.http import JsonResponse
-from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Exists, IntegerField, OuterRef, Subquery
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_POST
 
-from hospital.models import Department, Hospital, HospitalReview, JobApplication, JobPosting, ShiftAssignment
+from config.cache_versions import get_versions
+from config.conditional import Validators, conditional_get, fingerprint, minute_bucket
+from config.event_stream import event_stream_response, last_event_id, stream_events
+from config.exports import EXPORT_CHUNK_SIZE, parse_date_window, stream_ics
+from config.pagination import InvalidPageRequest, paginate, parse_page_size
+from config.responses import JsonResponse
+from config.search import RANKED_ORDERING, ranked_search, search_session
+from hospital.models import ChangeEvent, Department, Hospital, JobApplication, JobPosting, ShiftAssignment
 from staff.models import AppUser, AvailabilitySlot, Profession, StaffProfile
+from staff.services import job_feed, reference_data
 from staff.services.recommendation_ai import (
     enhance_recommendations_with_ai,
     ensure_unique_reason_messages,
@@ -143,82 +154,184 @@ def _format_relative_time(dt):
     return f"{days}d ago"
 
 
+def _staff_activity_validators(request):
+    staff_id = request.GET.get("staff_id")
+    if not staff_id:
+        return None
+    validators = fingerprint(
+        AppUser.objects.filter(staff_profile__id=staff_id),
+        JobApplication.objects.filter(staff_id=staff_id),
+        ShiftAssignment.objects.filter(staff_id=staff_id),
+    )
+    # Relative times ("5m ago") and the current week change without any writes.
+    validators.parts += (minute_bucket(),)
+    return validators
+
+
+DASHBOARD_WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+# Counts and this week's hours per local ISO weekday (1 = Monday) in one round trip.
+DASHBOARD_SUMMARY_SQL = """
+SELECT u.full_name, apps.pending, apps.accepted, asg.completed, week.hours
+FROM staff_profiles s
+JOIN app_users u ON u.id = s.user_id
+CROSS JOIN LATERAL (
+    SELECT COUNT(*) FILTER (WHERE status = ANY(%(pending_statuses)s)) AS pending,
+           COUNT(*) FILTER (WHERE status = %(accepted_status)s) AS accepted
+    FROM job_applications WHERE staff_id = s.id
+) apps
+CROSS JOIN LATERAL (
+    SELECT COUNT(*) AS completed
+    FROM shift_assignments WHERE staff_id = s.id AND status = %(completed_status)s
+) asg
+CROSS JOIN LATERAL (
+    SELECT COALESCE(json_object_agg(day, hours), '{}') AS hours
+    FROM (
+        SELECT EXTRACT(ISODOW FROM shift_start_snapshot AT TIME ZONE %(tz)s)::int AS day,
+               SUM(EXTRACT(EPOCH FROM shift_end_snapshot - shift_start_snapshot)) / 3600 AS hours
+        FROM shift_assignments
+        WHERE staff_id = s.id
+          AND status = ANY(%(workday_statuses)s)
+          AND shift_start_snapshot >= %(week_start)s
+          AND shift_start_snapshot < %(week_end)s
+        GROUP BY 1
+    ) by_day
+) week
+WHERE s.id = %(staff_id)s
+"""
+
+
+def _dashboard_validators(request):
+    staff_id = request.GET.get("staff_id")
+    if not staff_id:
+        return None
+    # Versions live in the cache, so a revalidation costs no database queries.
+    (version,) = get_versions(StaffProfile.activity_cache_version(int(staff_id)))
+    return Validators(parts=(version, minute_bucket()))
+
+
+def _build_dashboard(staff_id, week_start):
+    """The cacheable dashboard payload; relative times are formatted per response."""
+    week_end = week_start + timedelta(days=7)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            DASHBOARD_SUMMARY_SQL,
+            {
+                "staff_id": staff_id,
+                "pending_statuses": list(JobApplication.ACTIVE_STATUSES),
+                "accepted_status": JobApplication.Status.ACCEPTED,
+                "completed_status": ShiftAssignment.Status.COMPLETED,
+                "workday_statuses": list(ShiftAssignment.WORKDAY_STATUSES),
+                "tz": timezone.get_current_timezone_name(),
+                # Raw column against datetime bounds keeps the (staff, start) index usable.
+                "week_start": timezone.make_aware(datetime.combine(week_start, time.min)),
+                "week_end": timezone.make_aware(datetime.combine(week_end, time.min)),
+            },
+        )
+        row = cursor.fetchone()
+    if row is None:
+        raise Http404("No StaffProfile matches the given query.")
+
+    full_name, pending_count, accepted_count, completed_count, hours = row
+    recent_activity = JobApplication.objects.filter(staff_id=staff_id).values(
+        "id", "status", "updated_at", "job__hospital__name", "job__department__name"
+    ).order_by("-updated_at")[:10]
+
+    return {
+        "greeting_name": full_name,
+        "pending_applications": pending_count,
+        "accepted_shifts": accepted_count,
+        "completed_shifts": completed_count,
+        "weekly_performance_hours": {
+            name: round(float(hours.get(str(index), 0)), 1)
+            for index, name in enumerate(DASHBOARD_WEEKDAYS, start=1)
+        },
+        "recent_activity": [
+            {
+                "application_id": app["id"],
+                "title": app["status"].replace("_", " ").title(),
+                "hospital": app["job__hospital__name"],
+                "department": app["job__department__name"],
+                "status": app["status"],
+                "updated_at": app["updated_at"],
+            }
+            for app in recent_activity
+        ],
+    }
+
+
 @require_GET
+@conditional_get(_dashboard_validators)
 def dashboard_summary(request):
     staff_id = request.GET.get("staff_id")
     if not staff_id:
         return _json_error("staff_id query param is required")
-
-    staff = get_object_or_404(StaffProfile.objects.select_related("user"), id=staff_id)
-
-    pending_count = staff.job_applications.filter(
-        status__in=[JobApplication.Status.APPLIED, JobApplication.Status.SHORTLISTED]
-    ).count()
-    accepted_count = staff.job_applications.filter(status=JobApplication.Status.ACCEPTED).count()
-    completed_count = staff.shift_assignments.filter(status=ShiftAssignment.Status.COMPLETED).count()
+    try:
+        staff_id = int(staff_id)
+    except ValueError:
+        return _json_error("staff_id must be an integer")
 
     week_start = timezone.localdate() - timedelta(days=timezone.localdate().weekday())
-    week_end = week_start + timedelta(days=7)
-    week_assignments = staff.shift_assignments.filter(
-        status__in=[ShiftAssignment.Status.ASSIGNED, ShiftAssignment.Status.COMPLETED],
-        shift_start_snapshot__date__gte=week_start,
-        shift_start_snapshot__date__lt=week_end,
-    )
+    (version,) = get_versions(StaffProfile.activity_cache_version(staff_id))
+    cache_key = f"staff-dashboard:{staff_id}:{week_start}:{version}"
+    payload = cache.get(cache_key)
+    if payload is None:
+        payload = _build_dashboard(staff_id, week_start)
+        # Hospital and department renames do not bump the staff version; the
+        # timeout bounds how long those stay stale.
+        cache.set(cache_key, payload, timeout=settings.STAFF_DASHBOARD_CACHE_SECONDS)
 
-    daily_hours = {day: 0 for day in ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]}
-    for item in week_assignments:
-        day_key = item.shift_start_snapshot.strftime("%a")
-        duration_hours = (item.shift_end_snapshot - item.shift_start_snapshot).total_seconds() / 3600
-        if day_key in daily_hours:
-            daily_hours[day_key] += round(duration_hours, 1)
+    recent_activity = []
+    for item in payload["recent_activity"]:
+        item = dict(item)
+        item["time"] = _format_relative_time(item.pop("updated_at"))
+        recent_activity.append(item)
+    return JsonResponse({**payload, "recent_activity": recent_activity})
 
-    recent_activity = (
-        staff.job_applications.select_related("job__hospital", "job__department")
-        .order_by("-updated_at")[:10]
-    )
 
-    return JsonResponse(
-        {
-            "greeting_name": staff.user.full_name,
-            "pending_applications": pending_count,
-            "accepted_shifts": accepted_count,
-            "completed_shifts": completed_count,
-            "weekly_performance_hours": daily_hours,
-            "recent_activity": [
-                {
-                    "application_id": app.id,
-                    "title": app.status.replace("_", " ").title(),
-                    "hospital": app.job.hospital.name,
-                    "department": app.job.department.name,
-                    "status": app.status,
-                    "time": _format_relative_time(app.updated_at),
-                }
-                for app in recent_activity
-            ],
-        }
-    )
+SCHEDULE_DEFAULT_WINDOW_DAYS = 28
 
 
 @require_GET
+@conditional_get(_staff_activity_validators)
 def staff_schedule(request):
     staff_id = request.GET.get("staff_id")
     if not staff_id:
         return _json_error("staff_id query param is required")
+    try:
+        window_start, window_end = parse_date_window(
+            request.GET, timezone.localdate(), SCHEDULE_DEFAULT_WINDOW_DAYS
+        )
+    except ValueError as exc:
+        return _json_error(str(exc))
 
     staff = get_object_or_404(StaffProfile.objects.select_related("user"), id=staff_id)
 
-    pending_qs = (
-        staff.job_applications.filter(
-            status__in=[JobApplication.Status.APPLIED, JobApplication.Status.SHORTLISTED]
+    # Every relation the payload reads is joined here, so a page costs the same
+    # three queries whether it holds one shift or a hundred.
+    pending_qs = staff.job_applications.filter(
+        status__in=[JobApplication.Status.APPLIED, JobApplication.Status.SHORTLISTED],
+        job__shift_start__gte=window_start,
+        job__shift_start__lt=window_end,
+    ).select_related("job__department", "job__hospital")
+    confirmed_qs = staff.shift_assignments.filter(
+        status=ShiftAssignment.Status.ASSIGNED,
+        shift_start_snapshot__gte=window_start,
+        shift_start_snapshot__lt=window_end,
+    ).select_related("job__department", "job__hospital", "job__profession")
+
+    try:
+        pages, next_cursor = paginate(
+            {
+                "confirmed": (confirmed_qs, ("job__department__name", "shift_start_snapshot", "id")),
+                "pending": (pending_qs, ("job__department__name", "job__shift_start", "id")),
+            },
+            cursor=request.GET.get("cursor"),
+            page_size=parse_page_size(request.GET.get("page_size")),
+            scope=f"staff.schedule:{staff.id}:{window_start.date()}:{window_end.date()}",
         )
-        .select_related("job__department", "job__hospital")
-        .order_by("-updated_at")
-    )
-    confirmed_qs = (
-        staff.shift_assignments.filter(status=ShiftAssignment.Status.ASSIGNED)
-        .select_related("job__department", "job__hospital")
-        .order_by("-assigned_at")
-    )
+    except InvalidPageRequest as exc:
+        return _json_error(str(exc))
 
     groups = defaultdict(
         lambda: {
@@ -230,11 +343,13 @@ def staff_schedule(request):
         }
     )
 
-    for assignment in confirmed_qs:
+    latest_activity = {}
+    for assignment in pages["confirmed"]:
         dept_name = assignment.job.department.name
         group = groups[dept_name]
         group["title"] = dept_name
-        group["last_activity"] = _format_relative_time(assignment.assigned_at)
+        if dept_name not in latest_activity or assignment.assigned_at > latest_activity[dept_name]:
+            latest_activity[dept_name] = assignment.assigned_at
         group["confirmed_shifts"].append(
             {
                 "assignment_id": assignment.id,
@@ -243,17 +358,17 @@ def staff_schedule(request):
                 "status": assignment.status,
                 "time": f"{assignment.shift_start_snapshot.strftime('%I:%M %p')} - {assignment.shift_end_snapshot.strftime('%I:%M %p')}",
                 "date": assignment.shift_start_snapshot.strftime("%b %d, %Y"),
-                "pay": str(assignment.job.hourly_rate),
+                "pay": assignment.job.hourly_rate,
                 "currency": assignment.job.currency,
             }
         )
 
-    for app in pending_qs:
+    for app in pages["pending"]:
         dept_name = app.job.department.name
         group = groups[dept_name]
         group["title"] = dept_name
-        if not group["last_activity"]:
-            group["last_activity"] = _format_relative_time(app.updated_at)
+        # Confirmed shifts take precedence, as before.
+        latest_activity.setdefault(dept_name, app.updated_at)
         group["pending_applications"].append(
             {
                 "application_id": app.id,
@@ -265,97 +380,180 @@ def staff_schedule(request):
             }
         )
 
+    # Both streams arrive sorted by department; merge their groups in that order.
     results = []
-    for idx, (_, group) in enumerate(groups.items(), start=1):
+    for idx, (dept_name, group) in enumerate(sorted(groups.items()), start=1):
         group["id"] = idx
+        group["last_activity"] = _format_relative_time(latest_activity[dept_name])
         group["total_active"] = len(group["confirmed_shifts"]) + len(group["pending_applications"])
         results.append(group)
 
-    return JsonResponse({"results": results})
+    return JsonResponse({"results": results, "next_cursor": next_cursor})
 
 
-@require_GET
-def staff_recommendations(request):
+ICS_PAST_DAYS = 30
+ICS_WINDOW_DAYS = 180
+ICS_EVENT_STATUS = {
+    ShiftAssignment.Status.ASSIGNED: "CONFIRMED",
+    ShiftAssignment.Status.COMPLETED: "CONFIRMED",
+    ShiftAssignment.Status.CANCELLED: "CANCELLED",
+}
+
+
+def _ics_window(request):
+    return parse_date_window(
+        request.GET, timezone.localdate() - timedelta(days=ICS_PAST_DAYS), ICS_WINDOW_DAYS
+    )
+
+
+def _schedule_ics_validators(request):
     staff_id = request.GET.get("staff_id")
-    department_filter = request.GET.get("department", "All")
-    limit = int(request.GET.get("limit", 6))
+    if not staff_id:
+        return None
+    window_start, window_end = _ics_window(request)
+    validators = fingerprint(
+        ShiftAssignment.objects.filter(
+            staff_id=staff_id,
+            shift_start_snapshot__gte=window_start,
+            shift_start_snapshot__lt=window_end,
+        )
+    )
+    # The default window moves with the date even when no shift changes.
+    validators.parts += (window_start, window_end)
+    return validators
 
+
+@require_GET
+@conditional_get(_schedule_ics_validators)
+def schedule_ics(request):
+    staff_id = request.GET.get("staff_id")
     if not staff_id:
         return _json_error("staff_id query param is required")
+    try:
+        window_start, window_end = _ics_window(request)
+    except ValueError as exc:
+        return _json_error(str(exc))
 
-    staff = get_object_or_404(StaffProfile.objects.select_related("profession"), id=staff_id)
+    staff = get_object_or_404(StaffProfile.objects.select_related("user"), id=staff_id)
+    assignments = (
+        ShiftAssignment.objects.filter(
+            staff=staff,
+            shift_start_snapshot__gte=window_start,
+            shift_start_snapshot__lt=window_end,
+        )
+        .order_by("shift_start_snapshot", "id")
+        .values_list(
+            "id",
+            "status",
+            "shift_start_snapshot",
+            "shift_end_snapshot",
+            "updated_at",
+            "job__hospital__name",
+            "job__department__name",
+            "job__profession__name",
+        )
+    )
+    host = request.get_host()
+
+    def events():
+        for row in assignments.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            assignment_id, status, start, end, updated, hospital, department, profession = row
+            yield {
+                "uid": f"shift-assignment-{assignment_id}@{host}",
+                "start": start,
+                "end": end,
+                "updated": updated,
+                "summary": f"{profession} - {department}",
+                "location": hospital,
+                "status": ICS_EVENT_STATUS.get(status),
+            }
 
-    jobs = JobPosting.objects.filter(status=JobPosting.Status.OPEN).select_related(
-        "hospital", "department", "profession"
+    response = StreamingHttpResponse(
+        stream_ics(events(), f"{staff.user.full_name} shifts"),
+        content_type="text/calendar; charset=utf-8",
     )
-    if department_filter != "All":
-        jobs = jobs.filter(department__name__iexact=department_filter)
+    response["Content-Disposition"] = 'attachment; filename="schedule.ics"'
+    return response
 
-    review_map = {
-        row["hospital_id"]: float(row["avg_rating"])
-        for row in HospitalReview.objects.values("hospital_id").annotate(avg_rating=Avg("rating"))
-    }
 
-    availability_map = defaultdict(list)
-    for slot in AvailabilitySlot.objects.filter(staff=staff, is_active=True):
-        availability_map[slot.day_of_week].append((slot.start_time, slot.end_time))
+@require_GET
+async def staff_events(request):
+    staff_id = request.GET.get("staff_id")
+    if not staff_id:
+        return _json_error("staff_id query param is required")
+    try:
+        staff_id = int(staff_id)
+        after_id = last_event_id(request)
+    except ValueError:
+        return _json_error("staff_id and Last-Event-ID must be integers")
 
-    history_counts = {
-        row["job__hospital_id"]: row["count"]
-        for row in staff.shift_assignments.values("job__hospital_id").annotate(count=Count("id"))
-    }
+    staff = await aget_object_or_404(StaffProfile, id=staff_id)
+    events = ChangeEvent.objects.filter(staff_id=staff.id)
+    return event_stream_response(stream_events(events, ChangeEvent.as_event, after_id))
 
-    # Recommendation scoring is intentionally explainable for hospital/staff trust:
-    # - profession_fit (40%): strong signal for qualification match
-    # - availability_fit (25%): ensures recommendation is realistically schedulable
-    # - hospital_history (20%): rewards continuity where staff has proven history
-    # - hospital_rating (15%): uses peer feedback quality signal
-    # This weighted decomposition allows both UI and audit logs to show why a shift ranks high.
-    scored = []
-    for job in jobs:
-        profession_fit = 100 if job.profession_id == staff.profession_id else 35
-
-        day = job.shift_start.weekday()
-        available_windows = availability_map.get(day, [])
-        availability_fit = 30
-        for start_time, end_time in available_windows:
-            if start_time <= job.shift_start.time() and end_time >= job.shift_end.time():
-                availability_fit = 100
-                break
-
-        history = min(history_counts.get(job.hospital_id, 0) * 15, 100)
-        rating = min((review_map.get(job.hospital_id, 3.5) / 5.0) * 100, 100)
-
-        match_score = round(
-            (profession_fit * 0.40)
-            + (availability_fit * 0.25)
-            + (history * 0.20)
-            + (rating * 0.15)
-        )
 
-        scored.append(
-            {
-                "job_id": job.id,
-                "name": job.hospital.name,
-                "role": f"{job.profession.name} - {job.department.name}",
-                "department": job.department.name,
-                "match": match_score,
-                "hourly_rate": str(job.hourly_rate),
-                "currency": job.currency,
-                "tags": [
-                    {"key": "profession_fit", "value": profession_fit},
-                    {"key": "availability_fit", "value": availability_fit},
-                    {"key": "hospital_history", "value": history},
-                    {"key": "hospital_rating", "value": round(rating, 1)},
-                ],
-            }
+@require_GET
+def archived_shifts(request):
+    staff_id = request.GET.get("staff_id")
+    if not staff_id:
+        return _json_error("staff_id query param is required")
+
+    staff = get_object_or_404(StaffProfile, id=staff_id)
+    assignments = staff.archived_shift_assignments.select_related("job__hospital")
+    try:
+        pages, next_cursor = paginate(
+            {"shifts": (assignments, ("-shift_start_snapshot", "-id"))},
+            cursor=request.GET.get("cursor"),
+            page_size=parse_page_size(request.GET.get("page_size")),
+            scope=f"staff.archived_shifts:{staff.id}",
         )
+    except InvalidPageRequest as exc:
+        return _json_error(str(exc))
 
-    scored.sort(key=lambda item: item["match"], reverse=True)
-    top_results = scored[:limit]
+    results = [
+        {
+            "assignment_id": assignment.id,
+            "job_id": assignment.job_id,
+            "name": assignment.job.hospital.name,
+            "role": assignment.job.profession_name,
+            "department": assignment.job.department_name,
+            "status": assignment.status,
+            "shift_start": assignment.shift_start_snapshot,
+            "shift_end": assignment.shift_end_snapshot,
+            "pay": assignment.job.hourly_rate,
+            "currency": assignment.job.currency,
+            "attendance": assignment.attendance,
+        }
+        for assignment in pages["shifts"]
+    ]
+    return JsonResponse({"results": results, "next_cursor": next_cursor})
+
+
+@require_GET
+def staff_recommendations(request):
+    staff_id = request.GET.get("staff_id")
+    department_filter = request.GET.get("department", "All")
+    limit = int(request.GET.get("limit", 6))
+
+    if not staff_id:
+        return _json_error("staff_id query param is required")
+
+    staff = get_object_or_404(StaffProfile, id=staff_id)
+
+    if department_filter == "All":
+        ranked = job_feed.read_feed(staff, limit)
+        if len(ranked) < limit and not staff.job_feed.exists():
+            # First visit before any feed was built; store it for the next ones.
+            job_feed.refresh_staff_feeds([staff.id])
+            ranked = job_feed.read_feed(staff, limit)
+    else:
+        # Department views are narrower than the stored top-N; rank them live.
+        ranked = job_feed.rank_jobs(staff, job_feed.candidate_jobs(staff, department_filter, limit))
+
+    top_results = [job_feed.recommendation_item(job, match, tags) for job, match, tags in ranked[:limit]]
     ai_context = {
         "staff_id": staff.id,
-        "staff_profession": staff.profession.name,
+        "staff_profession": reference_data.profession_name(staff.profession_id),
         "department_filter": department_filter,
         "limit": limit,
     }
@@ -436,37 +634,60 @@ def search_directory(request):
     get_object_or_404(StaffProfile.objects.select_related("user"), id=staff_id)
     query = str(request.GET.get("q", "")).strip()
 
-    departments_qs = Department.objects.filter(job_postings__status=JobPosting.Status.OPEN)
-    hospitals_qs = Hospital.objects.filter(job_postings__status=JobPosting.Status.OPEN)
+    open_jobs = JobPosting.objects.filter(status=JobPosting.Status.OPEN)
+    departments_qs = Department.objects.filter(Exists(open_jobs.filter(department=OuterRef("pk"))))
+    hospitals_qs = Hospital.objects.annotate(
+        open_shift_count=Subquery(
+            open_jobs.filter(hospital=OuterRef("pk"))
+            .values("hospital")
+            .annotate(total=Count("id"))
+            .values("total"),
+            output_field=IntegerField(),
+        )
+    ).filter(open_shift_count__gt=0)
+    department_fields = ["id", "name", "hospital_id", "hospital__name"]
+    hospital_fields = ["id", "name", "city", "state", "country", "open_shift_count"]
+    ordering = ("name", "id")
+    session = nullcontext()
 
     if query:
-        departments_qs = departments_qs.filter(
-            Q(name__icontains=query) | Q(hospital__name__icontains=query)
-        )
-        hospitals_qs = hospitals_qs.filter(name__icontains=query)
+        departments_qs = ranked_search(departments_qs, query, ["name", "hospital__name"])
+        hospitals_qs = ranked_search(hospitals_qs, query, ["name"])
+        department_fields.append("rank")
+        hospital_fields.append("rank")
+        ordering = RANKED_ORDERING
+        session = search_session(departments_qs.db)
 
-    departments = list(
-        departments_qs.distinct()
-        .order_by("name")
-        .values("id", "name", "hospital_id", "hospital__name")
-    )
+    try:
+        with session:
+            pages, next_cursor = paginate(
+                {
+                    "departments": (departments_qs.values(*department_fields), ordering),
+                    "hospitals": (hospitals_qs.values(*hospital_fields), ordering),
+                },
+                cursor=request.GET.get("cursor"),
+                page_size=parse_page_size(request.GET.get("page_size")),
+                scope=f"staff.search_directory:{query}",
+            )
+            # Totals across every page, as before pagination.
+            counts = {"departments": departments_qs.count(), "hospitals": hospitals_qs.count()}
+    except InvalidPageRequest as exc:
+        return _json_error(str(exc))
 
-    hospitals = list(
-        hospitals_qs.distinct()
-        .order_by("name")
-        .annotate(open_shift_count=Count("job_postings", filter=Q(job_postings__status=JobPosting.Status.OPEN)))
-        .values("id", "name", "city", "state", "country", "open_shift_count")
-    )
+    departments = [
+        {key: value for key, value in row.items() if key != "rank"} for row in pages["departments"]
+    ]
+    hospitals = [
+        {key: value for key, value in row.items() if key != "rank"} for row in pages["hospitals"]
+    ]
 
     return JsonResponse(
         {
             "query": query,
-            "counts": {
-                "departments": len(departments),
-                "hospitals": len(hospitals),
-            },
+            "counts": counts,
             "departments": departments,
             "hospitals": hospitals,
+            "next_cursor": next_cursor,
         }
     )
 
@@ -514,9 +735,12 @@ def register_staff(request):
 
     try:
         with transaction.atomic():
-            profession = Profession.objects.filter(name__iexact=profession_name).first()
-            if not profession:
-                profession = Profession.objects.create(name=profession_name)
+            profession_id = reference_data.profession_id(profession_name)
+            if profession_id is None:
+                profession = Profession.objects.filter(name__iexact=profession_name).first()
+                if not profession:
+                    profession = Profession.objects.create(name=profession_name)
+                profession_id = profession.id
 
             user = AppUser.objects.create(
                 id=supabase_user_id,
@@ -525,7 +749,7 @@ def register_staff(request):
                 role=AppUser.Role.STAFF,
                 is_active=True,
             )
-            staff_profile = StaffProfile.objects.create(user=user, profession=profession)
+            staff_profile = StaffProfile.objects.create(user=user, profession_id=profession_id)
 
             slots = [
                 AvailabilitySlot(
@@ -546,10 +770,10 @@ def register_staff(request):
         {
             "message": "Staff registration successful",
             "staff_id": staff_profile.id,
-            "user_id": str(user.id),
+            "user_id": user.id,
             "full_name": user.full_name,
             "email": user.email,
-            "profession": profession.name,
+            "profession": reference_data.profession_name(profession_id),
             "availability_days": cleaned_days,
         },
         status=201,
@@ -590,7 +814,7 @@ def login_staff(request):
         {
             "message": "Login successful",
             "staff_id": staff_profile.id,
-            "user_id": str(app_user.id),
+            "user_id": app_user.id,
             "email": app_user.email,
             "full_name": app_user.full_name,
             "profession": staff_profile.profession.name,
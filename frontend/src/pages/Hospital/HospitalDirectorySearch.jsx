@@ -14,6 +14,9 @@ const HospitalDirectorySearch = () => {
   const [isLoading, setIsLoading] = useState(false);
   const [departments, setDepartments] = useState([]);
   const [staffProfiles, setStaffProfiles] = useState([]);
+  const [counts, setCounts] = useState({});
+  const [nextCursor, setNextCursor] = useState('');
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   useEffect(() => {
     setQuery(searchParams.get('q') || '');
@@ -35,10 +38,14 @@ const HospitalDirectorySearch = () => {
         });
         setDepartments(response.departments || []);
         setStaffProfiles(response.staff_profiles || []);
+        setCounts(response.counts || {});
+        setNextCursor(response.next_cursor || '');
       } catch (err) {
         toast.error(err.message || 'Unable to search hospital directory.');
         setDepartments([]);
         setStaffProfiles([]);
+        setCounts({});
+        setNextCursor('');
       } finally {
         setIsLoading(false);
       }
@@ -47,6 +54,27 @@ const HospitalDirectorySearch = () => {
     return () => clearTimeout(timer);
   }, [query, toast]);
 
+  const handleLoadMore = async () => {
+    const hospitalId = getHospitalId();
+    if (!hospitalId || !nextCursor) return;
+
+    setIsLoadingMore(true);
+    try {
+      const response = await searchHospitalDirectory({
+        hospitalId,
+        q: query.trim(),
+        cursor: nextCursor,
+      });
+      setDepartments((current) => [...current, ...(response.departments || [])]);
+      setStaffProfiles((current) => [...current, ...(response.staff_profiles || [])]);
+      setNextCursor(response.next_cursor || '');
+    } catch (err) {
+      toast.error(err.message || 'Unable to load more results.');
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const handleSearchInput = (e) => {
     const next = e.target.value;
     setQuery(next);
@@ -93,7 +121,7 @@ const HospitalDirectorySearch = () => {
 
           {!isLoading && departments.length > 0 ? (
             <section className="mb-8">
-              <h3 className="text-lg font-bold mb-4">Departments ({departments.length})</h3>
+              <h3 className="text-lg font-bold mb-4">Departments ({counts.departments ?? departments.length})</h3>
               <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
                 {departments.map((dept) => (
                   <div key={dept.id} className="bg-white dark:bg-slate-900 rounded-xl border border-slate-200 dark:border-slate-800 p-4">
@@ -106,7 +134,7 @@ const HospitalDirectorySearch = () => {
 
           {!isLoading && staffProfiles.length > 0 ? (
             <section>
-              <h3 className="text-lg font-bold mb-4">Staff Profiles ({staffProfiles.length})</h3>
+              <h3 className="text-lg font-bold mb-4">Staff Profiles ({counts.staff_profiles ?? staffProfiles.length})</h3>
               <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
                 {staffProfiles.map((staff) => (
                   <div key={staff.id} className="bg-white dark:bg-slate-900 rounded-xl border border-slate-200 dark:border-slate-800 p-4">
@@ -120,6 +148,19 @@ const HospitalDirectorySearch = () => {
               </div>
             </section>
           ) : null}
+
+          {!isLoading && nextCursor ? (
+            <div className="mt-8 flex justify-center">
+              <button
+                type="button"
+                onClick={handleLoadMore}
+                disabled={isLoadingMore}
+                className="px-4 py-2 rounded-lg border border-slate-200 dark:border-slate-800 bg-white dark:bg-slate-900 text-sm font-semibold hover:bg-slate-50 dark:hover:bg-slate-800 disabled:opacity-60"
+              >
+                {isLoadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            </div>
+          ) : null}
         </main>
       </div>
     </div>
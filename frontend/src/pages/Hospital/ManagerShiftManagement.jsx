@@ -1,4 +1,4 @@
-import React, { useEffect, useMemo, useState } from 'react';
+import React, { useEffect, useMemo, useRef, useState } from 'react';
 import HospitalSidebar from './HospitalSidebar';
 import HospitalHeader from './HospitalHeader';
 import StaffProfileModal from '../Staff/StaffProfileModal';
@@ -8,6 +8,7 @@ import {
   decideHospitalApplication,
   getHospitalShiftDetail,
   getHospitalShiftSummary,
+  subscribeHospitalEvents,
 } from '../../services/api';
 import { getHospitalId } from '../../services/hospitalSession';
 import { useToast } from '../../components/toastContext';
@@ -30,6 +31,10 @@ const ManagerShiftManagement = () => {
   const [isLoading, setIsLoading] = useState(true);
   const [isActionLoading, setIsActionLoading] = useState(false);
 
+  // Read by the event stream handler, which subscribes once per page.
+  const currentShiftIdRef = useRef(currentShiftId);
+  const shiftIdsRef = useRef(new Set());
+
   const currentShift = useMemo(() => {
     return shiftsData.find((s) => s.id === currentShiftId) || shiftsData[0] || null;
   }, [shiftsData, currentShiftId]);
@@ -57,6 +62,29 @@ const ManagerShiftManagement = () => {
     setCurrentShiftDetail(response);
   };
 
+  // Refetches one shift and patches its card, and the open detail if it is that shift.
+  const refreshShift = async (jobId) => {
+    const detail = await getHospitalShiftDetail(jobId);
+    setShiftsData((rows) =>
+      rows.map((row) =>
+        row.id === jobId
+          ? { ...row, capacity: detail.job.required_staff_count, assigned: detail.assigned, applicants: detail.applicants }
+          : row,
+      ),
+    );
+    if (jobId === currentShiftIdRef.current) {
+      setCurrentShiftDetail(detail);
+    }
+  };
+
+  useEffect(() => {
+    currentShiftIdRef.current = currentShiftId;
+  }, [currentShiftId]);
+
+  useEffect(() => {
+    shiftIdsRef.current = new Set(shiftsData.map((shift) => shift.id));
+  }, [shiftsData]);
+
   useEffect(() => {
     const load = async () => {
       setIsLoading(true);
@@ -87,6 +115,22 @@ const ManagerShiftManagement = () => {
     load();
   }, [currentShiftId, toast]);
 
+  useEffect(() => {
+    const hospitalId = getHospitalId();
+    if (!hospitalId) return undefined;
+    // One subscription for the page; each application, assignment or closing event
+    // refetches only the shift it touched, and only if that shift is listed.
+    return subscribeHospitalEvents({
+      hospitalId,
+      onEvent: (event) => {
+        if (shiftIdsRef.current.has(event.job_id)) {
+          refreshShift(event.job_id).catch(() => {});
+        }
+      },
+    });
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
   const handleDecline = async (applicationId) => {
     setIsActionLoading(true);
     try {
@@ -2,7 +2,7 @@ import React, { useEffect, useMemo, useState } from 'react';
 import StaffSidebar from './StaffSidebar';
 import StaffHeader from './StaffHeader';
 
-import { getStaffDashboard } from '../../services/api';
+import { getStaffDashboard, subscribeStaffEvents } from '../../services/api';
 import { getStaffId } from '../../services/staffSession';
 import { useToast } from '../../components/toastContext';
 
@@ -38,6 +38,20 @@ const StaffDashboard = () => {
     load();
   }, [toast]);
 
+  useEffect(() => {
+    const staffId = getStaffId();
+    if (!staffId) return undefined;
+    // Invites, decisions and assignments change the dashboard counts.
+    return subscribeStaffEvents({
+      staffId,
+      onEvent: () => {
+        getStaffDashboard({ staffId })
+          .then(setSummary)
+          .catch(() => {});
+      },
+    });
+  }, []);
+
   const weeklyHours = useMemo(() => {
     const values = summary?.weekly_performance_hours || {};
     return dayOrder.map((day) => ({
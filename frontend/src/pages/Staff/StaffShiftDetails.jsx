@@ -29,8 +29,24 @@ const StaffShiftDetails = () => {
       return;
     }
 
-    const response = await getStaffSchedule({ staffId });
-    const rows = response.results || [];
+    // Pages arrive in department order; a department split across pages is merged.
+    const byTitle = new Map();
+    let cursor = '';
+    do {
+      const response = await getStaffSchedule({ staffId, cursor });
+      (response.results || []).forEach((group) => {
+        const merged = byTitle.get(group.title);
+        if (!merged) {
+          byTitle.set(group.title, { ...group });
+          return;
+        }
+        merged.confirmed_shifts = [...merged.confirmed_shifts, ...group.confirmed_shifts];
+        merged.pending_applications = [...merged.pending_applications, ...group.pending_applications];
+        merged.total_active += group.total_active;
+      });
+      cursor = response.next_cursor || '';
+    } while (cursor);
+    const rows = [...byTitle.values()].map((group, index) => ({ ...group, id: index + 1 }));
     setGroups(rows);
     if (!currentGroupId && rows.length > 0) {
       setCurrentGroupId(rows[0].id);
@@ -32,6 +32,41 @@ async function requestJson(path, options = {}) {
   return payload;
 }
 
+const CHANGE_EVENT_NAMES = ['application_status', 'assignment_created', 'assignment_cancelled', 'job_closed'];
+
+const CHANGE_EVENT_RECONNECT_MS = 5000;
+
+// Opens a Server-Sent Events stream. The browser retries dropped connections itself,
+// sending Last-Event-ID; when it gives up, the stream is reopened with the last id seen
+// as last_event_id so no event is missed. Returns a function that closes the stream.
+function subscribeChangeEvents(path, onEvent) {
+  let source = null;
+  let lastEventId = '';
+  let reconnectTimer = null;
+  let closed = false;
+
+  const handleEvent = (message) => {
+    if (message.lastEventId) lastEventId = message.lastEventId;
+    onEvent(JSON.parse(message.data));
+  };
+  const open = () => {
+    const resumeParam = lastEventId ? `&last_event_id=${encodeURIComponent(lastEventId)}` : '';
+    source = new EventSource(buildUrl(`${path}${resumeParam}`));
+    CHANGE_EVENT_NAMES.forEach((name) => source.addEventListener(name, handleEvent));
+    source.onerror = () => {
+      if (closed || source.readyState !== EventSource.CLOSED) return;
+      reconnectTimer = setTimeout(open, CHANGE_EVENT_RECONNECT_MS);
+    };
+  };
+
+  open();
+  return () => {
+    closed = true;
+    clearTimeout(reconnectTimer);
+    source.close();
+  };
+}
+
 export async function registerStaff(payload) {
   return requestJson('/api/staff/auth/register/', {
     method: 'POST',
@@ -60,8 +95,9 @@ export async function getStaffDashboard({ staffId }) {
   return requestJson(`/api/staff/dashboard/?${params.toString()}`);
 }
 
-export async function getStaffSchedule({ staffId }) {
+export async function getStaffSchedule({ staffId, cursor = '' }) {
   const params = new URLSearchParams({ staff_id: String(staffId) });
+  if (cursor) params.set('cursor', cursor);
   return requestJson(`/api/staff/schedule/?${params.toString()}`);
 }
 
@@ -86,6 +122,11 @@ export async function approveStaffApplication({ applicationId, staffId }) {
   });
 }
 
+export function subscribeStaffEvents({ staffId, onEvent }) {
+  const params = new URLSearchParams({ staff_id: String(staffId) });
+  return subscribeChangeEvents(`/api/staff/events/?${params.toString()}`, onEvent);
+}
+
 export async function registerHospital(payload) {
   return requestJson('/api/hospital/auth/register/', {
     method: 'POST',
@@ -114,6 +155,11 @@ export async function getHospitalShiftDetail(jobId) {
   return requestJson(`/api/hospital/shifts/${jobId}/manage/`);
 }
 
+export function subscribeHospitalEvents({ hospitalId, onEvent }) {
+  const params = new URLSearchParams({ hospital_id: String(hospitalId) });
+  return subscribeChangeEvents(`/api/hospital/events/?${params.toString()}`, onEvent);
+}
+
 export async function createHospitalShift(payload) {
   return requestJson('/api/hospital/shifts/', {
     method: 'POST',
@@ -152,18 +198,20 @@ export async function getHospitalRecommendations({ jobId, hospitalId, department
   return requestJson(`/api/hospital/recommendations/?${params.toString()}`);
 }
 
-export async function searchHospitalDirectory({ hospitalId, q = '' }) {
+export async function searchHospitalDirectory({ hospitalId, q = '', cursor = '' }) {
   const params = new URLSearchParams({
     hospital_id: String(hospitalId),
     q,
   });
+  if (cursor) params.set('cursor', cursor);
   return requestJson(`/api/hospital/search/directory/?${params.toString()}`);
 }
 
-export async function searchStaffDirectory({ staffId, q = '' }) {
+export async function searchStaffDirectory({ staffId, q = '', cursor = '' }) {
   const params = new URLSearchParams({
     staff_id: String(staffId),
     q,
   });
+  if (cursor) params.set('cursor', cursor);
   return requestJson(`/api/staff/search/directory/?${params.toString()}`);
 }